@@ -1,2 +1,5 @@
 # Allow core module imports to be imported directly from pluma package
-from .core.__init__ import *
+from .utils.lazyimport import lazy_import, lazy_attributes
+from . import core
+
+lazy_import(__name__, lazy_attributes('.core', *core.__all__))
@@ -2,9 +2,9 @@ import argparse
 import traceback
 import os
 
+from . import cli
 from .core.baseclasses import Logger, LogMode, LogLevel
-from .cli import Pluma, TestsConfigError, TestsBuildError, TargetConfigError
-from .cli.plugins import load_plugin_modules
+from .utils import package_version
 
 log = Logger()
 
@@ -42,6 +42,9 @@ def parse_arguments():
     parser.add_argument(
         '-f', '--force', action='store_const', const=True,
         help='force operation instead of prompting')
+    parser.add_argument(
+        '--resume', action='store_const', const=True,
+        help='with "run", continue from the last checkpoint saved (see "checkpoint_file")')
     parser.add_argument(
         '--silent', action='store_const', const=True,
         help='silence all output')
@@ -73,33 +76,40 @@ def main():
     tests_config_path = args.config
     target_config_path = args.target
 
+    if args.command == VERSION_COMMAND:
+        # Fast path, without loading the tests and drivers
+        log.log(package_version(__package__), level=LogLevel.IMPORTANT)
+        return
+
     if args.plugin:
+        # Plugin modules are imported only when used
+        from .cli.plugins import add_plugin_dir
         for plugin_dir in args.plugin:
-            load_plugin_modules(plugin_dir)
+            add_plugin_dir(plugin_dir)
 
     try:
         command = args.command
         if command == RUN_COMMAND:
-            success = Pluma.execute_run(tests_config_path, target_config_path)
+            success = cli.Pluma.execute_run(tests_config_path, target_config_path,
+                                            resume=bool(args.resume))
             exit(0 if success else 1)
         elif command == CHECK_COMMAND:
-            Pluma.execute_run(tests_config_path, target_config_path,
-                              check_only=True)
+            cli.Pluma.execute_run(tests_config_path, target_config_path,
+                                  check_only=True)
         elif command == TESTS_COMMAND:
-            Pluma.execute_tests(tests_config_path, target_config_path)
+            cli.Pluma.execute_tests(tests_config_path, target_config_path)
         elif command == CLEAN_COMMAND:
-            Pluma.execute_clean(args.force)
-        elif command == VERSION_COMMAND:
-            log.log(Pluma.version(), level=LogLevel.IMPORTANT)
-    except TestsConfigError as e:
+            cli.Pluma.execute_clean(args.force)
+    # Exception classes are only looked up, and imported, on error
+    except cli.TestsConfigError as e:
         log.error(
             f'Error while parsing the tests configuration ({tests_config_path}):{os.linesep}  {e}')
         exit(-2)
-    except TargetConfigError as e:
+    except cli.TargetConfigError as e:
         log.error(
             f'Error while parsing the target configuration ({target_config_path}):{os.linesep}  {e}')
         exit(-3)
-    except TestsBuildError as e:
+    except cli.TestsBuildError as e:
         log.error(
             f'Error while building tests:\n  {e}')
         exit(-4)
@@ -1,17 +1,25 @@
-from .plumacontext import PlumaContext
-from .configpreprocessor import PlumaConfigPreprocessor
-from .config import PlumaConfig, Configuration, ConfigurationError, TestsConfigError, \
-    TargetConfigError, TestsProvider, TestDefinition, ConfigPreprocessor
-from .testsconfig import TestsConfig
-from .testsbuilder import TestsBuilder, TestsBuildError
-from .targetconfig import TargetConfig, TargetFactory, Credentials
-from .pythontestsprovider import PythonTestsProvider
-from .shelltestsprovider import ShellTestsProvider
-from .ctestsprovider import CTestsProvider
-from .deviceactionbase import DeviceActionBase
-from .deviceactionregistry import DeviceActionRegistry
-from .deviceactions import LoginAction, PowerOnAction, PowerOffAction, PowerCycleAction, WaitAction, \
-    WaitForPatternAction, SetAction
-from .deviceactionprovider import DeviceActionProvider
-from .api import Pluma
+from pluma.utils.lazyimport import lazy_import, lazy_attributes
+
+lazy_import(__name__, {
+    **lazy_attributes('.plumacontext', 'PlumaContext'),
+    **lazy_attributes('.configpreprocessor', 'PlumaConfigPreprocessor'),
+    **lazy_attributes('.configcache', 'ConfigCache'),
+    **lazy_attributes('.pluginindex', 'PluginIndex'),
+    **lazy_attributes('.config', 'PlumaConfig', 'Configuration', 'ConfigurationError',
+                      'TestsConfigError', 'TargetConfigError', 'TestsProvider',
+                      'TestDefinition', 'ConfigPreprocessor'),
+    **lazy_attributes('.testsconfig', 'TestsConfig'),
+    **lazy_attributes('.testsbuilder', 'TestsBuilder', 'TestsBuildError'),
+    **lazy_attributes('.targetconfig', 'TargetConfig', 'TargetFactory', 'Credentials'),
+    **lazy_attributes('.pythontestsprovider', 'PythonTestsProvider'),
+    **lazy_attributes('.shelltestsprovider', 'ShellTestsProvider'),
+    **lazy_attributes('.ctestsprovider', 'CTestsProvider'),
+    **lazy_attributes('.deviceactionbase', 'DeviceActionBase'),
+    **lazy_attributes('.deviceactionregistry', 'DeviceActionRegistry'),
+    **lazy_attributes('.deviceactions', 'LoginAction', 'PowerOnAction', 'PowerOffAction',
+                      'PowerCycleAction', 'WaitAction', 'WaitForPatternAction', 'SetAction'),
+    **lazy_attributes('.deviceactionprovider', 'DeviceActionProvider'),
+    **lazy_attributes('.api', 'Pluma'),
+})
+
 name = "cli"
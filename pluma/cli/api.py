@@ -5,12 +5,13 @@ import os
 from pluma.core.baseclasses import Logger, LogLevel
 from pluma.test import TestController
 from pluma.cli import PlumaContext, PlumaConfig, TestsConfig, TestsBuilder, TargetConfig
-from pluma.cli import TestsBuildError
+from pluma.cli import TestsBuildError, TestsConfigError
 from pluma.cli import PythonTestsProvider, ShellTestsProvider, CTestsProvider, \
     DeviceActionProvider
-from pkg_resources import get_distribution
+from pluma.utils import package_version
 
 from .configpreprocessor import PlumaConfigPreprocessor
+from .plugins import plugin_index
 
 log = Logger()
 
@@ -24,15 +25,34 @@ class Pluma:
 
     @staticmethod
     def execute_run(tests_config_path: str, target_config_path: str,
-                    check_only: bool = False) -> bool:
-        '''Execute the "run" command, and allow checking only ("check" command).'''
+                    check_only: bool = False, resume: bool = False) -> bool:
+        '''Execute the "run" command, and allow checking only ("check" command).
+
+        If @resume, the run continues from the last checkpoint saved, if any.
+        '''
+        resume = resume and not check_only
         controller = Pluma.build_test_controller(tests_config_path,
-                                                 target_config_path, show_tests_list=check_only)
+                                                 target_config_path, show_tests_list=check_only,
+                                                 resume=resume)
         if check_only:
             log.log('Configuration and tests successfully validated.',
                     level=LogLevel.IMPORTANT)
             return True
 
+        if resume:
+            if not getattr(controller, 'checkpoint_file', None):
+                raise TestsConfigError('"--resume" requires the "checkpoint_file" setting')
+
+            if controller.load_checkpoint():
+                log.log(f'Resuming after iteration '
+                        f'#{controller.stats["num_iterations_run"]}...',
+                        level=LogLevel.IMPORTANT)
+            else:
+                log.warning(f'No checkpoint found in "{controller.checkpoint_file}", '
+                            'starting from the first iteration')
+                # Results kept for resuming are from another run
+                controller.results = []
+
         success = controller.run()
         if success:
             log.log('All tests were successful.',
@@ -68,6 +88,10 @@ class Pluma:
             raise TestsBuildError(
                 f'Failed to remove log files: {e}')
 
+        log.log('Removing cached configurations...')
+        PlumaConfig.cache.clear()
+        plugin_index.clear()
+
         TestsBuilder.clean(force)
 
     @staticmethod
@@ -87,23 +111,24 @@ class Pluma:
                                                       PlumaConfigPreprocessor(context.variables))
 
         default_log = 'pluma-{}.log'.format(time.strftime("%Y%m%d-%H%M%S"))
-        context.board.log_file = tests_config.pop('log') or default_log
+        log_file = tests_config.pop('log') or default_log
+        for board in context.boards:
+            board.log_file = log_file
 
         return TestsConfig(tests_config, Pluma.tests_providers())
 
     @staticmethod
     def build_test_controller(tests_config_path: str, target_config_path: str,
-                              show_tests_list: bool) -> TestController:
+                              show_tests_list: bool, resume: bool = False) -> TestController:
         context = Pluma.create_target_context(target_config_path)
         tests_config = Pluma.create_tests_config(tests_config_path, context)
 
         tests_list_log_level = LogLevel.INFO if show_tests_list else LogLevel.NOTICE
         tests_config.print_tests(tests_list_log_level)
 
-        return tests_config.create_test_controller(context.board)
+        return tests_config.create_test_controller(context.boards, resume=resume)
 
     @staticmethod
     def version() -> str:
         '''Return the version string of Pluma'''
-        top_level_package = __package__.split('.')[0]
-        return get_distribution(top_level_package).version
+        return package_version(__package__)
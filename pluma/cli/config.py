@@ -1,9 +1,19 @@
 import yaml
 import json
 import os
+import importlib
 
 from pluma.core.baseclasses import Logger
 from abc import ABC, abstractmethod
+from typing import Union
+
+from .configcache import ConfigCache, DEFAULT_CONFIG_CACHE_DIR
+
+# Use the C YAML parser when available, as much faster
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
 log = Logger()
 
@@ -67,9 +77,13 @@ class Configuration:
 
 
 class TestDefinition():
-    '''Data class representing a test, its class, and parameters.'''
+    '''Data class representing a test, its class, and parameters.
 
-    def __init__(self, name: str, testclass: type, test_provider: object,
+    The test class can be given as its import path, "module.Class", to
+    import its module only when the class is used.
+    '''
+
+    def __init__(self, name: str, testclass: Union[type, str], test_provider: object,
                  parameter_sets: list = None, selected: bool = False):
         if not name or name == '':
             raise ValueError('Test name cannot be empty')
@@ -89,6 +103,18 @@ class TestDefinition():
             raise ValueError(
                 f'Parameter sets for test "{name}" should be a list of dictionaries')
 
+    @property
+    def testclass(self) -> type:
+        if isinstance(self._testclass, str):
+            module_name, __, class_name = self._testclass.rpartition('.')
+            self._testclass = getattr(importlib.import_module(module_name), class_name)
+
+        return self._testclass
+
+    @testclass.setter
+    def testclass(self, testclass: Union[type, str]):
+        self._testclass = testclass
+
     def __repr__(self):
         return f'{self.__module__}.{self.__class__.__name__}{self.parameter_sets or ""}'
 
@@ -126,6 +152,8 @@ class ConfigPreprocessor(ABC):
 
 
 class PlumaConfig:
+    cache = ConfigCache(DEFAULT_CONFIG_CACHE_DIR)
+
     @staticmethod
     def load_configuration(name: str, config_path: str,
                            preprocessor: ConfigPreprocessor = None) -> Configuration:
@@ -140,11 +168,20 @@ class PlumaConfig:
                 if preprocessor:
                     content = preprocessor.preprocess(content)
 
-                return yaml.load(content, Loader=yaml.FullLoader)
+            # Skip parsing if the same configuration was parsed before
+            cache_key = PlumaConfig.cache.key(content, YamlLoader.__name__)
+            data = PlumaConfig.cache.get(cache_key)
+            if data is None:
+                data = yaml.load(content, Loader=YamlLoader)
+                PlumaConfig.cache.put(cache_key, data)
+            else:
+                log.debug(f'Using cached {name} "{yaml_file_path}"')
+
+            return data
         except FileNotFoundError as e:
             raise ConfigurationError(
                 f'{name} "{yaml_file_path}" does not exist') from e
-        except yaml.parser.ParserError as e:
+        except yaml.YAMLError as e:
             raise ConfigurationError(
                 f'Error while parsing {name} "{yaml_file_path}":'
                 f'{os.linesep}{e}') from e
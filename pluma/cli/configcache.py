@@ -0,0 +1,118 @@
+import copy
+import hashlib
+import os
+import pickle
+import tempfile
+
+from collections import OrderedDict
+
+from pluma.core.baseclasses import Logger
+
+log = Logger()
+
+""" Directory of the user cache of pluma, shared by pluma runs """
+PLUMA_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'pluma')
+
+""" Default directory of the configuration cache """
+DEFAULT_CONFIG_CACHE_DIR = os.path.join(PLUMA_CACHE_DIR, 'config')
+
+""" Maximum number of configurations kept in memory """
+CONFIG_CACHE_MEMORY_SIZE = 16
+
+""" Version of the cache format, to invalidate entries written by other versions """
+CONFIG_CACHE_VERSION = 1
+
+
+class ConfigCache:
+    '''Cache of parsed configuration files.
+
+    Entries are keyed by a hash of the configuration text, after
+    preprocessing, so that any change to the file or to the value of the
+    variables it uses invalidates the entry. Entries are kept in memory,
+    and in @cache_dir if set, so that they are reused by later pluma runs.
+    Data returned is a copy, and can be modified by the caller.
+    '''
+
+    def __init__(self, cache_dir: str = None):
+        self.cache_dir = cache_dir
+        self._memory = OrderedDict()
+
+    @staticmethod
+    def key(content: str, loader: str) -> str:
+        '''Return the cache key of @content, parsed with @loader'''
+        key = hashlib.sha256()
+        key.update(f'{CONFIG_CACHE_VERSION}:{loader}:'.encode())
+        key.update(content.encode('utf-8', 'surrogateescape'))
+        return key.hexdigest()
+
+    def get(self, key: str):
+        '''Return the data cached for @key, or None'''
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            return copy.deepcopy(data)
+
+        data = self._read(key)
+        if data is not None:
+            self._remember(key, data)
+            return copy.deepcopy(data)
+
+        return None
+
+    def put(self, key: str, data):
+        '''Cache @data for @key'''
+        if data is None:
+            return
+
+        data = copy.deepcopy(data)
+        self._remember(key, data)
+        self._write(key, data)
+
+    def clear(self):
+        self._memory.clear()
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return
+
+        for file in os.listdir(self.cache_dir):
+            if file.endswith('.pickle'):
+                os.remove(os.path.join(self.cache_dir, file))
+
+    def _remember(self, key: str, data):
+        self._memory[key] = data
+        if len(self._memory) > CONFIG_CACHE_MEMORY_SIZE:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.pickle')
+
+    def _read(self, key: str):
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self._path(key), 'rb') as cache_file:
+                return pickle.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.debug(f'Ignoring invalid configuration cache entry {key}: {e}')
+            return None
+
+    def _write(self, key: str, data):
+        if not self.cache_dir:
+            return
+
+        # Write atomically, as other pluma instances can read the cache
+        temp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as cache_file:
+                pickle.dump(data, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._path(key))
+        except Exception as e:
+            log.debug(f'Failed to write configuration cache entry {key}: {e}')
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
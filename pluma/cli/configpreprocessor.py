@@ -6,6 +6,9 @@ from pluma.core.baseclasses import Logger
 log = Logger()
 
 
+VARIABLE_REGEX = re.compile(r'\${(\w+)}')
+
+
 class PlumaConfigPreprocessor(ConfigPreprocessor):
     def __init__(self, variables: dict):
         self.variables = variables or {}
@@ -13,27 +16,28 @@ class PlumaConfigPreprocessor(ConfigPreprocessor):
             raise ValueError('Variables must be a dictionary')
 
     def preprocess(self, raw_config: str) -> str:
-        def token_to_variable(token):
-            '''remove "${" and "}" '''
-            return token[2:len(token)-1]
-
+        '''Replace all "${variable}" in @raw_config, in a single pass'''
+        used_variables = {}
         missing_variables = []
-        vars_found = re.findall(r'\${\w+}', raw_config, flags=re.MULTILINE)
-        unique_vars = set(map(token_to_variable, vars_found))
-        vars_found = map(token_to_variable, vars_found)
 
-        # Look for missing variables
-        for variable in unique_vars:
+        def substitute(match):
+            variable = match.group(1)
             if variable not in self.variables:
-                missing_variables.append(variable)
+                if variable not in missing_variables:
+                    missing_variables.append(variable)
+                return match.group(0)
+
+            value = str(self.variables[variable])
+            used_variables[variable] = value
+            return value
+
+        config = VARIABLE_REGEX.sub(substitute, raw_config)
 
         if missing_variables:
             raise Exception('The following variables are used but not defined: '
                             f'{missing_variables}')
 
-        for variable in unique_vars:
-            log.debug(f'${{{variable}}}={self.variables[variable]}')
-            raw_config = re.sub(r'\${'+variable+'}', self.variables[variable],
-                                raw_config)
+        for variable, value in used_variables.items():
+            log.debug('${%s}=%s', variable, value)
 
-        return raw_config
+        return config
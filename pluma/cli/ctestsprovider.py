@@ -1,3 +1,6 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from pluma.core.baseclasses import Logger
 from pluma.test import ExecutableTest
 from pluma.cli import TestsConfigError
@@ -34,25 +37,36 @@ class CTestsProvider(TestsProvider):
         if not env_file:
             env_file = TestsBuilder.find_yocto_sdk_env_file(install_dir)
 
+        # Source the environment once, for all builds
+        TestsBuilder.source_environment(env_file)
+
         all_tests = []
         tests_config = config.pop('tests', default={}).content()
-        for test_name in tests_config:
-            try:
-                test_parameters = tests_config[test_name]
-                test_executable = TestsBuilder.build_c_test(
-                    target_name=test_name, env_file=env_file,
-                    sources=test_parameters.pop('sources'), flags=test_parameters.pop('flags', None))
-
-                test_parameters['executable_file'] = test_executable
-
-                test = TestDefinition(test_name, testclass=ExecutableTest, test_provider=self,
-                                      parameter_sets=[test_parameters], selected=True)
-                all_tests.append(test)
-            except KeyError as e:
-                raise TestsConfigError(
-                    f'Error processing C test "{test_name}": Missing mandatory attribute {e}')
-            except Exception as e:
-                raise TestsConfigError(
-                    f'Error processing C test "{test_name}": {e}')
+
+        # Compilers run in parallel, each in their own process
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            builds = {}
+            for test_name in tests_config:
+                try:
+                    test_parameters = tests_config[test_name]
+                    builds[test_name] = executor.submit(
+                        TestsBuilder.build_c_test, target_name=test_name, env_file=env_file,
+                        sources=test_parameters.pop('sources'),
+                        flags=test_parameters.pop('flags', None))
+                except KeyError as e:
+                    raise TestsConfigError(
+                        f'Error processing C test "{test_name}": Missing mandatory attribute {e}')
+
+            for test_name, build in builds.items():
+                try:
+                    test_parameters = tests_config[test_name]
+                    test_parameters['executable_file'] = build.result()
+
+                    test = TestDefinition(test_name, testclass=ExecutableTest, test_provider=self,
+                                          parameter_sets=[test_parameters], selected=True)
+                    all_tests.append(test)
+                except Exception as e:
+                    raise TestsConfigError(
+                        f'Error processing C test "{test_name}": {e}')
 
         return all_tests
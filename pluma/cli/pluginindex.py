@@ -0,0 +1,279 @@
+import ast
+import builtins
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+
+from collections import OrderedDict
+
+from pluma.core.baseclasses import Logger
+from .configcache import PLUMA_CACHE_DIR
+
+log = Logger()
+
+""" Default path of the plugin index, shared by pluma runs """
+DEFAULT_PLUGIN_INDEX_PATH = os.path.join(PLUMA_CACHE_DIR, 'plugins.json')
+
+""" Version of the index format, to discard indexes written by other versions """
+PLUGIN_INDEX_VERSION = 2
+
+
+class PluginIndex:
+    '''Index of the classes defined in plugin modules, found without importing them.
+
+    Each plugin root is a directory of modules and packages, and an optional
+    package prefix used to import them. The classes defined at the top level
+    of each module, and their base classes, are found by parsing the module
+    source. The index is saved to @index_path if set, and a module is parsed
+    again only when its size, modification time and content hash changed.
+    Base classes which cannot be found from the source, such as names
+    imported with "*", are None, and the module of their class is imported
+    to check them.
+    '''
+
+    def __init__(self, index_path: str = None):
+        self.index_path = index_path
+        self.roots = OrderedDict()
+        self._files = None
+        self._modified = False
+
+    def add_root(self, directory: str, package: str = None):
+        '''Index modules in @directory, imported from @package if set'''
+        self.roots[os.path.abspath(directory)] = package or ''
+
+    def classes(self) -> dict:
+        '''Return the classes found, as {module: {class name: [base classes]}}.
+
+        Modules and base classes are fully qualified names, or None if not
+        found from the source.
+        '''
+        return OrderedDict((module, classes) for __, module, classes in self._index())
+
+    def test_classes(self, base_class: type) -> dict:
+        '''Return the classes inheriting @base_class, as {name: import path}.
+
+        The name of a class is its import path, relative to the package of
+        its root.
+        '''
+        index = self._index()
+        all_classes = {f'{module}.{name}': bases
+                       for __, module, classes in index
+                       for name, bases in classes.items()}
+        results = {}
+
+        def inherits(class_path: str, visited: set) -> bool:
+            if class_path in results:
+                return results[class_path]
+
+            if class_path in visited:
+                return False
+
+            visited.add(class_path)
+            if class_path in all_classes:
+                bases = all_classes[class_path]
+                result = any(inherits(base, visited) for base in bases if base)
+                if not result and None in bases:
+                    # A base class is not known from the source, import the class
+                    result = PluginIndex._imported_class_inherits(class_path, base_class)
+            else:
+                result = PluginIndex._imported_class_inherits(class_path, base_class)
+
+            results[class_path] = result
+            return result
+
+        test_classes = OrderedDict()
+        for package, module, classes in index:
+            name_prefix = module[len(package) + 1:] if package else module
+            for name in classes:
+                class_path = f'{module}.{name}'
+                if inherits(class_path, set()):
+                    test_classes.setdefault(f'{name_prefix}.{name}', class_path)
+
+        return test_classes
+
+    def _index(self) -> list:
+        '''Return the root package, module name and classes of all modules'''
+        if self._files is None:
+            self._files = self._load()
+
+        index = []
+        for directory, package in self.roots.items():
+            for path, module in self._find_modules(directory, package):
+                index.append((package, module, self._module_classes(path, module)))
+
+        # Forget deleted modules, but keep the modules of other roots
+        for path in list(self._files):
+            if not os.path.isfile(path):
+                del self._files[path]
+                self._modified = True
+
+        if self._modified:
+            self._save()
+
+        return index
+
+    def clear(self):
+        self._files = {}
+        if self.index_path and os.path.isfile(self.index_path):
+            os.remove(self.index_path)
+
+    @staticmethod
+    def _imported_class_inherits(class_path: str, base_class: type) -> bool:
+        '''Import a class not defined in the plugins, and check its base classes'''
+        module_name, __, class_name = class_path.rpartition('.')
+        if not module_name:
+            return False
+
+        try:
+            cls = getattr(importlib.import_module(module_name), class_name)
+        except Exception as e:
+            log.debug(f'Failed to import class "{class_path}": {e}')
+            return False
+
+        return isinstance(cls, type) and issubclass(cls, base_class)
+
+    @staticmethod
+    def _find_modules(directory: str, package: str):
+        '''Yield the path and full name of each module in @directory'''
+        if not os.path.isdir(directory):
+            return
+
+        for entry in sorted(os.listdir(directory)):
+            path = os.path.join(directory, entry)
+            name, extension = os.path.splitext(entry)
+            module = f'{package}.{name}' if package else name
+
+            if os.path.isdir(path) and entry.isidentifier() \
+                    and os.path.isfile(os.path.join(path, '__init__.py')):
+                yield os.path.join(path, '__init__.py'), module
+                yield from PluginIndex._find_modules(path, module)
+            elif extension == '.py' and name.isidentifier() and name != '__init__':
+                yield path, module
+
+    def _module_classes(self, path: str, module: str) -> dict:
+        '''Return the classes of module @module, parsing it only if changed'''
+        entry = self._files.get(path)
+        try:
+            stat = os.stat(path)
+            if entry and entry['module'] == module and entry['size'] == stat.st_size \
+                    and entry['mtime'] == stat.st_mtime_ns:
+                return entry['classes']
+
+            with open(path, 'rb') as source_file:
+                source = source_file.read()
+        except OSError as e:
+            log.warning(f'Failed to read plugin module "{path}": {e}')
+            return {}
+
+        digest = hashlib.sha256(source).hexdigest()
+        if not entry or entry['module'] != module or entry['sha256'] != digest:
+            try:
+                classes = PluginIndex._parse_classes(source, module,
+                                                     path.endswith('__init__.py'))
+            except SyntaxError as e:
+                log.warning(f'Failed to parse plugin module "{path}": {e}')
+                return {}
+
+            log.debug(f'Indexed plugin module "{module}"')
+            entry = {'module': module, 'sha256': digest, 'classes': classes}
+
+        entry.update(size=stat.st_size, mtime=stat.st_mtime_ns)
+        self._files[path] = entry
+        self._modified = True
+        return entry['classes']
+
+    @staticmethod
+    def _parse_classes(source: bytes, module: str, is_package: bool) -> dict:
+        '''Return the classes defined in @source, with their fully qualified bases'''
+        tree = ast.parse(source)
+        package = module if is_package else module.rpartition('.')[0]
+
+        names = {}
+        class_nodes = []
+        for node in PluginIndex._module_statements(tree.body):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.asname:
+                        names[alias.asname] = alias.name
+                    else:
+                        names[alias.name.split('.')[0]] = alias.name.split('.')[0]
+            elif isinstance(node, ast.ImportFrom):
+                source_module = node.module or ''
+                if node.level:
+                    parent = package.split('.') if package else []
+                    parent = parent[:len(parent) - node.level + 1]
+                    source_module = '.'.join(filter(None, parent + [source_module]))
+
+                for alias in node.names:
+                    names[alias.asname or alias.name] = f'{source_module}.{alias.name}'
+            elif isinstance(node, ast.ClassDef):
+                names[node.name] = f'{module}.{node.name}'
+                class_nodes.append(node)
+
+        def qualified_name(node) -> str:
+            if isinstance(node, ast.Subscript):
+                return qualified_name(node.value)
+            if isinstance(node, ast.Attribute):
+                value = qualified_name(node.value)
+                return f'{value}.{node.attr}' if value else None
+            if isinstance(node, ast.Name):
+                if node.id in names:
+                    return names[node.id]
+                return f'builtins.{node.id}' if hasattr(builtins, node.id) else None
+            return None
+
+        return {node.name: [qualified_name(base) for base in node.bases]
+                for node in class_nodes}
+
+    @staticmethod
+    def _module_statements(body: list):
+        '''Yield the statements run when a module is imported, including in "try" and "if"'''
+        for node in body:
+            yield node
+            if isinstance(node, ast.Try):
+                for handler in node.handlers:
+                    yield from PluginIndex._module_statements(handler.body)
+                for block in (node.body, node.orelse, node.finalbody):
+                    yield from PluginIndex._module_statements(block)
+            elif isinstance(node, ast.If):
+                for block in (node.body, node.orelse):
+                    yield from PluginIndex._module_statements(block)
+
+    def _load(self) -> dict:
+        if not self.index_path:
+            return {}
+
+        try:
+            with open(self.index_path, 'r') as index_file:
+                index = json.load(index_file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            log.debug(f'Ignoring invalid plugin index "{self.index_path}": {e}')
+            return {}
+
+        if not isinstance(index, dict) or index.get('version') != PLUGIN_INDEX_VERSION:
+            return {}
+
+        return index.get('files', {})
+
+    def _save(self):
+        self._modified = False
+        if not self.index_path:
+            return
+
+        # Write atomically, as other pluma instances can read the index
+        temp_path = None
+        try:
+            index_dir = os.path.dirname(self.index_path)
+            os.makedirs(index_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=index_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as index_file:
+                json.dump({'version': PLUGIN_INDEX_VERSION, 'files': self._files}, index_file)
+            os.replace(temp_path, self.index_path)
+        except Exception as e:
+            log.debug(f'Failed to write plugin index "{self.index_path}": {e}')
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
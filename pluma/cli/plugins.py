@@ -4,18 +4,53 @@ import pkgutil
 import importlib
 
 import pluma.plugins
+from .pluginindex import PluginIndex, DEFAULT_PLUGIN_INDEX_PATH
 
+""" Index of the built-in plugins, and of the plugin directories added """
+plugin_index = PluginIndex(DEFAULT_PLUGIN_INDEX_PATH)
+plugin_index.add_root(os.path.dirname(pluma.plugins.__file__), pluma.plugins.__name__)
 
-def load_plugin_modules(module_dir: str):
+""" Plugin directories added, whose modules were not all imported yet """
+_unloaded_plugin_dirs = []
+
+
+def add_plugin_dir(module_dir: str):
+    '''Make the modules at @module_dir available as plugins, without importing them.
+
+    The tests they define are found with the plugin index, and their module
+    is only imported if selected.
+    '''
     if not os.path.isdir(module_dir):
         raise AttributeError(
             f'Cannot import module at {module_dir}, no such directory')
 
-    modules = pkgutil.iter_modules([module_dir])
+    if not any(pkgutil.iter_modules([module_dir])):
+        raise ImportError(f'No modules found at {module_dir}')
 
-    if modules:
+    if module_dir not in sys.path:
         sys.path.insert(0, module_dir)
-        for module in modules:
+
+    plugin_index.add_root(module_dir)
+    _unloaded_plugin_dirs.append(module_dir)
+
+
+def load_plugin_modules(module_dir: str):
+    '''Add the plugins at @module_dir, and import all its modules'''
+    add_plugin_dir(module_dir)
+    import_plugin_modules()
+
+
+def import_plugin_modules() -> bool:
+    '''Import the modules of all plugin directories added.
+
+    Needed for modules which register objects when imported, such as
+    device actions. Return True if any module was imported.
+    '''
+    imported = False
+    while _unloaded_plugin_dirs:
+        module_dir = _unloaded_plugin_dirs.pop(0)
+        for module in pkgutil.iter_modules([module_dir]):
             setattr(pluma.plugins, module.name, importlib.import_module(module.name))
-    else:
-        raise ImportError(f'No modules found at {module_dir}')
+            imported = True
+
+    return imported
@@ -1,10 +1,19 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List
 
 from pluma import Board
 
 
 @dataclass
 class PlumaContext:
-    '''Data class for Pluma context'''
+    '''Data class for Pluma context
+
+    "board" is the first of the "boards" tests run on.
+    '''
     board: Board
     variables: dict
+    boards: List[Board] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.boards:
+            self.boards = [self.board]
@@ -1,19 +1,22 @@
-import inspect
 from typing import List
 from operator import attrgetter
 
-import pluma.plugins
 from pluma.core.baseclasses import Logger
 from pluma.test import TestBase
 from pluma.cli import Configuration
 from .config import TestDefinition, TestsProvider
+from .pluginindex import PluginIndex
 
 log = Logger()
 
 
 class PythonTestsProvider(TestsProvider):
-    def __init__(self):
-        pass
+    def __init__(self, index: PluginIndex = None):
+        if not index:
+            from .plugins import plugin_index
+            index = plugin_index
+
+        self.index = index
 
     def display_name(self):
         return 'Core tests (testsuite, Python)'
@@ -54,24 +57,15 @@ class PythonTestsProvider(TestsProvider):
         return all_tests
 
     def find_python_tests(self):
-        '''Search plugins module for classes inheriting TestBase and create TestDefinitions'''
-
-        modules = {module_name: module
-                   for module_name, module in inspect.getmembers(pluma.plugins, inspect.ismodule)}
-        submodules = {f'{module_name}.{submodule_name}': submodule
-                      for module_name, module in modules.items()
-                      for submodule_name, submodule in inspect.getmembers(module, inspect.ismodule)}
-
-        test_classes = {}
-        for module_name, module in {**modules, **submodules}.items():
-            for class_name, cls in inspect.getmembers(module, inspect.isclass):
-                # Exclude TestBase classes imported in but not defined in module
-                if issubclass(cls, TestBase) and cls.__module__.startswith(module.__name__):
-                    full_name = f'{cls.__module__[cls.__module__.index(module_name):]}.{class_name}'
-                    test_classes[full_name] = cls
-
-        all_tests = [TestDefinition(name=class_name, testclass=cls, test_provider=self)
-                     for class_name, cls in test_classes.items()]
+        '''Search plugins for classes inheriting TestBase and create TestDefinitions
+
+        Tests are found with the plugin index, and their module is imported
+        only when the test class is used.
+        '''
+        test_classes = self.index.test_classes(TestBase)
+
+        all_tests = [TestDefinition(name=class_name, testclass=class_path, test_provider=self)
+                     for class_name, class_path in test_classes.items()]
 
         return sorted(all_tests, key=attrgetter('name'))
 
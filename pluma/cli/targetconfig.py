@@ -31,6 +31,34 @@ class TargetConfig:
     @staticmethod
     def _create_context(config: Configuration) -> PlumaContext:
         variables = TargetFactory.parse_variables(config.pop('variables'))
+        boards_config = config.pop_raw('boards')
+        if boards_config is None:
+            board = TargetConfig._create_board('Test board', config)
+            return PlumaContext(board, variables=variables)
+
+        if not isinstance(boards_config, list) or not boards_config:
+            raise TargetConfigError('"boards" must be a list of board configurations')
+
+        # Attributes set outside of "boards" are the default of each board
+        defaults = {key: config.pop_raw(key) for key in list(config.content())}
+
+        boards = []
+        for index, board_config in enumerate(boards_config):
+            if not isinstance(board_config, dict):
+                raise TargetConfigError(
+                    f'Invalid board configuration "{board_config}", which should be a dictionary')
+
+            board_config = Configuration({**deepcopy(defaults), **board_config})
+            name = board_config.pop('name') or f'Test board {index + 1}'
+            if name in (board.name for board in boards):
+                raise TargetConfigError(f'Board name "{name}" is used by more than one board')
+
+            boards.append(TargetConfig._create_board(name, board_config))
+
+        return PlumaContext(boards[0], variables=variables, boards=boards)
+
+    @staticmethod
+    def _create_board(name: str, config: Configuration) -> Board:
         system = TargetFactory.parse_system_context(config.pop('system'))
         serial, ssh = TargetFactory.create_consoles(config.pop('console'), system)
 
@@ -48,29 +76,35 @@ class TargetConfig:
         if ssh:
             consoles['ssh'] = ssh
 
-        board = Board('Test board', console=consoles, power=power,
-                      system=system)
-        return PlumaContext(board, variables=variables)
+        return Board(name, console=consoles, power=power, system=system)
 
     @staticmethod
     def print_context_settings(context: PlumaContext):
+        for board in context.boards:
+            if len(context.boards) > 1:
+                log.log(f'{board.name}:', bold=True)
+
+            TargetConfig.print_board_settings(board)
+
+    @staticmethod
+    def print_board_settings(board: Board):
         log.log('Components:', bold=True)
 
-        serial = context.board.get_console('serial')
-        suffix = 'Default' if serial and context.board.console is serial else None
+        serial = board.get_console('serial')
+        suffix = 'Default' if serial and board.console is serial else None
         TargetConfig.print_component('Serial', serial, suffix)
 
-        ssh = context.board.get_console('ssh')
-        suffix = 'Default' if ssh and context.board.console is ssh else None
+        ssh = board.get_console('ssh')
+        suffix = 'Default' if ssh and board.console is ssh else None
         TargetConfig.print_component('SSH', ssh, suffix)
 
-        TargetConfig.print_component('Prompt', context.board.system.prompt_regex)
-        TargetConfig.print_component('Login', context.board.system.credentials.login)
+        TargetConfig.print_component('Prompt', board.system.prompt_regex)
+        TargetConfig.print_component('Login', board.system.credentials.login)
         TargetConfig.print_component(
-            'Password', '******' if context.board.system.credentials.password else None)
-        TargetConfig.print_component('Power control', context.board.power)
-        TargetConfig.print_component('Storage', context.board.storage)
-        TargetConfig.print_component('USB Hub', context.board.hub)
+            'Password', '******' if board.system.credentials.password else None)
+        TargetConfig.print_component('Power control', board.power)
+        TargetConfig.print_component('Storage', board.storage)
+        TargetConfig.print_component('USB Hub', board.hub)
         log.log('')
 
     @staticmethod
@@ -1,7 +1,14 @@
+import fcntl
+import hashlib
+import json
+import shlex
 import subprocess
 import os.path
 import sys
 import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
 from pluma.core.baseclasses import Logger, LogLevel
 
 log = Logger()
@@ -23,6 +30,11 @@ class TestsBuilder:
     DEFAULT_TOOLCHAIN_INSTALL_DIR = os.path.join(
         DEFAULT_BUILD_ROOT, 'toolchain')
     DEFAULT_EXEC_INSTALL_DIR = os.path.join(DEFAULT_BUILD_ROOT, 'ctests')
+    BUILD_INFO_DIR = '.build'
+    TOOLCHAIN_MANIFEST = 'manifest.json'
+
+    _environments = {}
+    _environments_lock = threading.Lock()
 
     @staticmethod
     def create_directory(directory):
@@ -34,6 +46,13 @@ class TestsBuilder:
 
     @staticmethod
     def install_yocto_sdk(yocto_sdk, install_dir=None):
+        '''Install a Yocto SDK, and return its installation folder.
+
+        Each SDK is installed in a subfolder of @install_dir named after the
+        hash of the installer, and recorded in a manifest. An SDK already
+        installed and intact is reused. Installations are locked, so that
+        concurrent pluma runs can share toolchains.
+        '''
         if not yocto_sdk or not isinstance(yocto_sdk, str):
             raise ValueError('Null Yocto SDK file path provided')
 
@@ -45,8 +64,67 @@ class TestsBuilder:
         if not install_dir:
             install_dir = TestsBuilder.DEFAULT_TOOLCHAIN_INSTALL_DIR
 
+        toolchains_dir = os.path.abspath(install_dir)
+        TestsBuilder.create_directory(toolchains_dir)
+
+        with TestsBuilder._toolchains_lock(toolchains_dir):
+            manifest = TestsBuilder._read_toolchain_manifest(toolchains_dir)
+            sdk_hash = TestsBuilder._installer_hash(yocto_sdk, manifest)
+
+            install = manifest['installs'].get(sdk_hash)
+            if install and TestsBuilder._is_toolchain_intact(install):
+                log.log(f'Using Yocto SDK installed in "{install["path"]}"',
+                        level=LogLevel.INFO)
+                TestsBuilder._write_toolchain_manifest(toolchains_dir, manifest)
+                return install['path']
+
+            install_dir = os.path.join(toolchains_dir, sdk_hash[:16])
+            TestsBuilder._run_yocto_sdk_installer(yocto_sdk, install_dir)
+
+            # Recording the install in the manifest makes it available to others
+            manifest['installs'][sdk_hash] = {
+                'path': install_dir, 'installer': yocto_sdk,
+                'env_file': TestsBuilder._find_env_file(install_dir)}
+            TestsBuilder._write_toolchain_manifest(toolchains_dir, manifest)
+
+        return install_dir
+
+    @staticmethod
+    def find_yocto_sdk_env_file(install_dir):
+        '''Search for a Yocto SDK environment file in a folder.
+
+        The environment file recorded in the toolchain manifest is used for
+        SDKs installed with "install_yocto_sdk".
+        '''
         install_dir = os.path.abspath(install_dir)
-        TestsBuilder.create_directory(install_dir)
+        manifest = TestsBuilder._read_toolchain_manifest(os.path.dirname(install_dir))
+        for install in manifest['installs'].values():
+            if install.get('path') == install_dir and install.get('env_file') \
+                    and os.path.isfile(install['env_file']):
+                return install['env_file']
+
+        env_file = TestsBuilder._find_env_file(install_dir)
+        if not env_file:
+            raise TestsBuildError(
+                'No environment file (environment-) found in the toolchain installation '
+                f'folder ({install_dir})')
+
+        return env_file
+
+    @staticmethod
+    def _find_env_file(install_dir: str) -> str:
+        env_file_pattern = 'environment-'
+        for file in sorted(os.listdir(install_dir)):
+            if file.startswith(env_file_pattern):
+                return os.path.abspath(os.path.join(install_dir, file))
+
+        return None
+
+    @staticmethod
+    def _run_yocto_sdk_installer(yocto_sdk: str, install_dir: str):
+        # Remove what is left from an interrupted install
+        if os.path.exists(install_dir):
+            shutil.rmtree(install_dir)
 
         log.log('Installing Yocto SDK...', level=LogLevel.INFO)
         log.log(f'  SDK: "{yocto_sdk}"\n  Destination: "{install_dir}"')
@@ -55,25 +133,128 @@ class TestsBuilder:
             command = [yocto_sdk, '-y', '-d', install_dir]
             subprocess.check_output(command, stderr=subprocess.STDOUT)
         except subprocess.CalledProcessError as e:
+            shutil.rmtree(install_dir, ignore_errors=True)
             raise TestsBuildError(
                 f'Failed to install Yocto SDK: {e.output.decode()}')
 
-        return install_dir
+        if not TestsBuilder._find_env_file(install_dir):
+            shutil.rmtree(install_dir, ignore_errors=True)
+            raise TestsBuildError(
+                f'No environment file found after installing Yocto SDK "{yocto_sdk}"')
 
     @staticmethod
-    def find_yocto_sdk_env_file(install_dir):
-        '''Search for a Yocto SDK environment file in a folder.'''
-        env_file_pattern = 'environment-'
-        for file in os.listdir(install_dir):
-            if file.startswith(env_file_pattern):
-                return os.path.abspath(os.path.join(install_dir, file))
+    @contextmanager
+    def _toolchains_lock(toolchains_dir: str):
+        '''Lock the toolchains folder for the calling process'''
+        with open(os.path.join(toolchains_dir, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _installer_hash(yocto_sdk: str, manifest: dict) -> str:
+        '''Return the hash of an installer, hashing it only if changed'''
+        stat = os.stat(yocto_sdk)
+        installer = manifest['installers'].get(yocto_sdk)
+        if installer and installer['size'] == stat.st_size \
+                and installer['mtime'] == stat.st_mtime_ns:
+            return installer['sha256']
+
+        log.log(f'Computing the hash of Yocto SDK "{yocto_sdk}"...')
+        sdk_hash = hashlib.sha256()
+        with open(yocto_sdk, 'rb') as installer_file:
+            for chunk in iter(lambda: installer_file.read(1024*1024), b''):
+                sdk_hash.update(chunk)
+
+        manifest['installers'][yocto_sdk] = {
+            'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': sdk_hash.hexdigest()}
+        return sdk_hash.hexdigest()
+
+    @staticmethod
+    def _is_toolchain_intact(install: dict) -> bool:
+        return os.path.isdir(install.get('path', '')) \
+            and os.path.isfile(install.get('env_file') or '')
 
-        raise TestsBuildError(
-            f'No environment file ({env_file_pattern}) found in the toolchain installation folder ({install_dir})')
+    @staticmethod
+    def _read_toolchain_manifest(toolchains_dir: str) -> dict:
+        manifest = {}
+        try:
+            with open(os.path.join(toolchains_dir, TestsBuilder.TOOLCHAIN_MANIFEST), 'r') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            pass
+
+        manifest.setdefault('installs', {})
+        manifest.setdefault('installers', {})
+        return manifest
+
+    @staticmethod
+    def _write_toolchain_manifest(toolchains_dir: str, manifest: dict):
+        fd, temp_path = tempfile.mkstemp(dir=toolchains_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump(manifest, file, indent=2)
+            os.replace(temp_path, os.path.join(toolchains_dir, TestsBuilder.TOOLCHAIN_MANIFEST))
+        except Exception as e:
+            os.remove(temp_path)
+            raise TestsBuildError(f'Failed to write toolchain manifest: {e}')
+
+    @staticmethod
+    def source_environment(env_file: str) -> dict:
+        '''Return the environment variables set by sourcing @env_file.
+
+        The environment file is only sourced again if modified.
+        '''
+        env_file = os.path.abspath(env_file)
+        try:
+            mtime = os.stat(env_file).st_mtime_ns
+        except OSError as e:
+            raise TestsBuildError(f'Failed to read environment file "{env_file}": {e}')
+
+        with TestsBuilder._environments_lock:
+            environment = TestsBuilder._environments.get(env_file)
+            if environment and environment[0] == mtime:
+                return environment[1]
+
+            dump_environment = f'{shlex.quote(sys.executable)} -c ' \
+                '"import os, json; print(json.dumps(dict(os.environ)))"'
+            command = f'. {shlex.quote(env_file)} && {dump_environment}'
+            log.debug(f'Sourcing environment file "{env_file}"')
+
+            try:
+                out = subprocess.check_output(command, shell=True, stderr=subprocess.PIPE)
+            except subprocess.CalledProcessError as e:
+                raise TestsBuildError(
+                    f'Failed to source environment file "{env_file}": {e.stderr.decode()}')
+
+            # Only the last line is the environment, sourcing may print messages
+            environment = json.loads(out.decode().strip().splitlines()[-1])
+            TestsBuilder._environments[env_file] = (mtime, environment)
+            return environment
+
+    @staticmethod
+    def toolchain_identity(environment: dict) -> str:
+        '''Return a string identifying the compiler of @environment'''
+        compiler = environment.get('CC', '')
+        identity = [compiler]
+        compiler_args = shlex.split(compiler)
+        if compiler_args:
+            compiler_path = shutil.which(compiler_args[0], path=environment.get('PATH'))
+            if compiler_path:
+                stat = os.stat(compiler_path)
+                identity.append(f'{compiler_path}:{stat.st_size}:{stat.st_mtime_ns}')
+
+        return ' '.join(identity)
 
     @staticmethod
     def build_c_test(target_name, env_file, sources, flags=None, install_dir=None):
-        '''Cross-compile a C application with a Yocto SDK environment file.'''
+        '''Cross-compile a C application with a Yocto SDK environment file.
+
+        The application is only built if its sources, headers, flags or
+        toolchain changed since it was last built.
+        '''
         if not target_name or not env_file or not sources:
             raise ValueError('Null target, environment or sources passed')
 
@@ -89,24 +270,105 @@ class TestsBuilder:
             flags = ' '.join(flags)
 
         install_dir = os.path.abspath(install_dir)
-        TestsBuilder.create_directory(install_dir)
+        build_info_dir = os.path.join(install_dir, TestsBuilder.BUILD_INFO_DIR)
+        TestsBuilder.create_directory(build_info_dir)
         target_filepath = os.path.join(install_dir, target_name)
+        build_info_file = os.path.join(build_info_dir, f'{target_name}.json')
+        depfile = os.path.join(build_info_dir, f'{target_name}.d')
+
+        environment = TestsBuilder.source_environment(env_file)
+        build_key = TestsBuilder._build_key(
+            sources, flags, target_filepath, environment, env_file)
+
+        if TestsBuilder._is_up_to_date(build_info_file, build_key, target_filepath):
+            log.log(f'"{target_name}" is up to date', level=LogLevel.INFO)
+            return target_filepath
 
         log.log(f'Cross compiling "{target_name}"...', level=LogLevel.INFO)
-        command = f'. {env_file} && $CC {sources} {flags} -o {target_filepath}'
+        command = f'$CC {sources} {flags} -o {shlex.quote(target_filepath)} ' \
+            f'-MD -MF {shlex.quote(depfile)}'
         log.debug(f'Build command = {command}')
 
         try:
             out = subprocess.check_output(
-                command, shell=True, stderr=subprocess.STDOUT)
+                command, shell=True, stderr=subprocess.STDOUT, env=environment)
         except subprocess.CalledProcessError as e:
             raise TestsBuildError(
                 f'Failed to build "{target_name}": {e.output.decode()}')
 
         log.debug(f'Build output = {out.decode()}')
 
+        dependencies = TestsBuilder._read_depfile(depfile) or shlex.split(sources)
+        TestsBuilder._write_build_info(build_info_file, build_key, dependencies)
+
         return target_filepath
 
+    @staticmethod
+    def _build_key(sources: str, flags: str, target_filepath: str,
+                   environment: dict, env_file: str) -> str:
+        key = hashlib.sha256()
+        for value in [sources, flags, target_filepath, os.getcwd(),
+                      TestsBuilder.toolchain_identity(environment)]:
+            key.update(f'{value}\0'.encode())
+
+        with open(env_file, 'rb') as env:
+            key.update(env.read())
+
+        return key.hexdigest()
+
+    @staticmethod
+    def _file_hash(path: str) -> str:
+        try:
+            with open(path, 'rb') as file:
+                return hashlib.sha256(file.read()).hexdigest()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _read_depfile(depfile: str) -> list:
+        '''Return the files listed in a make dependency file'''
+        try:
+            with open(depfile, 'r') as file:
+                content = file.read()
+        except OSError:
+            return []
+
+        content = content.replace('\\\n', ' ')
+        dependencies = []
+        for rule in content.splitlines():
+            __, __, prerequisites = rule.partition(': ')
+            dependencies.extend(prerequisites.replace('\\ ', '\0').split())
+
+        return [dependency.replace('\0', ' ') for dependency in dependencies]
+
+    @staticmethod
+    def _is_up_to_date(build_info_file: str, build_key: str, target_filepath: str) -> bool:
+        if not os.path.isfile(target_filepath):
+            return False
+
+        try:
+            with open(build_info_file, 'r') as file:
+                build_info = json.load(file)
+        except (OSError, ValueError):
+            return False
+
+        if build_info.get('key') != build_key:
+            return False
+
+        return all(TestsBuilder._file_hash(path) == digest
+                   for path, digest in build_info.get('dependencies', {}).items())
+
+    @staticmethod
+    def _write_build_info(build_info_file: str, build_key: str, dependencies: list):
+        build_info = {'key': build_key,
+                      'dependencies': {path: TestsBuilder._file_hash(path)
+                                       for path in dependencies}}
+        try:
+            with open(build_info_file, 'w') as file:
+                json.dump(build_info, file)
+        except OSError as e:
+            log.debug(f'Failed to write build information "{build_info_file}": {e}')
+
     @staticmethod
     def clean(force=False):
         '''Clean build files.'''
@@ -4,11 +4,17 @@ from functools import partial
 from typing import List, Union
 
 from pluma.core.baseclasses import Logger, LogLevel
-from pluma.test import TestController, TestRunner, TestBase
-from pluma.test.stock.deffuncs import sc_run_n_iterations
+from pluma.test import TestController, TestRunner, TestBase, BoardPoolController
+from pluma.test.stock.deffuncs import sc_run_n_iterations, sc_run_until_converged, \
+    DEFAULT_RELATIVE_WIDTH, DEFAULT_MIN_ITERATIONS
+from pluma.test.confidence import DEFAULT_CONFIDENCE
+from pluma.test.resultsstore import JsonResultsStore, SampledResultsStore, \
+    DEFAULT_RESULTS_WINDOW, DEFAULT_SAMPLE_SIZE
+from pluma.test.resultsprocessor import SoakResultsProcessor
 from pluma.cli import Configuration, ConfigurationError, TestsConfigError, TestDefinition,\
     TestsProvider
 from pluma import Board
+from .plugins import import_plugin_modules
 
 log = Logger()
 
@@ -35,48 +41,140 @@ class TestsConfig:
 
         config.ensure_consumed()
 
-    def create_test_controller(self, board: Board) -> TestController:
-        '''Create a TestController from the configuration, and Board'''
-        if not board or not isinstance(board, Board):
+    def create_test_controller(self, board: Union[Board, List[Board]],
+                               resume: bool = False) -> TestController:
+        '''Create a TestController from the configuration, and Board.
+
+        If a list of several boards is passed, a BoardPoolController running
+        the tests on all boards is returned. If @resume, the results file is
+        kept, for the controller to resume from its checkpoint.
+        '''
+        boards = board if isinstance(board, list) else [board]
+        if not boards or not all(isinstance(board, Board) for board in boards):
             raise ValueError(
                 f'Null or invalid \'board\', which must be of type \'{Board}\'')
 
         settings = self.settings_config
 
         try:
-            controller = self._create_test_controller(board, settings)
+            controller = self._create_test_controller(boards, settings, resume)
             settings.ensure_consumed()
         except ConfigurationError as e:
             raise TestsConfigError(e)
         else:
             return controller
 
-    def _create_test_controller(self, board: Board, settings: Configuration) -> TestController:
-        testrunner = TestRunner(
-            board=board,
-            tests=TestsConfig.create_tests(
-                self.selected_tests(), board),
-            sequential=True,
-            email_on_fail=settings.pop('email_on_fail', default=False),
-            continue_on_fail=settings.pop(
-                'continue_on_fail',  default=True),
-            skip_tasks=settings.pop('skip_tasks',  default=[]),
-            use_testcore=settings.pop(
-                'board_test_sequence', default=False)
-        )
-
-        controller = TestController(
-            testrunner, log_func=partial(log.log, level=LogLevel.INFO),
-            verbose_log_func=partial(log.log, level=LogLevel.NOTICE),
-            debug_log_func=partial(log.log, level=LogLevel.DEBUG)
-        )
-
+    def _create_test_controller(self, boards: List[Board], settings: Configuration,
+                                resume: bool = False) -> TestController:
+        testrunner_settings = {
+            'email_on_fail': settings.pop('email_on_fail', default=False),
+            'continue_on_fail': settings.pop('continue_on_fail',  default=True),
+            'skip_tasks': settings.pop('skip_tasks',  default=[]),
+            'use_testcore': settings.pop('board_test_sequence', default=False),
+            'track_board_state': settings.pop('track_board_state', default=False),
+            'concurrent_tasks': settings.pop('concurrent_tasks', default=False)
+        }
         iterations = settings.pop('iterations')
+        stop_when_converged = settings.pop('stop_when_converged')
+        share_iterations = settings.pop('share_iterations', default=True)
+        results_file = settings.pop('results_file')
+        results_window = settings.pop('results_window', default=DEFAULT_RESULTS_WINDOW)
+        checkpoint_file = settings.pop('checkpoint_file')
+        checkpoint_interval = settings.pop('checkpoint_interval', default=1)
+        soak_window = settings.pop('soak_window')
+        soak_sample_size = settings.pop('soak_sample_size', default=DEFAULT_SAMPLE_SIZE)
+        log_funcs = {
+            'log_func': partial(log.log, level=LogLevel.INFO),
+            'verbose_log_func': partial(log.log, level=LogLevel.NOTICE),
+            'debug_log_func': partial(log.log, level=LogLevel.DEBUG)
+        }
+
+        controllers = []
+        for board in boards:
+            testrunner = TestRunner(
+                board=board,
+                tests=TestsConfig.create_tests(
+                    self.selected_tests(), board),
+                sequential=True,
+                **testrunner_settings
+            )
+            controllers.append(TestController(testrunner, **log_funcs))
+
+        if len(controllers) == 1:
+            controller = controllers[0]
+        else:
+            controller = BoardPoolController(controllers, share_iterations=share_iterations,
+                                             **log_funcs)
+
+        if results_file:
+            controller.results = JsonResultsStore(results_file, int(results_window),
+                                                  truncate=not resume)
+
+        if soak_window:
+            if results_file:
+                raise ConfigurationError(
+                    '"soak_window" and "results_file" cannot be used together')
+            if isinstance(controller, BoardPoolController) and not share_iterations:
+                raise ConfigurationError(
+                    '"soak_window" requires "share_iterations" with several boards')
+
+            controller.results_processor = SoakResultsProcessor(int(soak_window))
+            controller.results = SampledResultsStore(int(soak_window), int(soak_sample_size))
+
+        if checkpoint_file:
+            if isinstance(controller, BoardPoolController):
+                raise ConfigurationError(
+                    '"checkpoint_file" is only supported with a single board')
+            if not results_file:
+                raise ConfigurationError(
+                    '"checkpoint_file" requires "results_file", to keep the results to resume')
+
+            controller.checkpoint_file = checkpoint_file
+            controller.settings['checkpoint_n_iterations'] = int(checkpoint_interval)
+
+        if stop_when_converged:
+            if not iterations:
+                raise ConfigurationError(
+                    '"stop_when_converged" requires "iterations", the maximum number of iterations')
+            run_condition = self._converged_run_condition(stop_when_converged, int(iterations))
+        elif iterations:
+            run_condition = sc_run_n_iterations(ntimes=int(iterations))
+
         if iterations:
-            controller.run_condition = sc_run_n_iterations(ntimes=int(iterations))
+            if isinstance(controller, BoardPoolController) and not share_iterations:
+                for board_controller in controllers:
+                    board_controller.run_condition = run_condition
+            else:
+                controller.run_condition = run_condition
 
         return controller
 
+    @staticmethod
+    def _converged_run_condition(settings: Configuration, max_iterations: int):
+        '''Return the run condition stopping when the statistics in @settings converged'''
+        if not isinstance(settings, Configuration):
+            raise ConfigurationError(
+                f'"stop_when_converged" must be a dictionary, but got "{settings}"')
+
+        fields = settings.pop('fields', default=[])
+        if isinstance(fields, str):
+            fields = [fields]
+        pass_rate_error = settings.pop('pass_rate_error')
+        if not fields and pass_rate_error is None:
+            raise ConfigurationError(
+                '"stop_when_converged" requires "fields" or "pass_rate_error"')
+
+        run_condition = sc_run_until_converged(
+            max_iterations=max_iterations,
+            fields=fields,
+            relative_width=float(settings.pop('relative_width', default=DEFAULT_RELATIVE_WIDTH)),
+            pass_rate_error=None if pass_rate_error is None else float(pass_rate_error),
+            confidence=float(settings.pop('confidence', default=DEFAULT_CONFIDENCE)),
+            min_iterations=int(settings.pop('min_iterations', default=DEFAULT_MIN_ITERATIONS)))
+        settings.ensure_consumed()
+
+        return run_condition
+
     def __populate_tests(self, tests_config: Configuration):
         self.tests = []
 
@@ -135,6 +233,10 @@ class TestsConfig:
                     f' Supported actions: {supported_actions.keys()}')
 
             action_key = next(iter(action))
+            if action_key not in supported_actions and import_plugin_modules():
+                # Plugins may register device actions when imported
+                supported_actions = cls._supported_actions(test_providers)
+
             tests = cls.tests_from_action(action_key=action_key,
                                           action_config=action[action_key],
                                           supported_actions=supported_actions)
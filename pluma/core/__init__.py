@@ -1,18 +1,31 @@
-from .exceptions import *
-from .board import Board, get_board_by_name
-from .usbrelay import USBRelay
-from .usbenet import USBEnet
-from .interface import NetInterface
-from .powerrelay import PowerRelay
-from .powermulti import PowerMulti
-from .softpower import SoftPower
-from .pdu import APCPDU, IPPowerPDU, EnergeniePDU
-from .serialconsole import SerialConsole
-from .hostconsole import HostConsole
-from .telnetconsole import TelnetConsole
-from .sshconsole import SSHConsole
-from .hub import Hub
-from .sdwire import SDWire
-from .multimeter import MultimeterTTI1604
-from .modem import ModemSim868
+from pluma.utils.lazyimport import lazy_import, lazy_attributes
+
+# Drivers are only imported when used, as they depend on heavy libraries
+lazy_import(__name__, {
+    **lazy_attributes('.exceptions',
+                      'ConsoleError', 'ConsoleCannotOpenError', 'ConsoleLoginFailedError',
+                      'ConsoleExceptionKeywordReceivedError', 'ConsoleInvalidJSONReceivedError',
+                      'StorageError', 'BoardError', 'BoardBootValidationError', 'ModemError',
+                      'MultimeterError', 'MultimeterInvalidKeyPress',
+                      'MultimeterMeasurementError', 'MultimeterDecodeError',
+                      'PDUError', 'PDUInvalidPort', 'PDURequestError',
+                      'USBError', 'USBNoDevice'),
+    **lazy_attributes('.board', 'Board', 'get_board_by_name'),
+    **lazy_attributes('.usbrelay', 'USBRelay'),
+    **lazy_attributes('.usbenet', 'USBEnet'),
+    **lazy_attributes('.interface', 'NetInterface'),
+    **lazy_attributes('.powerrelay', 'PowerRelay'),
+    **lazy_attributes('.powermulti', 'PowerMulti'),
+    **lazy_attributes('.softpower', 'SoftPower'),
+    **lazy_attributes('.pdu', 'APCPDU', 'IPPowerPDU', 'EnergeniePDU'),
+    **lazy_attributes('.serialconsole', 'SerialConsole'),
+    **lazy_attributes('.hostconsole', 'HostConsole'),
+    **lazy_attributes('.telnetconsole', 'TelnetConsole'),
+    **lazy_attributes('.sshconsole', 'SSHConsole'),
+    **lazy_attributes('.hub', 'Hub'),
+    **lazy_attributes('.sdwire', 'SDWire'),
+    **lazy_attributes('.multimeter', 'MultimeterTTI1604'),
+    **lazy_attributes('.modem', 'ModemSim868'),
+})
+
 name = "core"
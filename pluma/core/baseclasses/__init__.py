@@ -1,9 +1,18 @@
-from .hardwarebase import HardwareBase
-from .consolebase import ConsoleBase
-from .powerbase import PowerBase
-from .relaybase import RelayBase
-from .storagebase import StorageBase
-from .nonblocking import Nonblocking
-from .locking import Locking
-from .singleton import Singleton
-from .logging import Logger, LogMode, LogLevel
+from pluma.utils.lazyimport import lazy_import, lazy_attributes
+
+lazy_import(__name__, {
+    **lazy_attributes('.hardwarebase', 'HardwareBase'),
+    **lazy_attributes('.consolebase', 'ConsoleBase'),
+    **lazy_attributes('.consolereader', 'ConsoleReader'),
+    **lazy_attributes('.consolecapture', 'ConsoleCapture'),
+    **lazy_attributes('.consoleexpect', 'ConsoleExpect', 'ExpectMatch'),
+    **lazy_attributes('.receivebuffer', 'ReceiveBuffer'),
+    **lazy_attributes('.logsink', 'LogSink', 'LogSinkFile'),
+    **lazy_attributes('.powerbase', 'PowerBase'),
+    **lazy_attributes('.relaybase', 'RelayBase'),
+    **lazy_attributes('.storagebase', 'StorageBase'),
+    **lazy_attributes('.nonblocking', 'Nonblocking'),
+    **lazy_attributes('.locking', 'Locking'),
+    **lazy_attributes('.singleton', 'Singleton'),
+    **lazy_attributes('.logging', 'Logger', 'LogContext', 'LogMessage', 'LogMode', 'LogLevel'),
+})
@@ -1,6 +1,4 @@
 import time
-import pexpect
-import pexpect.fdpexpect
 import json
 import os
 
@@ -14,7 +12,12 @@ from pluma.utils import datetime_to_timestamp
 from pluma.core.dataclasses import SystemContext
 
 from .hardwarebase import HardwareBase
+from .consolereader import ConsoleReader
+from .consolecapture import ConsoleCapture
+from .consoleexpect import ConsoleExpect, ExpectMatch
+from .receivebuffer import ReceiveBuffer
 from .logging import LogLevel
+from .logsink import LogSink
 
 
 class ConsoleError(Exception):
@@ -56,9 +59,17 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
         self.raw_logfile = raw_logfile or default_raw_logfile
         self.system = system or SystemContext()
 
-        self._buffer = ''
+        self._buffer = ReceiveBuffer(self.encoding)
+        self._before = ''
+        self._after = None
         self._last_received = ''
+        self._expect_engine = ConsoleExpect(encoding=self.encoding)
         self._raw_logfile_fd = None
+        self._reader = None
+        self._capture = None
+        self._capture_offset = 0
+        self._capture_buffer_size = None
+        self.capture_enabled = False
         self._pex = None
         self._requires_login = True
 
@@ -75,26 +86,120 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
 
             self._pex.linesep = self.encode(self.linesep)
 
-            if self.raw_logfile:
-                # Create raw_logfile dir if it does not already exist
-                os.makedirs(os.path.dirname(self.raw_logfile), exist_ok=True)
+            if self.raw_logfile and not self._raw_logfile_fd:
+                self._raw_logfile_fd = LogSink().open(self.raw_logfile)
+            self._pex.logfile = self._raw_logfile_fd
 
-                self._raw_logfile_fd = open(self.raw_logfile, 'ab')
-                self._pex.logfile = self._raw_logfile_fd
+            if self._reader:
+                self._reader.close()
+            self._reader = ConsoleReader(self._pex)
+
+            if self.capture_enabled:
+                self._start_capture_thread()
         return wrap
 
     @abstractmethod
     def close(f: Callable[[object], None]):
         @wraps(f)
         def wrap(self):
+            # Stop reading before the transport is closed under the capture thread
+            self._stop_capture_thread()
             f(self)
+            if self._reader:
+                self._reader.close()
+                self._reader = None
             if self._raw_logfile_fd:
                 self._raw_logfile_fd.close()
                 self._raw_logfile_fd = None
         return wrap
 
     def raw_logfile_clear(self):
-        open(self.raw_logfile, 'w').close()
+        LogSink().truncate(self.raw_logfile)
+
+    @property
+    def receive_buffer_size(self) -> int:
+        '''Maximum number of bytes kept in the read buffer.
+
+        When exceeded, the oldest bytes received are dropped.
+        '''
+        return self._buffer.max_size
+
+    @receive_buffer_size.setter
+    def receive_buffer_size(self, size: int):
+        self._buffer.max_size = size
+
+    @property
+    def capture(self) -> ConsoleCapture:
+        '''Background capture of the console, or None if not capturing'''
+        return self._capture
+
+    def start_capture(self, buffer_size: int = None):
+        '''Continuously read the console from a background thread.
+
+        Data received is kept in a ring buffer of @buffer_size bytes, read by
+        this console, and passed to any subscriber of :attr:`capture`.
+        The capture is restarted when the console is reopened, until
+        :meth:`stop_capture` is called.
+        '''
+        self.capture_enabled = True
+        self._capture_buffer_size = buffer_size
+
+        if not self.is_open:
+            self.open()
+        else:
+            self._start_capture_thread()
+
+    def stop_capture(self):
+        '''Stop the background capture, and read the console directly'''
+        self.capture_enabled = False
+        self._stop_capture_thread()
+
+    def _start_capture_thread(self):
+        if self._capture:
+            return
+
+        self._capture = ConsoleCapture(
+            self._reader, buffer_size=self._capture_buffer_size,
+            error_handler=lambda e: self.log(f'Console capture error: {e}', color='yellow',
+                                             level=LogLevel.WARNING))
+        self._capture_offset = self._capture.end_offset
+        self._capture.start()
+
+    def _stop_capture_thread(self):
+        if not self._capture:
+            return
+
+        self._capture.stop()
+        # Keep data captured but not read yet
+        received = self._read_available()
+        self._capture = None
+        self._append_received(received)
+
+    def _read_available(self) -> bytes:
+        '''Return all data received and not read yet, without blocking'''
+        if not self._capture:
+            return self._reader.read_available()
+
+        received, self._capture_offset, dropped = self._capture.read_from(
+            self._capture_offset)
+        if dropped:
+            self.log(f'Console capture buffer overflow, {dropped} bytes dropped',
+                     color='yellow', level=LogLevel.WARNING)
+        return received
+
+    def _wait_for_data(self, timeout: float = None) -> bool:
+        '''Block until data is available to read, or until timeout'''
+        if not self._capture:
+            return self._reader.wait_readable(timeout)
+
+        return self._capture.wait_for_data(self._capture_offset, timeout)
+
+    def _append_received(self, received: bytes):
+        dropped = self._buffer.dropped
+        self._buffer.append(received)
+        if self._buffer.dropped != dropped:
+            self.log(f'Console read buffer full, {self._buffer.dropped - dropped} bytes dropped',
+                     color='yellow', level=LogLevel.WARNING)
 
     @deprecated(version='2.0', reason='Use "read_all" instead')
     def flush(self, clear_buf=False):
@@ -109,27 +214,22 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
 
         if not self.is_open:
             self.open()
-        try:
-            while 1:
-                self._buffer += self.decode(
-                    self._pex.read_nonblocking(1, 0.01))
-        except pexpect.exceptions.TIMEOUT:
-            pass
-        except pexpect.exceptions.EOF:
-            pass
-
-        buffer = self._buffer
-        if not preserve_read_buffer:
-            if self._buffer.strip():
-                self.log(f'<<flushed>>{self._buffer}<</flushed>>',
-                         force_echo=False, level=LogLevel.DEBUG)
-            self._buffer = ''
+
+        self._append_received(self._read_available())
+
+        if preserve_read_buffer:
+            return self._buffer.text()
+
+        buffer = self._buffer.read()
+        if buffer.strip():
+            self.log('<<flushed>>%s<</flushed>>', args=(buffer,),
+                     force_echo=False, level=LogLevel.DEBUG)
 
         return buffer
 
     @property
     def _buffer_size(self):
-        '''Size of the Read buffer for the console'''
+        '''Size of the Read buffer for the console, in bytes'''
         return len(self._buffer)
 
     @deprecated(version='2.0', reason='You should use "read_all" and "_buffer_size" instead')
@@ -168,25 +268,20 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
 
     def wait_for_match(self, match, timeout=None, verbose=None):
         verbose = verbose or False
-        timeout = timeout or self._pex.timeout
 
         if not self.is_open:
             self.open()
 
+        timeout = timeout or self._pex.timeout
+
         if not isinstance(match, list):
             match = [match]
 
         if verbose:
             self.log(f'Waiting up to {timeout}s for patterns: {match}...')
 
-        matched_str = None
-        try:
-            index = self._pex.expect(match, timeout)
-            matched_str = match[index]
-        except pexpect.EOF:
-            pass
-        except pexpect.TIMEOUT:
-            pass
+        expect_match = self._expect(match, timeout)
+        matched_str = expect_match.pattern if expect_match else None
 
         if verbose:
             if matched_str:
@@ -200,34 +295,66 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
     def _wait_for_match(self, match, timeout, verbose=None):
         verbose = verbose or False
 
-        old_timeout = self._pex.timeout
-        self._pex.timeout = timeout
-
         if not self.is_open:
             self.open()
 
         if not isinstance(match, list):
             match = [match]
-        watches = [pexpect.TIMEOUT, pexpect.EOF] + match
 
         if verbose:
             self.log("Waiting up to {}s for patterns: {}...".format(
                 timeout, match))
 
-        matched = watches[self._pex.expect(watches)]
-        self._pex.timeout = old_timeout
-
-        # Pexpect child `.after` is the text matched after calling `.expect`
-        if matched in match:
-            return self.decode(self._pex.after)
+        expect_match = self._expect(match, timeout)
+        if expect_match:
+            return expect_match.text
 
         return False
 
+    def _expect(self, match: list, timeout: float) -> ExpectMatch:
+        '''Wait for any pattern in @match to be received.
+
+        Search the read buffer incrementally as data is received. On success
+        the read buffer is consumed up to the end of the match. The text
+        received before the match, and the text matched, are saved to
+        "_before" and "_after". Return the match, or None on timeout or EOF.
+        '''
+        self._expect_engine.reset()
+        self._after = None
+
+        start = time.time()
+        while True:
+            dropped = self._buffer.dropped
+            self._append_received(self._read_available())
+            if self._buffer.dropped != dropped:
+                # Offsets searched are no longer valid
+                self._expect_engine.reset()
+
+            with self._buffer.view() as received:
+                expect_match = self._expect_engine.search(received, match)
+
+            if expect_match:
+                self._before = self._buffer.decode(0, expect_match.start)
+                self._after = expect_match.text
+                self._buffer.consume(expect_match.end)
+                return expect_match
+
+            remaining = timeout - (time.time() - start)
+            if remaining <= 0 or self._reader.eof or not self._wait_for_data(remaining):
+                break
+
+        self._before = self._buffer.text()
+        return None
+
     def wait_for_bytes(
             self, timeout=None, sleep_time=None,
             start_bytes=None, verbose=None):
+        '''Wait for the read buffer to grow beyond @start_bytes.
+
+        Return as soon as data is received, or False after @timeout.
+        @sleep_time is ignored, as the wait is driven by data arrival.
+        '''
         timeout = timeout or 10.0
-        sleep_time = sleep_time or 0.1
         verbose = verbose or False
 
         if not self.is_open:
@@ -237,57 +364,65 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
         if start_bytes is None:
             start_bytes = self._buffer_size
 
-        elapsed = 0.0
-
-        while(elapsed < timeout):
-            self.read_all(preserve_read_buffer=True)
+        start = time.time()
+        while True:
             current_bytes = self._buffer_size
+            elapsed = time.time() - start
             if verbose:
                 self.log("Waiting for data: Waited[{:.1f}/{:.1f}s] Received[{:.0f}B]...".format(
                     elapsed, timeout, current_bytes-start_bytes))
             if current_bytes > start_bytes:
                 return True
 
-            time.sleep(sleep_time)
-            elapsed += sleep_time
+            if elapsed >= timeout:
+                return False
 
-        return False
+            self._wait_for_data(timeout - elapsed)
+            self.read_all(preserve_read_buffer=True)
 
     def wait_for_quiet(self, quiet: float = None, sleep_time: float = None,
                        timeout: float = None) -> bool:
+        '''Wait until no data has been received for @quiet seconds.
+
+        Wake up on data arrival rather than polling. @sleep_time is the
+        minimum time to wait before the console can be considered quiet.
+        Return False if the console is not quiet before @timeout.
+        '''
         if not self.is_open:
             self.open()
         quiet = quiet if quiet is not None else 0.5
         sleep_time = sleep_time if sleep_time is not None else 0.1
         timeout = timeout if timeout is not None else 10.0
 
-        last_read_buffer_size = 0
         start = time.time()
-        now = start
         quiet_start = start
-        while(now - start < timeout):
-            time.sleep(sleep_time)
+        end = start + timeout
+        while True:
+            now = time.time()
+            quiet_end = max(quiet_start + quiet, start + sleep_time)
+            if quiet_end <= now and quiet_end <= end:
+                return True
+            if now >= end:
+                # Timeout
+                return False
 
+            if not self._wait_for_data(min(quiet_end, end) - now):
+                continue
+
+            last_read_buffer_size = self._buffer_size
             self.read_all(preserve_read_buffer=True)
             read_buffer_size = self._buffer_size
 
             # Check if more data was received
             now = time.time()
-            if read_buffer_size == last_read_buffer_size:
-                if now - quiet_start > quiet:
-                    return True
-            else:
+            if read_buffer_size != last_read_buffer_size:
                 quiet_start = now
 
-            last_read_buffer_size = read_buffer_size
-            log_string = ("Waiting for quiet... Waited[{:.1f}/{:.1f}s] "
-                          "Quiet[{:.1f}/{:.1f}s] Received[{:.0f}B]...")
-            self.log(log_string.format(now - start, timeout, now - quiet_start,
+            log_string = ("Waiting for quiet... Waited[%.1f/%.1fs] "
+                          "Quiet[%.1f/%.1fs] Received[%.0fB]...")
+            self.log(log_string, args=(now - start, timeout, now - quiet_start,
                                        quiet, read_buffer_size), level=LogLevel.DEBUG)
 
-        # Timeout
-        return False
-
     @deprecated(version='2.0', reason='You should use "send_nonblocking" instead')
     def send(self,
              cmd=None,
@@ -342,7 +477,7 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
             else:
                 self._pex.send(cmd)
 
-            self.log('<<sent>>{}<</sent>>'.format(cmd), force_echo=False)
+            self.log('<<sent>>%s<</sent>>', args=(cmd,), force_echo=False)
 
             return (None, None)
         else:
@@ -351,15 +486,15 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
             else:
                 self._pex.send(cmd)
 
-            self.log('<<sent>>{}<</sent>>'.format(cmd), force_echo=False)
+            self.log('<<sent>>%s<</sent>>', args=(cmd,), force_echo=False)
 
             if watches:
                 matched = self.wait_for_data(
                     timeout=data_timeout,
                     match=watches,
                     verbose=log_verbose)
-                received = self.decode(self._pex.before)
-                new_received = received[len(self._last_received):]
+                received = self._before
+                new_received = self._new_received(received)
                 if matched:
                     self._last_received = ''
                     match_str = '<<matched expects={}>>{}<</matched>>'.format(
@@ -367,8 +502,8 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
                 else:
                     self._last_received = received
                     match_str = '<<not_matched expects={}>>'.format(watches)
-                self.log("<<received>>{}{}<</received>>".format(
-                    new_received, match_str), force_echo=False)
+                self.log('<<received>>%s%s<</received>>', args=(new_received, match_str),
+                         force_echo=False)
                 if matched in excepts:
                     self.error('Matched [{}] is in exceptions list {}'.format(
                         matched, excepts), exception=ConsoleExceptionKeywordReceivedError)
@@ -377,7 +512,7 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
                     quiet=quiet_time,
                     sleep_time=quiet_sleep,
                     timeout=quiet_timeout)
-                received = self._buffer
+                received = self._buffer.text()
 
         return (received, matched)
 
@@ -414,11 +549,11 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
                               flush_before=flush_before)
 
         matched_regex = self.wait_for_match(timeout=timeout, match=watches)
-        received = self.decode(self._pex.before)
-        new_received = received[len(self._last_received):]
+        received = self._before
+        new_received = self._new_received(received)
 
         if matched_regex:
-            matched_text = self.decode(self._pex.after)
+            matched_text = self._after
             received += matched_text
             self._last_received = ''
             debug_match_str = f'<<matched expects={watches}>>{matched_regex}<</matched>>'
@@ -427,7 +562,7 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
             self._last_received = received
             debug_match_str = f'<<not_matched expects={watches}>>'
 
-        self.log(f'<<received>>{new_received}{debug_match_str}<</received>>',
+        self.log('<<received>>%s%s<</received>>', args=(new_received, debug_match_str),
                  force_echo=False, level=LogLevel.DEBUG)
 
         if matched_regex in excepts:
@@ -436,6 +571,12 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
 
         return (received, matched_text)
 
+    def _new_received(self, received: str) -> str:
+        '''Return @received, without what was already logged after the last timeout'''
+        if self._last_received and received.startswith(self._last_received):
+            return received[len(self._last_received):]
+        return received
+
     def send_nonblocking(self, cmd: str,
                          send_newline: bool = True,
                          flush_before: bool = True):
@@ -457,7 +598,7 @@ class ConsoleBase(HardwareBase, metaclass=ABCMeta):
         else:
             self._pex.send(cmd)
 
-        self.log(f'<<sent>>{cmd}<</sent>>',
+        self.log('<<sent>>%s<</sent>>', args=(cmd,),
                  force_echo=False, level=LogLevel.DEBUG)
 
     def check_alive(self, timeout=10.0):
@@ -0,0 +1,165 @@
+import threading
+import time
+
+from typing import Callable
+
+from .consolereader import ConsoleReader
+
+""" Default size of the capture ring buffer, in bytes """
+DEFAULT_CAPTURE_BUFFER_SIZE = 1024 * 1024
+
+""" Maximum time the capture thread blocks before checking if it should stop """
+CAPTURE_POLL_INTERVAL = 0.1
+
+
+class ConsoleCapture:
+    '''Continuously read a console from a background thread.
+
+    The capture thread is the only reader of the console transport. All
+    data received is appended to a bounded ring buffer, and passed to each
+    subscriber in the order received. Subscribers are callables taking the
+    bytes received, and are called from the capture thread, so they should
+    not block. This allows a raw log writer, an expect engine or a metrics
+    counter to consume the same data without contending for the transport.
+
+    Data in the ring buffer is addressed by absolute offsets, counted from
+    the start of the capture. Consumers keep track of their own offset, and
+    use :meth:`read_from` and :meth:`wait_for_data` to consume the data.
+    If a consumer falls behind by more than the buffer size, the oldest
+    data is dropped for that consumer. Subscribers are never affected.
+    '''
+
+    def __init__(self, reader: ConsoleReader, buffer_size: int = None,
+                 error_handler: Callable[[Exception], None] = None):
+        if not isinstance(reader, ConsoleReader):
+            raise ValueError('A ConsoleReader is required to capture a console')
+
+        self.buffer_size = buffer_size or DEFAULT_CAPTURE_BUFFER_SIZE
+        self.error_handler = error_handler
+
+        self._reader = reader
+        self._buffer = bytearray()
+        self._start_offset = 0
+        self._subscribers = []
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._finished = True
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}[{self._reader.fd}]'
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def start_offset(self) -> int:
+        '''Absolute offset of the oldest byte retained'''
+        with self._condition:
+            return self._start_offset
+
+    @property
+    def end_offset(self) -> int:
+        '''Absolute offset following the last byte received'''
+        with self._condition:
+            return self._start_offset + len(self._buffer)
+
+    def start(self):
+        if self.running:
+            return
+
+        self._stop_event.clear()
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f'{self}')
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread:
+            return
+
+        self._stop_event.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def subscribe(self, subscriber: Callable[[bytes], None]):
+        '''Call @subscriber with every chunk of data received from now on'''
+        if not callable(subscriber):
+            raise ValueError('Capture subscribers must be callable')
+
+        with self._condition:
+            self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Callable[[bytes], None]):
+        with self._condition:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def read_from(self, offset: int) -> (bytes, int, int):
+        '''Return the data available from @offset.
+
+        Return a tuple of the data, the offset following this data, and
+        the number of bytes dropped because @offset was no longer retained.
+        '''
+        with self._condition:
+            dropped = max(self._start_offset - offset, 0)
+            offset += dropped
+            data = bytes(self._buffer[offset - self._start_offset:])
+            return data, offset + len(data), dropped
+
+    def wait_for_data(self, offset: int, timeout: float = None) -> bool:
+        '''Block until data is available after @offset, or until timeout'''
+        def data_available():
+            return self._start_offset + len(self._buffer) > offset
+
+        start = time.time()
+        with self._condition:
+            self._condition.wait_for(
+                lambda: data_available() or self._finished, timeout=timeout)
+            if data_available():
+                return True
+
+        # The capture ended, do not let callers spin until their timeout
+        if timeout:
+            self._stop_event.wait(max(timeout - (time.time() - start), 0))
+        return False
+
+    def _append(self, data: bytes):
+        with self._condition:
+            self._buffer.extend(data)
+            excess = len(self._buffer) - self.buffer_size
+            if excess > 0:
+                del self._buffer[:excess]
+                self._start_offset += excess
+
+            subscribers = list(self._subscribers)
+            self._condition.notify_all()
+
+        for subscriber in subscribers:
+            try:
+                subscriber(data)
+            except Exception as e:
+                if self.error_handler:
+                    self.error_handler(e)
+
+    def _run(self):
+        while not self._stop_event.is_set() and not self._reader.eof:
+            try:
+                if not self._reader.wait_readable(CAPTURE_POLL_INTERVAL):
+                    continue
+
+                data = self._reader.read_available()
+            except (OSError, ValueError) as e:
+                # Transport closed under the capture thread
+                if self.error_handler and not self._stop_event.is_set():
+                    self.error_handler(e)
+                break
+
+            if data:
+                self._append(data)
+
+        with self._condition:
+            self._finished = True
+            self._condition.notify_all()
@@ -0,0 +1,192 @@
+import codecs
+import re
+
+from collections import OrderedDict
+
+try:
+    import re._parser as sre_parse
+except ImportError:
+    import sre_parse
+
+""" Default maximum number of bytes searched back for unbounded patterns """
+DEFAULT_SEARCH_WINDOW = 32768
+
+""" Number of compiled pattern lists kept in cache """
+PATTERNS_CACHE_SIZE = 64
+
+
+class ExpectMatch:
+    '''Result of a successful search by :class:`ConsoleExpect`.
+
+    @start and @end are offsets in bytes, and @text is the text matched.
+    '''
+
+    def __init__(self, index: int, pattern: str, start: int, end: int, text: str):
+        self.index = index
+        self.pattern = pattern
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}[{self.pattern}: {self.text}]'
+
+
+class CompiledPatterns:
+    '''A list of patterns compiled into a single regular expression.
+
+    Patterns are combined as an alternation, so a list of N patterns is
+    searched in one pass. As with pexpect, the match starting first in the
+    data wins, and ties go to the pattern listed first. Patterns which cannot
+    be combined, such as patterns using back references, are searched one
+    by one instead. String patterns are encoded with @encoding, as the
+    search is done on the bytes received.
+    '''
+
+    def __init__(self, patterns: list, encoding: str):
+        self.patterns = list(patterns)
+        self.encoding = encoding
+        self.regexes = [self._compile(p) for p in self.patterns]
+        self.max_width = max((CompiledPatterns._max_width(r) for r in self.regexes),
+                             default=0)
+
+        self.combined = None
+        self._group_indexes = []
+        if (len(self.regexes) > 1 and
+                all(CompiledPatterns._can_combine(p) for p in self.patterns)):
+            try:
+                self._compile_combined()
+            except re.error:
+                # E.g. the same group name used in two patterns
+                self.combined = None
+
+    def _compile_combined(self):
+        group_index = 1
+        alternatives = []
+        for regex in self.regexes:
+            self._group_indexes.append(group_index)
+            alternatives.append(b'(' + regex.pattern + b')')
+            group_index += regex.groups + 1
+
+        self.combined = re.compile(b'|'.join(alternatives), re.DOTALL)
+
+    def search(self, data: bytes, pos: int) -> tuple:
+        '''Return the index of the pattern matched first in @data, and its match'''
+        if self.combined:
+            match = self.combined.search(data, pos)
+            if not match:
+                return None, None
+
+            for index, group_index in enumerate(self._group_indexes):
+                if match.start(group_index) != -1:
+                    return index, match
+
+        best_index, best_match = None, None
+        for index, regex in enumerate(self.regexes):
+            match = regex.search(data, pos)
+            if match and (not best_match or match.start() < best_match.start()):
+                best_index, best_match = index, match
+
+        return best_index, best_match
+
+    def _compile(self, pattern):
+        # Like pexpect, "." also matches new lines, unless already compiled
+        if isinstance(pattern, str):
+            return re.compile(pattern.encode(self.encoding), re.DOTALL)
+        elif isinstance(pattern, bytes):
+            return re.compile(pattern, re.DOTALL)
+        elif hasattr(pattern, 'search'):
+            if isinstance(pattern.pattern, str):
+                return re.compile(pattern.pattern.encode(self.encoding),
+                                  pattern.flags & ~re.UNICODE)
+            return pattern
+
+        raise TypeError(f'Invalid pattern {pattern}, must be a string or a compiled regex')
+
+    @staticmethod
+    def _max_width(regex) -> int:
+        try:
+            return sre_parse.parse(regex.pattern, regex.flags).getwidth()[1]
+        except Exception:
+            return sre_parse.MAXREPEAT
+
+    @staticmethod
+    def _can_combine(pattern) -> bool:
+        '''Back references and global flags would change meaning once combined'''
+        if isinstance(pattern, bytes):
+            pattern = pattern.decode('latin-1')
+
+        return (isinstance(pattern, str) and
+                re.search(r'\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux]+\)', pattern) is None)
+
+
+class ConsoleExpect:
+    '''Incremental pattern matching engine for console output.
+
+    Searches a growing buffer of bytes for a list of patterns without
+    rescanning data already searched:
+    - Pattern lists are compiled once, and cached.
+    - After a failed search, the next search resumes close to the end of the
+      data already searched. Only the last bytes which could still be the
+      start of a match are searched again, based on the maximum length of
+      the patterns.
+    - For patterns with no maximum length, at most the last @search_window
+      bytes already searched are searched again. New data is always
+      searched in full.
+    - Multiple patterns are combined and searched in a single pass.
+
+    The data searched can be any bytes-like object, such as a memoryview, so
+    that it is not copied. The caller must call :meth:`reset` when bytes are
+    removed from the start of the buffer searched.
+    '''
+
+    def __init__(self, search_window: int = None, encoding: str = None):
+        self.search_window = search_window or DEFAULT_SEARCH_WINDOW
+        self.encoding = encoding or 'ascii'
+        self._cache = OrderedDict()
+        self._patterns_key = None
+        self._resume = 0
+
+    def compile(self, patterns: list) -> CompiledPatterns:
+        '''Return the compiled @patterns, from the cache if already compiled'''
+        key = tuple(patterns)
+        compiled = self._cache.get(key)
+        if compiled:
+            self._cache.move_to_end(key)
+            return compiled
+
+        compiled = CompiledPatterns(patterns, self.encoding)
+        self._cache[key] = compiled
+        if len(self._cache) > PATTERNS_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+        return compiled
+
+    def reset(self):
+        '''Search the next buffer from its start'''
+        self._resume = 0
+
+    def search(self, data: bytes, patterns: list) -> ExpectMatch:
+        '''Search @data for @patterns, resuming from the last search.
+
+        Return an :class:`ExpectMatch` for the first match found, or None.
+        '''
+        compiled = self.compile(patterns)
+        if compiled.patterns != self._patterns_key:
+            self._patterns_key = compiled.patterns
+            self._resume = 0
+
+        start = min(self._resume, len(data))
+        index, match = compiled.search(data, start)
+
+        if not match:
+            # Resume where a match could still be completed by new data, never
+            # searching again further back than the window
+            overlap = min(max(compiled.max_width - 1, 0), self.search_window)
+            self._resume = max(len(data) - overlap, start)
+            return None
+
+        self._resume = 0
+        return ExpectMatch(index=index, pattern=compiled.patterns[index],
+                           start=match.start(), end=match.end(),
+                           text=codecs.decode(match.group(0), self.encoding, 'replace'))
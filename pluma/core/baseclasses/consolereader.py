@@ -0,0 +1,70 @@
+import selectors
+import time
+
+import pexpect
+
+""" Maximum number of bytes requested from the transport per read """
+DEFAULT_READ_CHUNK_SIZE = 16384
+
+
+class ConsoleReader:
+    '''Event driven read engine for a console transport.
+
+    Wraps the pexpect object of a console, and uses a selector on its
+    file descriptor to wait for data to arrive, instead of sleeping and
+    polling. Available data is drained in large chunks rather than one
+    byte at a time.
+    '''
+
+    def __init__(self, pex, chunk_size: int = None):
+        if pex is None:
+            raise ValueError('A pexpect object is required to read a console')
+
+        self._pex = pex
+        self.chunk_size = chunk_size or DEFAULT_READ_CHUNK_SIZE
+        self.eof = False
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(pex.child_fd, selectors.EVENT_READ)
+
+    @property
+    def fd(self) -> int:
+        return self._pex.child_fd
+
+    def wait_readable(self, timeout: float = None) -> bool:
+        '''Block until data is available to read, or until timeout.
+
+        Return True if data is available, False on timeout or if the
+        transport reached EOF.
+        '''
+        if timeout is not None:
+            timeout = max(timeout, 0)
+
+        if self.eof:
+            # An fd at EOF is always readable, do not spin on it
+            if timeout:
+                time.sleep(timeout)
+            return False
+
+        return bool(self._selector.select(timeout))
+
+    def read_available(self) -> bytes:
+        '''Read and return all the data currently available, without blocking'''
+        chunks = []
+        while not self.eof:
+            try:
+                chunk = self._pex.read_nonblocking(self.chunk_size, 0)
+            except pexpect.exceptions.TIMEOUT:
+                break
+            except pexpect.exceptions.EOF:
+                self.eof = True
+                break
+
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        return b''.join(chunks)
+
+    def close(self):
+        self._selector.close()
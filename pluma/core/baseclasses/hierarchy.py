@@ -1,3 +1,8 @@
+import threading
+
+_propagation = threading.local()
+
+
 class Hierarchy():
     """ This class is inherited in order add Hierarchy to a class """
 
@@ -8,10 +13,7 @@ class Hierarchy():
 
     @property
     def _recurse_hier(self):
-        if hasattr(self, "__recurse_hier"):
-            return self.__recurse_hier
-        else:
-            return False
+        return getattr(self, '_Hierarchy__recurse_hier', False)
 
     @_recurse_hier.setter
     def _recurse_hier(self, _recurse_hier):
@@ -19,23 +21,48 @@ class Hierarchy():
         self._children_set_attr("_recurse_hier", _recurse_hier)
 
     def _get_hier(self):
+        '''Return the children and attributes of this object.
+
+        Only instance attributes are looked up, so properties, which can
+        perform hardware I/O, are never evaluated. Hierarchy objects held in
+        a list, tuple or dict attribute are children too.
+        '''
         children = {}
         attrs = {}
-        for m in dir(self):
-            member = getattr(self, m)
+        for name, member in vars(self).items():
             if isinstance(member, Hierarchy):
-                children[m] = member
-            elif(not m.startswith("_") and
-                    not callable(member)):
-                attrs[m] = member
+                children[name] = member
+            elif isinstance(member, dict):
+                children.update((f'{name}[{key}]', value) for key, value in member.items()
+                                if isinstance(value, Hierarchy))
+            elif isinstance(member, (list, tuple)):
+                children.update((f'{name}[{index}]', value) for index, value in enumerate(member)
+                                if isinstance(value, Hierarchy))
+
+            if (not name.startswith("_") and not callable(member) and
+                    not isinstance(member, Hierarchy)):
+                attrs[name] = member
         return children, attrs
 
     def _children_set_attr(self, attr, value):
-        children, __ = self._get_hier()
-        for key in children:
-            child = children[key]
-            setattr(child, attr, value)
-            child._children_set_attr(attr, value)
+        '''Set @attr to @value on all descendants, visiting each once'''
+        if getattr(_propagation, 'active', False):
+            # Already setting descendants, from an ancestor
+            return
+
+        _propagation.active = True
+        try:
+            visited = {id(self)}
+            pending = [self]
+            while pending:
+                children, __ = pending.pop()._get_hier()
+                for child in children.values():
+                    if id(child) not in visited:
+                        visited.add(id(child))
+                        setattr(child, attr, value)
+                        pending.append(child)
+        finally:
+            _propagation.active = False
 
     def show_hier(self, indent_level=1, indent_size=4, recurse=True, exclude=None):
         """ Return string containing all local vars, and get children to do the same """
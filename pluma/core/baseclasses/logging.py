@@ -1,10 +1,15 @@
+import contextlib
 import datetime
 import os
+import threading
+
+from collections import deque
 
 from enum import Enum, IntEnum
 from pluma.utils import datetime_to_timestamp
 
 from .hierarchy import hier_setter
+from .logsink import LogSink
 from .singleton import Singleton
 
 """ Enable logging """
@@ -70,11 +75,67 @@ class LogMode(Enum):
             return int(LogLevel.DEBUG)
 
 
+class LogMessage:
+    '''Log message, built only when first converted to a string.
+
+    @message can be a string, a %-style format string for @args, or a
+    callable returning the message.
+    '''
+
+    __slots__ = ('_message', '_args', '_prefix', '_time', '_time_format', '_text')
+
+    def __init__(self, message, args: tuple = None, prefix: str = None,
+                 time: datetime.datetime = None, time_format: str = None):
+        self._message = message
+        self._args = args
+        self._prefix = prefix
+        self._time = time
+        self._time_format = time_format
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            message = self._message() if callable(self._message) else self._message
+            message = str(message)
+            if self._args is not None:
+                message = message % self._args
+
+            prefix = self._prefix or ''
+            if self._time:
+                prefix = '{} {}'.format(self._time.strftime(self._time_format), prefix)
+            if prefix:
+                message = '{}: {}'.format(prefix, message)
+
+            self._text = message
+
+        return self._text
+
+
+class LogContext:
+    '''Output state of the messages logged for a board or thread'''
+
+    def __init__(self, name: str = None):
+        self.name = name
+        self.held = False
+        self.hold_buffer = []
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}[{self.name}]'
+
+
 class Logger(Singleton):
     '''Global log manager for the standard output.
 
     Handles the text formatting and what to output
     based on log levels and log mode.
+
+    Messages are logged in a context, either named with :meth:`context`
+    (e.g. for a board), or specific to the current thread. Holding the log
+    only holds the messages of the current context.
+
+    Messages output are appended to a queue, and written by whichever thread
+    acquires the output first, so that threads logging never wait on each
+    other, and messages are never interleaved.
     '''
 
     def __init__(self):
@@ -83,35 +144,96 @@ class Logger(Singleton):
 
         self._initialized = True
         self.mode = LogMode.NORMAL
-        self.held = False
-        self.log_buffer = ''
 
-    def log(self, message, color=None, bold=False, newline=True, bypass_hold=False, level=None):
+        self._local = threading.local()
+        self._contexts = {}
+        self._contexts_lock = threading.Lock()
+        self._output = deque()
+        self._output_lock = threading.Lock()
+
+    @property
+    def mode(self) -> LogMode:
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: LogMode):
+        self._mode = mode
+        self._min_level = mode.min_level()
+
+    def enabled(self, level: LogLevel = None) -> bool:
+        '''Return True if messages of @level are output in the current mode'''
         if level is None:
             level = LogLevel.NOTICE
 
-        if level < self.mode.min_level():
+        return level >= self._min_level
+
+    @contextlib.contextmanager
+    def context(self, name: str):
+        '''Log the messages of the current thread in the context @name'''
+        with self._contexts_lock:
+            context = self._contexts.get(name)
+            if not context:
+                context = self._contexts[name] = LogContext(name)
+
+        previous = getattr(self._local, 'context', None)
+        self._local.context = context
+        try:
+            yield context
+        finally:
+            self._local.context = previous
+
+    @property
+    def current_context(self) -> LogContext:
+        context = getattr(self._local, 'context', None)
+        if context:
+            return context
+
+        context = getattr(self._local, 'thread_context', None)
+        if not context:
+            context = self._local.thread_context = LogContext(
+                threading.current_thread().name)
+        return context
+
+    @property
+    def held(self) -> bool:
+        return self.current_context.held
+
+    @property
+    def log_buffer(self) -> str:
+        return ''.join(self.current_context.hold_buffer)
+
+    def log(self, message, color=None, bold=False, newline=True, bypass_hold=False, level=None,
+            args: tuple = None):
+        '''Output @message if @level is enabled.
+
+        @message can also be a %-style format string for @args, or a callable
+        returning the message, which are only formatted if output.
+        '''
+        if not self.enabled(level):
             return
 
+        if args is not None or callable(message):
+            message = str(LogMessage(message, args))
+
         self._log(message, color, bold, newline, bypass_hold)
 
-    def debug(self, message):
-        self.log(message, level=LogLevel.DEBUG)
+    def debug(self, message, *args):
+        self.log(message, level=LogLevel.DEBUG, args=args or None)
 
-    def notice(self, message):
-        self.log(message, level=LogLevel.NOTICE)
+    def notice(self, message, *args):
+        self.log(message, level=LogLevel.NOTICE, args=args or None)
 
-    def info(self, message):
-        self.log(message, level=LogLevel.INFO)
+    def info(self, message, *args):
+        self.log(message, level=LogLevel.INFO, args=args or None)
 
-    def warning(self, message):
-        self.log(message, color='yellow', level=LogLevel.WARNING)
+    def warning(self, message, *args):
+        self.log(message, color='yellow', level=LogLevel.WARNING, args=args or None)
 
-    def important(self, message):
-        self.log(message, level=LogLevel.IMPORTANT)
+    def important(self, message, *args):
+        self.log(message, level=LogLevel.IMPORTANT, args=args or None)
 
-    def error(self, message):
-        self.log(message, color='red', level=LogLevel.ERROR)
+    def error(self, message, *args):
+        self.log(message, color='red', level=LogLevel.ERROR, args=args or None)
 
     def _log(self, message, color=None, bold=False, newline=True, bypass_hold=False):
         style_reset = STYLE_NORMAL
@@ -129,21 +251,36 @@ class Logger(Singleton):
         if newline:
             message += os.linesep
 
-        if self.held and not bypass_hold:
-            self.log_buffer += message
+        context = self.current_context
+        if context.held and not bypass_hold:
+            context.hold_buffer.append(message)
         else:
-            print(message, end='', flush=not newline)
+            self._write(message, flush=not newline)
+
+    def _write(self, message: str, flush: bool):
+        self._output.append((message, flush))
+
+        # If another thread is writing, it writes this message too
+        while self._output and self._output_lock.acquire(blocking=False):
+            try:
+                while self._output:
+                    message, flush = self._output.popleft()
+                    print(message, end='', flush=flush)
+            finally:
+                self._output_lock.release()
 
     def hold(self):
-        '''Hold the log output until `release` is called.'''
-        self.held = True
+        '''Hold the log output of the current context until `release` is called.'''
+        self.current_context.held = True
 
     def release(self):
-        '''Flush the log, and restore log output to normal.'''
-        self.held = False
-        if self.log_buffer:
-            self._log(self.log_buffer)
-        self.log_buffer = ''
+        '''Flush the log of the current context, and restore log output to normal.'''
+        context = self.current_context
+        context.held = False
+        hold_buffer, context.hold_buffer = context.hold_buffer, []
+        log_buffer = ''.join(hold_buffer)
+        if log_buffer:
+            self._log(log_buffer)
 
 
 class Logging():
@@ -246,43 +383,54 @@ class Logging():
 
     def log_file_clear(self):
         if self.log_file:
-            open(self.log_file, 'w').close()
+            LogSink().truncate(self.log_file)
 
     def log(self, message, color=None, bold=False, force_echo=None,
-            force_log_file=False, newline=True, bypass_hold=False, level=None):
-        prefix = ''
+            force_log_file=False, newline=True, bypass_hold=False, level=None,
+            args: tuple = None):
+        '''Write @message to the log file, and echo it if @level is enabled.
+
+        @message can also be a %-style format string for @args, or a callable
+        returning the message. The message is then only formatted if echoed,
+        or when written to the log file by the LogSink thread.
+        '''
+        logger = Logger()
+        if logger.mode == LogMode.SILENT:
+            return
 
         if force_echo is not None:
             echo = force_echo
         else:
             echo = self.log_echo
+        echo = echo and logger.enabled(level)
 
         if force_log_file is not False:
             log_file = force_log_file
         else:
             log_file = self.log_file
 
-        if self.log_on:
-            if self.log_hier_path:
-                prefix = '[{}]{}'.format(self.log_hier_path, prefix)
-            if self.log_name:
-                prefix = '{}{}'.format(self.log_name, prefix)
-            if self.log_time and self.log_time_format:
-                timestr = datetime.datetime.now().strftime(self.log_time_format)
-                prefix = '{} {}'.format(timestr, prefix)
-            if prefix:
-                message = '{}: {}'.format(prefix, message)
-            if log_file:
-                logdir = os.path.dirname(log_file)
-                if logdir and not os.path.exists(logdir):
-                    os.makedirs(logdir)
-                with open(log_file, 'a', encoding='utf-8') as logfd:
-                    logfd.write(message + '\n')
-
-            if echo:
-                logger = Logger()
-                logger.log(message.replace('\\n', '\n'), color=color, bold=bold,
-                           newline=newline, bypass_hold=bypass_hold, level=level)
+        if not echo and not log_file:
+            return
+
+        prefix = ''
+        if self.log_hier_path:
+            prefix = '[{}]{}'.format(self.log_hier_path, prefix)
+        if self.log_name:
+            prefix = '{}{}'.format(self.log_name, prefix)
+
+        time = None
+        if self.log_time and self.log_time_format:
+            time = datetime.datetime.now()
+
+        message = LogMessage(message, args=args, prefix=prefix, time=time,
+                             time_format=self.log_time_format)
+
+        if log_file:
+            LogSink().write(log_file, lambda: '{}\n'.format(message))
+
+        if echo:
+            logger.log(str(message).replace('\\n', '\n'), color=color, bold=bold,
+                       newline=newline, bypass_hold=bypass_hold, level=level)
 
     def hold_log(self):
         global_log = Logger()
@@ -292,6 +440,10 @@ class Logging():
         global_log = Logger()
         global_log.release()
 
+    def flush_log(self):
+        '''Write all log messages pending to the log files'''
+        LogSink().flush()
+
     def error(self, message, exception=None):
         message = f'ERROR: {message}'
         self.log(message, color='red', bold=True)
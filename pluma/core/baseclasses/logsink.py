@@ -0,0 +1,196 @@
+import atexit
+import os
+import sys
+import threading
+
+from .singleton import Singleton
+
+""" Maximum time data is held in memory before being written, in seconds """
+LOG_FLUSH_INTERVAL = 0.5
+
+""" Size of the pending data triggering an early write, in bytes """
+LOG_BATCH_SIZE = 64 * 1024
+
+
+class LogSinkFile:
+    '''File-like handle writing to a file through the :class:`LogSink`.
+
+    Can be used where a binary file object is expected, such as the
+    "logfile" of a pexpect spawn. :meth:`flush` does not write the data,
+    as pexpect flushes after every chunk, and data is written in batches
+    by the LogSink thread instead.
+    '''
+
+    def __init__(self, sink: 'LogSink', path: str):
+        self.sink = sink
+        self.path = path
+        self.closed = False
+
+    def write(self, data: bytes):
+        self.sink.write(self.path, data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.sink.close(self.path)
+
+
+class LogSink(Singleton):
+    '''Shared writer for all log files.
+
+    Each log file is opened once, and kept open. Data written is queued in
+    memory, and written in batches by a background thread, at least every
+    LOG_FLUSH_INTERVAL seconds. :meth:`flush` writes all pending data
+    immediately, and is called on exit, including after an unhandled
+    exception.
+
+    Files are opened when first written to, so that errors such as an
+    invalid path are raised to the caller.
+    '''
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._files = {}
+        self._users = {}
+        self._pending = []
+        self._pending_size = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+        atexit.register(self.close_all)
+
+    def write(self, path: str, data):
+        '''Queue @data to be written to the file at @path.
+
+        @data can be bytes, a string, or a callable returning a string, which
+        is then only called by the writer thread.
+        '''
+        if not data:
+            return
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        elif not callable(data):
+            data = bytes(data)
+
+        with self._lock:
+            if path not in self._files:
+                self._files[path] = self._open(path)
+
+            self._pending.append((path, data))
+            self._pending_size += len(data) if isinstance(data, bytes) else 0
+            batch_full = self._pending_size >= LOG_BATCH_SIZE
+
+            self._start_thread()
+
+        if batch_full:
+            self._wakeup.set()
+
+    def open(self, path: str) -> LogSinkFile:
+        '''Return a file-like handle writing to @path.
+
+        The file is closed once all handles for @path are closed.
+        '''
+        with self._lock:
+            if path not in self._files:
+                self._files[path] = self._open(path)
+            self._users[path] = self._users.get(path, 0) + 1
+
+        return LogSinkFile(self, path)
+
+    def close(self, path: str):
+        '''Release a handle on @path, and close the file if last'''
+        with self._lock:
+            users = self._users.get(path, 0) - 1
+            if users > 0:
+                self._users[path] = users
+                return
+            self._users.pop(path, None)
+
+        self.flush()
+        with self._write_lock, self._lock:
+            # Could have been reopened meanwhile
+            if path not in self._users and path in self._files:
+                self._files.pop(path).close()
+
+    def truncate(self, path: str):
+        '''Empty the file at @path, discarding any data pending'''
+        with self._write_lock, self._lock:
+            self._pending = [p for p in self._pending if p[0] != path]
+            self._pending_size = sum(len(data) for _, data in self._pending
+                                     if isinstance(data, bytes))
+
+            if path in self._files:
+                self._files[path].truncate(0)
+            else:
+                open(path, 'w').close()
+
+    def flush(self):
+        '''Write all data pending, and flush all files'''
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                self._pending_size = 0
+                files = dict(self._files)
+
+            batches = {}
+            for path, data in pending:
+                if callable(data):
+                    try:
+                        data = str(data()).encode('utf-8')
+                    except Exception as e:
+                        data = f'Failed to format log message: {e}\n'.encode('utf-8')
+                batches.setdefault(path, []).append(data)
+
+            # Files closed after the data was queued are skipped
+            batches = {path: chunks for path, chunks in batches.items() if path in files}
+
+            for path, chunks in batches.items():
+                try:
+                    files[path].write(b''.join(chunks))
+                except (OSError, ValueError) as e:
+                    print(f'Failed to write to log file {path}: {e}', file=sys.stderr)
+
+            for path in batches:
+                try:
+                    files[path].flush()
+                except (OSError, ValueError):
+                    pass
+
+    def close_all(self):
+        '''Write all data pending, and close all files'''
+        self.flush()
+        with self._write_lock, self._lock:
+            for logfile in self._files.values():
+                logfile.close()
+            self._files.clear()
+            self._users.clear()
+
+    def _open(self, path: str):
+        logdir = os.path.dirname(path)
+        if logdir:
+            os.makedirs(logdir, exist_ok=True)
+
+        return open(path, 'ab')
+
+    def _start_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=self.__class__.__name__)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(LOG_FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self.flush()
@@ -12,7 +12,7 @@ class PowerBase(HardwareBase, metaclass=ABCMeta):
     def on(f):
         @wraps(f)
         def wrap(self, *args, **kwargs):
-            self.log(f'{str(self)}: Power on')
+            self.log('%s: Power on', args=(self,))
             f(self, *args, **kwargs)
         return wrap
 
@@ -20,12 +20,12 @@ class PowerBase(HardwareBase, metaclass=ABCMeta):
     def off(f):
         @wraps(f)
         def wrap(self, *args, **kwargs):
-            self.log(f'{str(self)}: Power off')
+            self.log('%s: Power off', args=(self,))
             f(self, *args, **kwargs)
         return wrap
 
     def reboot(self):
         self.off()
-        self.log(f'{str(self)}: Waiting {self.reboot_delay}s to power on...')
+        self.log('%s: Waiting %ss to power on...', args=(self, self.reboot_delay))
         time.sleep(self.reboot_delay)
         self.on()
@@ -0,0 +1,131 @@
+import codecs
+
+""" Default maximum size of a console receive buffer, in bytes """
+DEFAULT_RECEIVE_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+class ReceiveBuffer:
+    '''Bounded buffer of the bytes received by a console.
+
+    Bytes are stored in a bytearray, and decoded incrementally when text is
+    requested, so a multibyte character split between two reads is decoded
+    once complete, instead of being replaced. When more than @max_size bytes
+    are stored, the oldest bytes are dropped.
+
+    Consumers can search the raw bytes without copying them with
+    :meth:`view`. The buffer cannot grow while a view is held, so views
+    should be released (e.g. used as context managers) after use.
+    '''
+
+    def __init__(self, encoding: str = None, max_size: int = None):
+        self.encoding = encoding or 'ascii'
+        self.dropped = 0
+
+        self._data = bytearray()
+        self._max_size = max_size or DEFAULT_RECEIVE_BUFFER_SIZE
+        self._decoder_class = codecs.getincrementaldecoder(self.encoding)
+        self._reset_text()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __bool__(self):
+        return len(self._data) > 0
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}[{len(self)}/{self.max_size}B]'
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, size: int):
+        if size <= 0:
+            raise ValueError(f'Invalid receive buffer size {size}, must be positive')
+
+        self._max_size = size
+        self._drop_excess()
+
+    def append(self, data: bytes):
+        '''Add @data to the end of the buffer, dropping the oldest bytes if full'''
+        if not data:
+            return
+
+        self._data.extend(data)
+        self._drop_excess()
+
+    def view(self, start: int = 0, end: int = None) -> memoryview:
+        '''Return a view of the bytes from @start to @end, without copy.
+
+        The view must not be modified.
+        '''
+        return memoryview(self._data)[start:end]
+
+    def text(self) -> str:
+        '''Return the buffer decoded, up to the last complete character'''
+        if self._decoded < len(self._data):
+            with self.view(self._decoded) as new_data:
+                self._text += self._decoder.decode(new_data, final=False)
+            self._decoded = len(self._data)
+
+        return self._text
+
+    def decode(self, start: int = 0, end: int = None) -> str:
+        '''Return the bytes from @start to @end decoded'''
+        with self.view(start, end) as data:
+            return codecs.decode(data, self.encoding, 'replace')
+
+    @property
+    def pending(self) -> int:
+        '''Number of bytes at the end of a character not fully received yet'''
+        self.text()
+        return len(self._decoder.getstate()[0])
+
+    def consume(self, size: int):
+        '''Remove @size bytes from the start of the buffer'''
+        if size <= 0:
+            return
+
+        size = min(size, len(self._data))
+        if self.encoding.replace('-', '').lower() == 'utf8':
+            # Do not leave the remainder of a split character at the start
+            while size < len(self._data) and self._data[size] & 0xC0 == 0x80:
+                size += 1
+
+        # Trim the decoded text, instead of decoding the whole buffer again,
+        # if the bytes removed decode to its first characters
+        removed_text = None
+        if size <= self._decoded:
+            removed_text = self.decode(0, size)
+
+        del self._data[:size]
+        if removed_text is not None and self._text.startswith(removed_text):
+            self._text = self._text[len(removed_text):]
+            self._decoded -= size
+        else:
+            self._reset_text()
+
+    def read(self) -> str:
+        '''Return the buffer decoded, and remove it from the buffer.
+
+        Bytes of a character not fully received yet are kept.
+        '''
+        text = self.text()
+        self.consume(len(self._data) - self.pending)
+        return text
+
+    def clear(self):
+        self._data.clear()
+        self._reset_text()
+
+    def _drop_excess(self):
+        excess = len(self._data) - self._max_size
+        if excess > 0:
+            self.dropped += excess
+            self.consume(excess)
+
+    def _reset_text(self):
+        self._decoder = self._decoder_class('replace')
+        self._text = ''
+        self._decoded = 0
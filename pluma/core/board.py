@@ -1,5 +1,5 @@
+import re
 import time
-from pexpect import TIMEOUT, EOF
 
 from .baseclasses import HardwareBase, ConsoleBase
 from .dataclasses import SystemContext
@@ -114,7 +114,7 @@ class Board(HardwareBase):
             if not bootstr:
                 bootstr = prompt
             elif isinstance(bootstr, list):
-                bootstr.append(prompt)
+                bootstr = bootstr + [prompt]
             else:
                 bootstr = [bootstr, prompt]
 
@@ -124,20 +124,24 @@ class Board(HardwareBase):
 
         self.booted_to_prompt = False
         self.last_boot_len = None
+
+        # Discard output from before the reboot, so it cannot match
+        self.console.read_all()
         self.power.reboot()
         start_time = time.time()
         try:
             (__, matched) = self.console.send_and_expect(
+                cmd='',
                 match=bootstr,
                 excepts=exception_bootstr,
                 send_newline=False,
-                timeout=timeout,
-                sleep_time=5)
+                flush_before=False,
+                timeout=timeout)
         except ConsoleExceptionKeywordReceivedError as e:
             raise BoardBootValidationError('Matched exception keyword: {}'.format(
                 str(e)))
 
-        if matched is False or matched is TIMEOUT or matched is EOF:
+        if not matched:
             raise BoardBootValidationError(
                 "Did not get bootstring: {}".format(bootstr))
 
@@ -146,7 +150,7 @@ class Board(HardwareBase):
         self.log('Boot success. Matched [{}]'.format(matched))
 
         prompt = self.system.prompt_regex
-        if prompt and matched == prompt:
+        if prompt and re.search(prompt, matched):
             self.booted_to_prompt = True
 
         return self.last_boot_len
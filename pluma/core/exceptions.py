@@ -1,10 +1,15 @@
-from .baseclasses.consolebase import ConsoleError,\
-    ConsoleCannotOpenError, ConsoleLoginFailedError, ConsoleExceptionKeywordReceivedError,\
-    ConsoleInvalidJSONReceivedError
-from .baseclasses.storagebase import StorageError
-from .board import BoardError, BoardBootValidationError
-from .modem import ModemError
-from .multimeter import MultimeterError, MultimeterInvalidKeyPress,\
-    MultimeterMeasurementError, MultimeterDecodeError
-from .pdu import PDUError, PDUInvalidPort, PDURequestError
-from .usb import USBError, USBNoDevice
+from pluma.utils.lazyimport import lazy_import, lazy_attributes
+
+# Exceptions are imported with the driver defining them, when first used
+lazy_import(__name__, {
+    **lazy_attributes('.baseclasses.consolebase',
+                      'ConsoleError', 'ConsoleCannotOpenError', 'ConsoleLoginFailedError',
+                      'ConsoleExceptionKeywordReceivedError', 'ConsoleInvalidJSONReceivedError'),
+    **lazy_attributes('.baseclasses.storagebase', 'StorageError'),
+    **lazy_attributes('.board', 'BoardError', 'BoardBootValidationError'),
+    **lazy_attributes('.modem', 'ModemError'),
+    **lazy_attributes('.multimeter', 'MultimeterError', 'MultimeterInvalidKeyPress',
+                      'MultimeterMeasurementError', 'MultimeterDecodeError'),
+    **lazy_attributes('.pdu', 'PDUError', 'PDUInvalidPort', 'PDURequestError'),
+    **lazy_attributes('.usb', 'USBError', 'USBNoDevice'),
+})
@@ -1,18 +1,5 @@
 import time
 import re
-import sys
-
-try:
-    # The hardware reset functionality requires the use of
-    # GPIO. If the test suite is running on a Raspberry Pi,
-    # import the GPIO library to enable the feature,
-    # else skip the import - this is checked by the
-    # 'hardware_reset' method.
-    with open('/sys/firmware/devicetree/base/model') as model:
-        if 'Raspberry Pi' in model.read():
-            import RPi.GPIO as GPIO
-except (OSError, IOError):
-    pass
 
 from .serialconsole import SerialConsole
 from .baseclasses import HardwareBase
@@ -378,9 +365,26 @@ class ModemSim868(HardwareBase):
         '''
         raise NotImplementedError
 
+    @staticmethod
+    def _import_gpio():
+        '''Return the Raspberry Pi GPIO library, or None if not on a Raspberry Pi'''
+        # The hardware reset functionality requires the use of
+        # GPIO. If the test suite is running on a Raspberry Pi,
+        # import the GPIO library to enable the feature.
+        try:
+            with open('/sys/firmware/devicetree/base/model') as model:
+                if 'Raspberry Pi' in model.read():
+                    import RPi.GPIO as GPIO
+                    return GPIO
+        except (OSError, IOError):
+            pass
+
+        return None
+
     def hardware_reset(self):
-        # Check if the Raspberry Pi GPIO library is loaded
-        if 'RPi.GPIO' in sys.modules:
+        # Check if the Raspberry Pi GPIO library is available
+        GPIO = self._import_gpio()
+        if GPIO:
             reset_successful = False
             # Setup reset pin in output mode
             GPIO.setmode(GPIO.BOARD)
@@ -1,5 +1,4 @@
 import time
-import requests
 import re
 import json
 
@@ -31,6 +30,9 @@ class PDUReqestsBase():
 
     def _make_request(self, endpoint, params=None, method=None,
                       timeout=10, max_tries=1):
+        # Only imported when used, as slow to import
+        import requests
+
         if isinstance(params, list):
             params = '&'.join(params)
 
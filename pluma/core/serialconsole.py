@@ -3,7 +3,7 @@ from nanocom import Nanocom
 
 import pexpect.fdpexpect
 
-from .baseclasses import ConsoleBase
+from .baseclasses import ConsoleBase, LogSink
 from .dataclasses import SystemContext
 
 
@@ -105,8 +105,7 @@ class SerialConsole(ConsoleBase):
                     data = self.serial.read(self.serial.in_waiting or 1)
                     if data:
                         self.console.write_bytes(data)
-                        with open(self.logfile, 'ab') as f:
-                            f.write(data)
+                        LogSink().write(self.logfile, data)
             except Exception:
                 self.alive = False
                 self.console.cancel()
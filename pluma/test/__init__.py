@@ -1,11 +1,21 @@
-from .exceptions import TestingException, TaskFailed, AbortTesting, \
-    AbortTestingAndReport
-from .testbase import TestBase
-from .testcore import TestCore
-from .testrunner import TestRunner
-from .unittest import deferred_function
-from .testcontroller import TestController
-from .commandrunner import CommandRunner
-from .shelltest import ShellTest
-from .executabletest import ExecutableTest
+from pluma.utils.lazyimport import lazy_import, lazy_attributes
+
+lazy_import(__name__, {
+    **lazy_attributes('.exceptions', 'TestingException', 'TaskFailed', 'AbortTesting',
+                      'AbortTestingAndReport'),
+    **lazy_attributes('.testbase', 'TestBase'),
+    **lazy_attributes('.boardstate', 'BoardState'),
+    **lazy_attributes('.testcore', 'TestCore'),
+    **lazy_attributes('.taskscheduler', 'TaskScheduler'),
+    **lazy_attributes('.testrunner', 'TestRunner'),
+    **lazy_attributes('.unittest', 'deferred_function'),
+    **lazy_attributes('.resultsstore', 'ResultsStore', 'MemoryResultsStore', 'JsonResultsStore',
+                      'SampledResultsStore'),
+    **lazy_attributes('.testcontroller', 'TestController'),
+    **lazy_attributes('.boardpoolcontroller', 'BoardPoolController'),
+    **lazy_attributes('.commandrunner', 'CommandRunner'),
+    **lazy_attributes('.shelltest', 'ShellTest'),
+    **lazy_attributes('.executabletest', 'ExecutableTest'),
+})
+
 name = "test"
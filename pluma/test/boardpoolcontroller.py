@@ -0,0 +1,190 @@
+import threading
+from typing import List
+
+from .testcontroller import TestController
+
+
+class BoardPoolController(TestController):
+    ''' Runs the TestControllers of a pool of boards concurrently, and merges their results.
+
+    Each board has its own TestController, with its own TestRunner and
+    tests, and runs in its own thread, as tests mostly wait on their board.
+    Results of all boards are merged in the "results", "results_summary"
+    and "stats" of the BoardPoolController, as soon as each iteration
+    completes. Each result has a "board" entry, with the name of the board
+    it was run on.
+
+    Example:
+        >>> pool = BoardPoolController([TestController(runner1), TestController(runner2)],
+                                       run_condition=sc_run_n_iterations(ntimes=100))
+        >>> pool.run()
+        >>> pool.stats['num_iterations_run']
+            100
+
+    Args:
+        controllers (list(TestController)): TestControllers to run, one per board.
+        share_iterations (bool): If True, iterations allowed by the
+            :meth:`run_condition` of the pool are shared by the boards, each
+            board starting the next iteration as soon as it is available.
+            Without run condition, each board runs one iteration.
+            If False, each TestController runs its own iterations, according
+            to its own settings, and the "run_condition" of the pool is unused.
+            Default: True
+        Other arguments are the arguments of TestController. "setup" is run
+        once before, and "report" once after all boards completed.
+
+    Attributes:
+        controllers (list(TestController)): TestControllers of each board.
+        stats (dict): Statistics of all boards. With shared iterations,
+            "num_iterations_run" counts iterations as soon as started, so
+            that run conditions do not start too many iterations.
+    '''
+
+    def __init__(self, controllers: List[TestController], share_iterations: bool = True,
+                 **kwargs):
+        if not controllers:
+            raise ValueError('At least one TestController is required')
+
+        if kwargs.get('run_forever'):
+            raise ValueError('"run_forever" is not supported by BoardPoolController')
+
+        super().__init__(controllers[0].testrunner, **kwargs)
+        self.controllers = controllers
+        self.share_iterations = share_iterations
+
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._success = True
+
+    def _run(self):
+        for stat in self.stats:
+            self.stats[stat] = 0
+        self.results.clear()
+        self.results_processor.reset()
+        self._stopped = False
+        self._success = True
+
+        self.debug_log(f'Starting BoardPoolController with settings: {self.settings}')
+        if self.setup:
+            self.debug_log(f"Running setup function: {self.setup}")
+            self.setup.run(self)
+
+        if self.share_iterations:
+            self._run_threads(self._run_shared_iterations)
+        else:
+            self._run_threads(self._run_controller)
+            # Merge in the order of the boards, not the order they completed
+            for controller in self.controllers:
+                self._merge_controller(controller)
+
+        if self.report:
+            self.verbose_log(f'Running report function: {self.report}')
+            self.report.run(self)
+
+        return self._success
+
+    def _run_threads(self, target):
+        '''Run @target for each controller in its own thread, and wait for all'''
+        errors = []
+
+        def run(controller):
+            try:
+                target(controller)
+            except BaseException as e:
+                with self._lock:
+                    self._stopped = True
+                    errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(controller,),
+                                    name=f'board-{controller.testrunner.board.name}')
+                   for controller in self.controllers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+    def _run_controller(self, controller: TestController):
+        '''Run all iterations of @controller'''
+        success = controller.run()
+
+        with self._lock:
+            self._success &= success
+
+    def _merge_controller(self, controller: TestController):
+        '''Move the results of @controller to the pool, and add its stats'''
+        for result in controller.results:
+            self._add_result(controller, result)
+        controller.results.clear()
+
+        for stat in ['num_iterations_run', 'num_iterations_pass', 'num_tests_run',
+                     'num_tests_pass', 'num_tests_total']:
+            self.stats[stat] += controller.stats[stat]
+
+        self._update_summary()
+
+    def _run_shared_iterations(self, controller: TestController):
+        '''Run the iterations available with @controller, until no more are allowed'''
+        iterations_run = 0
+        while True:
+            with self._lock:
+                iteration = self._claim_iteration(iterations_run)
+            if iteration is None:
+                return
+
+            previous_stats = dict(controller.stats)
+            success = controller.run_iteration()
+            iterations_run += 1
+
+            with self._lock:
+                # Results are moved to the pool, to keep a single copy
+                self._add_result(controller, controller.results[-1], iteration)
+                controller.results.clear()
+                for stat in ['num_iterations_pass', 'num_tests_run', 'num_tests_pass',
+                             'num_tests_total']:
+                    self.stats[stat] += controller.stats[stat] - previous_stats[stat]
+
+                self._update_summary()
+                self._success &= success
+                if not success and not self.settings['continue_on_fail']:
+                    self._stopped = True
+
+                report_n_iterations = self.settings['report_n_iterations']
+                if self.report and report_n_iterations and \
+                        len(self.results) % report_n_iterations == 0:
+                    self.debug_log(f'Running report function: {self.report}')
+                    self.report.run(self)
+
+    def _claim_iteration(self, board_iterations_run: int) -> int:
+        '''Return the index of the next iteration to run, or None if no more allowed'''
+        if self._stopped:
+            return None
+
+        iteration = self.stats['num_iterations_run']
+        if not self.run_condition:
+            run_now = board_iterations_run == 0
+        elif self.settings['force_initial_run'] and iteration == 0:
+            self.debug_log('Ignoring run condition for first run')
+            run_now = True
+        else:
+            self.debug_log(f'Checking run condition function: {self.run_condition}')
+            run_now = self.run_condition.run(self)
+
+        if not run_now:
+            return None
+
+        self.stats['num_iterations_run'] += 1
+        return iteration
+
+    def _add_result(self, controller: TestController, result: dict, iteration: int = None):
+        result['board'] = controller.testrunner.board.name
+        if iteration is not None:
+            result['iteration'] = iteration
+
+        self.results.append(result)
+
+    def _update_summary(self):
+        self.results_summary = self.get_results_summary()
+        self.test_settings = self.collect_test_settings()
@@ -0,0 +1,13 @@
+from enum import IntEnum
+
+
+class BoardState(IntEnum):
+    '''State of a board, as set by the TestCore tasks.
+
+    States are ordered, each state including the previous ones: a board
+    LOGGED_IN is also ON.
+    '''
+    OFF = 0
+    ON = 1
+    LOGGED_IN = 2
+    MOUNTED = 3
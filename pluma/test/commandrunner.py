@@ -42,7 +42,7 @@ class CommandRunner():
                                     error=f'Command "{command}" {error}')
 
         output = CommandRunner.cleanup_command_output(command, output)
-        log.log(CommandRunner.format_command_log(sent=base_command, output=output))
+        log.log(lambda: CommandRunner.format_command_log(sent=base_command, output=output))
 
         return output
 
@@ -56,8 +56,7 @@ class CommandRunner():
             CommandRunner.log_error(test_name=test_name, sent=command, output=output,
                                     error='No response received after sending command')
         else:
-            message = CommandRunner.format_command_log(sent=command, output=output)
-            log.log(message)
+            log.log(lambda: CommandRunner.format_command_log(sent=command, output=output))
 
         return output
 
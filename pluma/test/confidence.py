@@ -0,0 +1,116 @@
+import math
+
+""" Default confidence level of confidence intervals """
+DEFAULT_CONFIDENCE = 0.95
+
+
+def normal_quantile(p: float) -> float:
+    '''Return the quantile @p (0 to 1, exclusive) of the standard normal distribution'''
+    if not 0 < p < 1:
+        raise ValueError(f'Invalid probability {p}, must be between 0 and 1 exclusive')
+
+    # Bisection on the CDF, which is exact to double precision in 100 steps
+    low, high = -40.0, 40.0
+    for __ in range(100):
+        middle = (low + high) / 2
+        if (1 + math.erf(middle / math.sqrt(2))) / 2 < p:
+            low = middle
+        else:
+            high = middle
+
+    return (low + high) / 2
+
+
+def _student_t_cdf(t: float, degrees_of_freedom: int) -> float:
+    '''Return the CDF at @t of the Student's t-distribution.
+
+    Exact for an integer number of degrees of freedom, using the finite
+    series of Abramowitz and Stegun (26.7.3 and 26.7.4).
+    '''
+    v = degrees_of_freedom
+    theta = math.atan(t / math.sqrt(v))
+    cos_squared = math.cos(theta)**2
+
+    series = 0.0
+    if v % 2:
+        term = math.cos(theta)
+        for k in range(1, (v - 1) // 2 + 1):
+            series += term
+            term *= cos_squared * 2 * k / (2 * k + 1)
+        probability = 2 / math.pi * (theta + math.sin(theta) * series)
+    else:
+        term = 1.0
+        for k in range(1, v // 2 + 1):
+            series += term
+            term *= cos_squared * (2 * k - 1) / (2 * k)
+        probability = math.sin(theta) * series
+
+    return (1 + probability) / 2
+
+
+def student_t_quantile(p: float, degrees_of_freedom: int) -> float:
+    '''Return the quantile @p of the Student's t-distribution.
+
+    Uses the Cornish-Fisher expansion around the normal quantile, accurate
+    to about 0.1% for 5 degrees of freedom and more. With fewer degrees of
+    freedom, where the expansion is too low, the exact CDF is inverted.
+    '''
+    if degrees_of_freedom < 1:
+        raise ValueError('The t-distribution requires at least 1 degree of freedom')
+
+    v = degrees_of_freedom
+    if v < 5:
+        if not 0 < p < 1:
+            raise ValueError(f'Invalid probability {p}, must be between 0 and 1 exclusive')
+
+        # Bisection on the angle of t, as t is unbounded for p close to 0 or 1
+        low, high = -math.pi / 2, math.pi / 2
+        for __ in range(100):
+            middle = (low + high) / 2
+            if _student_t_cdf(math.sqrt(v) * math.tan(middle), v) < p:
+                low = middle
+            else:
+                high = middle
+
+        return math.sqrt(v) * math.tan((low + high) / 2)
+
+    z = normal_quantile(p)
+    return (z
+            + (z**3 + z) / (4 * v)
+            + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * v**2)
+            + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * v**3)
+            + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / (92160 * v**4))
+
+
+def mean_confidence_half_width(count: int, stdev: float,
+                               confidence: float = DEFAULT_CONFIDENCE) -> float:
+    '''Return the half width of the confidence interval of a mean.
+
+    @count values with sample standard deviation @stdev, using the
+    t-distribution. Infinite with less than 2 values.
+    '''
+    if count < 2:
+        return math.inf
+
+    t = student_t_quantile((1 + confidence) / 2, count - 1)
+    return t * stdev / math.sqrt(count)
+
+
+def proportion_confidence_interval(successes: int, count: int,
+                                   confidence: float = DEFAULT_CONFIDENCE) -> tuple:
+    '''Return the Wilson score interval (low, high) of a proportion.
+
+    Unlike the normal approximation, the interval is valid for small counts
+    and proportions close to 0 or 1, such as pass rates. (0, 1) if @count is 0.
+    '''
+    if not count:
+        return (0.0, 1.0)
+
+    z = normal_quantile((1 + confidence) / 2)
+    proportion = successes / count
+    denominator = 1 + z**2 / count
+    centre = (proportion + z**2 / (2 * count)) / denominator
+    half_width = z / denominator * math.sqrt(
+        proportion * (1 - proportion) / count + z**2 / (4 * count**2))
+
+    return (max(0.0, centre - half_width), min(1.0, centre + half_width))
@@ -22,6 +22,9 @@ class ExecutableTest(TestBase):
         self.run_on_host = run_on_host
         self.timeout = timeout if timeout is not None else 5
 
+        if self.run_on_host:
+            self.task_resources = {'test_body': ['host']}
+
         if self.host_file and not os.path.isfile(executable_file):
             raise ValueError(
                 f'File {executable_file} does not exist on host')
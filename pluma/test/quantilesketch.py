@@ -0,0 +1,170 @@
+import math
+from bisect import bisect_left
+
+""" Default compression of quantile sketches, higher is more accurate """
+DEFAULT_SKETCH_COMPRESSION = 100
+
+""" Quantiles reported in results summaries, by name """
+SUMMARY_QUANTILES = {'p50': 0.5, 'p90': 0.9, 'p95': 0.95, 'p99': 0.99}
+
+
+class QuantileSketch:
+    '''Mergeable sketch of the distribution of numbers, to estimate quantiles.
+
+    Implements a merging t-digest: values are summarised by at most about
+    2 x @compression weighted centroids, smaller at both ends of the
+    distribution, so that tail quantiles (p95, p99) are the most accurate.
+    Memory use does not depend on the number of values added, and the
+    sketches of several boards or runs can be merged with :meth:`merge`.
+
+    Example:
+        >>> sketch = QuantileSketch()
+        >>> for value in range(1, 10001):
+                sketch.add(value)
+        >>> round(sketch.quantile(0.99))
+            9900
+    '''
+
+    def __init__(self, compression: int = DEFAULT_SKETCH_COMPRESSION):
+        if compression < 10:
+            raise ValueError('The compression of a quantile sketch must be at least 10')
+
+        self.compression = compression
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._means = []
+        self._weights = []
+        self._buffer = []
+
+    def add(self, value: float, weight: float = 1):
+        '''Add @value, with an optional @weight'''
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+        self.count += weight
+        self._buffer.append((value, weight))
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def merge(self, other: 'QuantileSketch'):
+        '''Add all values summarised by @other to this sketch'''
+        if not other.count:
+            return
+
+        other._compress()
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.count += other.count
+        self._buffer.extend(zip(other._means, other._weights))
+        self._compress()
+
+    def quantile(self, q: float) -> float:
+        '''Return the estimated value of quantile @q (0 to 1), or None if empty'''
+        if not 0 <= q <= 1:
+            raise ValueError(f'Invalid quantile {q}, must be between 0 and 1')
+
+        if not self.count:
+            return None
+
+        self._compress()
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+
+        # Centroids are at the middle of the weight they cover, min and max at both ends
+        positions = [0]
+        values = [self.min]
+        cumulative_weight = 0
+        for mean, weight in zip(self._means, self._weights):
+            positions.append(cumulative_weight + weight / 2)
+            values.append(mean)
+            cumulative_weight += weight
+        positions.append(cumulative_weight)
+        values.append(self.max)
+
+        target = q * cumulative_weight
+        index = max(1, bisect_left(positions, target))
+        left, right = positions[index - 1], positions[index]
+        if right == left:
+            return values[index]
+
+        ratio = (target - left) / (right - left)
+        return values[index - 1] + ratio * (values[index] - values[index - 1])
+
+    def quantiles(self, quantiles: dict = None) -> dict:
+        '''Return the estimated values of @quantiles, as {name: value}'''
+        quantiles = quantiles or SUMMARY_QUANTILES
+        return {name: self.quantile(q) for name, q in quantiles.items()}
+
+    def to_dict(self) -> dict:
+        '''Return the sketch as JSON serialisable data, see :meth:`from_dict`'''
+        self._compress()
+        return {
+            'compression': self.compression,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'centroids': [[mean, weight] for mean, weight in zip(self._means, self._weights)]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'QuantileSketch':
+        '''Create a sketch from the data returned by :meth:`to_dict`'''
+        sketch = cls(data['compression'])
+        sketch.count = data['count']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        sketch._means = [mean for mean, __ in data['centroids']]
+        sketch._weights = [weight for __, weight in data['centroids']]
+        return sketch
+
+    def _k(self, q: float) -> float:
+        '''Scale function, limiting the size of centroids near both ends'''
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inverse(self, k: float) -> float:
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self):
+        '''Merge the buffered values into the centroids'''
+        if not self._buffer:
+            return
+
+        points = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+        total_weight = sum(weight for __, weight in points)
+
+        means = []
+        weights = []
+        mean, weight = points[0]
+        merged_weight = weight
+        q_limit = self._k_inverse(self._k(0) + 1)
+        for point_mean, point_weight in points[1:]:
+            if (merged_weight + point_weight) / total_weight <= q_limit:
+                weight += point_weight
+                mean += point_weight * (point_mean - mean) / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                q_limit = self._k_inverse(self._k(merged_weight / total_weight) + 1)
+                mean, weight = point_mean, point_weight
+            merged_weight += point_weight
+
+        means.append(mean)
+        weights.append(weight)
+        self._means = means
+        self._weights = weights
+
+    def __len__(self) -> int:
+        '''Return the number of centroids, once compressed'''
+        self._compress()
+        return len(self._means)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}[count={self.count}, centroids={len(self)}]'
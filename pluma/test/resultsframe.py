@@ -0,0 +1,243 @@
+import re
+from typing import Iterable, List
+
+import numpy as np
+
+""" NumPy array type of each type of values, other values are stored as objects """
+COLUMN_DTYPES = {bool: np.bool_, int: np.int64, float: np.float64}
+
+
+class ResultsColumn:
+    '''Values of a test data field over iterations, in a typed NumPy array.
+
+    The array type is set by the first value: bool, int64 or float64. It is
+    promoted when numbers of another type are added, such as to float64 for
+    floats added to integers, and changes to object if other types of values
+    are added. "present" is True for the iterations which have a value.
+    '''
+
+    def __init__(self, capacity: int):
+        self.values = None
+        self.present = np.zeros(capacity, dtype=bool)
+
+    def set(self, row: int, value):
+        dtype = COLUMN_DTYPES.get(type(value), object)
+        if self.values is None:
+            self.values = np.zeros(len(self.present), dtype=dtype)
+        elif self.values.dtype != object and self.values.dtype != dtype:
+            if dtype is object:
+                self.values = self.values.astype(object)
+            else:
+                self.values = self.values.astype(np.promote_types(self.values.dtype, dtype))
+
+        try:
+            self.values[row] = value
+        except OverflowError:
+            self.values = self.values.astype(object)
+            self.values[row] = value
+        self.present[row] = True
+
+    def resize(self, capacity: int):
+        self.present = _resized(self.present, capacity)
+        if self.values is not None:
+            self.values = _resized(self.values, capacity)
+
+    def value(self, row: int):
+        '''Return the value at @row as a Python object'''
+        value = self.values[row]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def is_numeric(self) -> bool:
+        return self.values is not None and self.values.dtype != object
+
+
+class TestResultsColumns:
+    '''Columns of the data fields of a test, with the iterations it ran in'''
+
+    def __init__(self, capacity: int):
+        self.present = np.zeros(capacity, dtype=bool)
+        # Index of the settings of each iteration in "settings"
+        self.settings_index = np.zeros(capacity, dtype=np.int32)
+        self.settings = []
+        self.fields = {}
+
+    def resize(self, capacity: int):
+        self.present = _resized(self.present, capacity)
+        self.settings_index = _resized(self.settings_index, capacity)
+        for column in self.fields.values():
+            column.resize(capacity)
+
+    def settings_mask(self, settings: dict) -> np.ndarray:
+        '''Return True for the iterations whose test settings match @settings'''
+        matching = [index for index, test_settings in enumerate(self.settings)
+                    if all(key in test_settings and test_settings[key] == value
+                           for key, value in settings.items())]
+        return np.isin(self.settings_index, matching)
+
+
+class ResultsFrame:
+    '''Columnar view of test results, with one typed NumPy array per test data field.
+
+    Each row is an iteration, in the order results were added. Selecting
+    tests, fields and settings (:meth:`select`) and getting the series of a
+    field (:meth:`series`) are slices and masks of the arrays, instead of
+    going through the result of each iteration.
+    With @iteration_key, rows are numbered by the value of this key in each
+    result, such as "iteration", instead of their position, for results
+    which do not include all iterations.
+
+    Example:
+        >>> frame = ResultsFrame.from_results(controller.results)
+        >>> iterations, boot_times = frame.series('TestCore', 'boot_time')
+    '''
+
+    def __init__(self, iteration_key: str = None):
+        self.num_iterations = 0
+        self.columns = {}
+        self.iteration_key = iteration_key
+        # Iteration number of each row, with "iteration_key"
+        self.iterations = None if iteration_key is None else np.zeros(0, dtype=np.int64)
+        self._capacity = 0
+
+    @classmethod
+    def from_results(cls, results: Iterable[dict], iteration_key: str = None) -> 'ResultsFrame':
+        frame = cls(iteration_key)
+        frame.extend(results)
+        return frame
+
+    @property
+    def tests(self) -> List[str]:
+        return sorted(self.columns)
+
+    def fields(self, test: str) -> List[str]:
+        '''Return the data fields of @test, in the order first found'''
+        return list(self.columns[test].fields)
+
+    def extend(self, results: Iterable[dict]):
+        for result in results:
+            self.append(result)
+
+    def append(self, result: dict):
+        '''Add the @result of an iteration, as the last row'''
+        row = self.num_iterations
+        if row >= self._capacity:
+            self._resize(max(16, 2 * self._capacity))
+
+        if self.iteration_key is not None:
+            self.iterations[row] = result.get(self.iteration_key, row)
+
+        for test, test_result in result['TestRunner'].items():
+            test_columns = self.columns.get(test)
+            if test_columns is None:
+                test_columns = self.columns[test] = TestResultsColumns(self._capacity)
+
+            test_columns.present[row] = True
+            settings = test_result.get('settings', {})
+            if settings not in test_columns.settings:
+                test_columns.settings.append(settings)
+            test_columns.settings_index[row] = test_columns.settings.index(settings)
+
+            for field, value in test_result.get('data', {}).items():
+                column = test_columns.fields.get(field)
+                if column is None:
+                    column = test_columns.fields[field] = ResultsColumn(self._capacity)
+                column.set(row, value)
+
+        self.num_iterations += 1
+
+    def select(self, test_names=None, fields=None, settings=None) -> 'ResultsFrame':
+        '''Return a frame with the tests, fields and settings selected.
+
+        @test_names are regular expressions matching full test names, as in
+        :meth:`~pluma.test.TestController.get_test_results`, @fields the
+        names of the data fields kept, and @settings the test settings the
+        iterations of a test must have to be kept. Arrays are shared with
+        this frame.
+        '''
+        if test_names and not isinstance(test_names, list):
+            test_names = [test_names]
+        patterns = [re.compile(f'{name}$') for name in test_names or ['.*']]
+
+        frame = ResultsFrame()
+        frame.iteration_key = self.iteration_key
+        frame.iterations = self.iterations
+        frame.num_iterations = self.num_iterations
+        frame._capacity = self._capacity
+        for test, test_columns in self.columns.items():
+            if not any(pattern.match(test) for pattern in patterns):
+                continue
+
+            selected = TestResultsColumns(0)
+            selected.present = test_columns.present
+            if settings:
+                selected.present = selected.present & test_columns.settings_mask(settings)
+            selected.settings_index = test_columns.settings_index
+            selected.settings = test_columns.settings
+
+            for field, column in test_columns.fields.items():
+                if fields and field not in fields:
+                    continue
+
+                selected_column = ResultsColumn(0)
+                selected_column.values = column.values
+                selected_column.present = column.present & selected.present
+                selected.fields[field] = selected_column
+
+            frame.columns[test] = selected
+
+        return frame
+
+    def series(self, test: str, field: str, cumulative: bool = False):
+        '''Return the iterations and values of @field of @test, as NumPy arrays.
+
+        Only iterations with a value which is not None are returned, and
+        booleans are converted to integers. With @cumulative, values are the
+        sums of all values up to each iteration. Iterations are the row
+        positions, or the iteration numbers with "iteration_key".
+        '''
+        column = self.columns[test].fields[field]
+        mask = column.present[:self.num_iterations]
+        values = column.values[:self.num_iterations]
+        if not column.is_numeric():
+            mask = mask & np.array([value is not None for value in values], dtype=bool)
+
+        iterations = np.flatnonzero(mask)
+        if self.iterations is not None:
+            iterations = self.iterations[iterations]
+        values = values[mask]
+        if values.dtype == bool:
+            values = values.astype(np.int64)
+        if cumulative:
+            values = np.cumsum(values)
+
+        return iterations, values
+
+    def records(self):
+        '''Yield the data of the tests of each iteration, as {test: {field: value}}'''
+        tests = [(test, self.columns[test]) for test in self.tests]
+        for row in range(self.num_iterations):
+            yield {
+                test: {field: column.value(row) for field, column in test_columns.fields.items()
+                       if column.present[row]}
+                for test, test_columns in tests if test_columns.present[row]
+            }
+
+    def _resize(self, capacity: int):
+        if self.iterations is not None:
+            self.iterations = _resized(self.iterations, capacity)
+        for test_columns in self.columns.values():
+            test_columns.resize(capacity)
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return self.num_iterations
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}[{self.num_iterations} iterations, ' \
+            f'{len(self.columns)} tests]'
+
+
+def _resized(array: np.ndarray, capacity: int) -> np.ndarray:
+    resized = np.zeros(capacity, dtype=array.dtype)
+    resized[:len(array)] = array[:capacity]
+    return resized
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-import pygal
 
 
 class ResultsPlotter(ABC):
+    # True if "results" can be a ResultsFrame, instead of a list of dicts
+    accepts_results_frame = False
+
     @abstractmethod
     def plot(self, file, results: list, test_names=None, fields=None, vs_type=None,
              title=None, output_format=None, config=None):
@@ -10,11 +12,16 @@ class ResultsPlotter(ABC):
 
 
 class DefaultResultsPlotter(ResultsPlotter):
+    accepts_results_frame = True
+
     def plot(self, file, results: list, test_names=None, fields=None, vs_type=None,
              title=None, output_format=None, config=None):
         """Create a graph of data fields from the test results data.
         Args:
             file (str): Output file path.
+            results (list, ResultsFrame): Data of the tests for each iteration,
+                as returned by TestController.get_test_results, or a
+                ResultsFrame, whose series are used directly.
             test_names (str, list(str)): Name of Tests to read data from.
                 Can specify a one test name or a list of test names.
                 All tests are selected if set to None.
@@ -34,6 +41,10 @@ class DefaultResultsPlotter(ResultsPlotter):
             config (pygal.Config): Optionally supply a option.
                 This allows rendering with custom configuration and styles.
         """
+        # Only imported when used, as slow to import
+        import pygal
+        from .resultsframe import ResultsFrame
+
         vs_type = vs_type or 'iteration'
         output_format = output_format or 'svg'
 
@@ -54,6 +65,11 @@ class DefaultResultsPlotter(ResultsPlotter):
         if output_format not in formats:
             raise AttributeError(f'Format must be one of {formats}')
 
+        if isinstance(results, ResultsFrame):
+            self._plot_frame(pygal, file, results, test_names, fields, vs_type, title,
+                             output_format, config)
+            return
+
         # Find any tests that do not have any data for fields specified
         empty_tests = set([test for r in results for test,
                            data in r.items() if not data])
@@ -78,20 +94,7 @@ class DefaultResultsPlotter(ResultsPlotter):
             raise RuntimeError(
                 f'No results found for test{plural_or_not}{test_names}, fields{fields}')
 
-        chart = pygal.XY(truncate_legend=-1)
-        chart.title = title
-
-        # Default style to fix svg black background rendering issue
-        chart.config.style = pygal.style.Style(
-            background='#FFFFFF',
-            plot_background='#FFFFFF'
-        )
-
-        if config:
-            if not isinstance(config, pygal.Config):
-                raise AttributeError('config must be of type pygal.Config')
-            chart.config = config
-
+        chart = self._create_chart(pygal, title, config)
         points = {}
 
         if vs_type in ['iteration', 'cumulative']:
@@ -125,6 +128,79 @@ class DefaultResultsPlotter(ResultsPlotter):
                 points[tf] = {
                     tf: [(r[tf][fields[0]], r[tf][fields[1]]) for r in results]}
 
+        self._render(chart, file, points, vs_str, tests_found, test_names, fields,
+                     output_format)
+
+    def _plot_frame(self, pygal, file, frame, test_names, fields, vs_type, title,
+                    output_format, config):
+        '''Create the graph of the series of a ResultsFrame, using its arrays'''
+        import numpy as np
+
+        # Tests with iterations missing all the fields selected are not plotted
+        tests_found = []
+        fields_found = set()
+        for test in frame.tests:
+            test_columns = frame.columns[test]
+            fields_found.update(test_columns.fields)
+            has_data = np.zeros(len(test_columns.present), dtype=bool)
+            for column in test_columns.fields.values():
+                has_data |= column.present
+            if test_columns.fields and not (test_columns.present & ~has_data).any():
+                tests_found.append(test)
+
+        if not tests_found or not fields_found:
+            plural_or_not = 's' if len(tests_found) > 1 else ''
+            raise RuntimeError(
+                f'No results found for test{plural_or_not}{test_names}, fields{fields}')
+
+        chart = self._create_chart(pygal, title, config)
+        points = {}
+        if vs_type in ['iteration', 'cumulative']:
+            vs_str = '{}{} vs iteration'.format(
+                'cumulative ' if vs_type == 'cumulative' else '', ', '.join(sorted(fields_found)))
+
+            for tf in tests_found:
+                points[tf] = {}
+                for field in frame.fields(tf):
+                    iterations, values = frame.series(tf, field,
+                                                      cumulative=vs_type == 'cumulative')
+                    points[tf][f'{tf}: {field}'] = list(zip(iterations.tolist(),
+                                                            values.tolist()))
+        else:
+            vs_str = f'{fields[0]} vs {fields[1]}'
+            for tf in tests_found:
+                test_fields = frame.columns[tf].fields
+                if fields[0] not in test_fields or fields[1] not in test_fields:
+                    continue
+
+                x_column, y_column = test_fields[fields[0]], test_fields[fields[1]]
+                mask = (x_column.present & y_column.present)[:frame.num_iterations]
+                points[tf] = {tf: list(zip(x_column.values[:frame.num_iterations][mask].tolist(),
+                                           y_column.values[:frame.num_iterations][mask].tolist()))}
+
+        self._render(chart, file, points, vs_str, tests_found, test_names, fields,
+                     output_format)
+
+    @staticmethod
+    def _create_chart(pygal, title, config):
+        chart = pygal.XY(truncate_legend=-1)
+        chart.title = title
+
+        # Default style to fix svg black background rendering issue
+        chart.config.style = pygal.style.Style(
+            background='#FFFFFF',
+            plot_background='#FFFFFF'
+        )
+
+        if config:
+            if not isinstance(config, pygal.Config):
+                raise AttributeError('config must be of type pygal.Config')
+            chart.config = config
+
+        return chart
+
+    @staticmethod
+    def _render(chart, file, points, vs_str, tests_found, test_names, fields, output_format):
         chart.title = chart.title or '{} for{} {}'.format(
             vs_str,
             ' tests:' if len(tests_found) > 1 else '',
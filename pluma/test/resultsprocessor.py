@@ -1,7 +1,10 @@
+import math
 from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from heapq import heappop, heappush
 
-from statistics import mean, median_grouped, mode, stdev, variance,\
-    StatisticsError
+from .quantilesketch import QuantileSketch, SUMMARY_QUANTILES
 
 
 class ResultsProcessor(ABC):
@@ -9,100 +12,492 @@ class ResultsProcessor(ABC):
     def generate_summary(self, tests: list, results: list) -> dict:
         '''Generate a summary of the test results passed in.'''
 
+    def reset(self):
+        '''Forget the results processed, when the results are replaced'''
+
+    def get_state(self):
+        '''Return the state of the processor as JSON serialisable data, to resume a run.
+
+        Returns None by default, when the processor has no state to save, in
+        which case the results are processed again when resumed.
+        '''
+        return None
+
+    def set_state(self, state):
+        '''Set the state of the processor, returned by :meth:`get_state`'''
+
+
+class FieldStatistics:
+    '''Statistics of the values of a test data field, updated with each value.
+
+    Values are added without going through previous values, and the
+    summary is the same as computed from all values with the "statistics"
+    module: mean, variance and standard deviation use running moments
+    (Welford's algorithm), min, max and mode are updated with each value,
+    the grouped median keeps the distinct numbers in two heaps, split at
+    the middle value, and the chunked mean uses the running sums of values.
+    Percentiles (SUMMARY_QUANTILES) are estimated with a QuantileSketch,
+    "sketch", which can be merged with the sketches of other boards or runs.
+
+    The state is bounded, to be saved cheaply (see :meth:`to_dict`). Values
+    are only counted, for the count, mode and grouped median, until more
+    than MAX_COUNTED_VALUES distinct values are seen, such as for
+    measurements. The median is then estimated with the sketch. Running
+    sums are kept every "_sums_step" values, doubled when there are more
+    than MAX_SUMS sums, so the chunked mean of more than MAX_SUMS values
+    has chunk boundaries rounded to a multiple of "_sums_step".
+    '''
+
+    # Number of chunks of the chunked mean
+    CHUNKS = 10
+
+    # Maximum number of distinct values counted
+    MAX_COUNTED_VALUES = 100
+
+    # Maximum number of running sums kept for the chunked mean
+    MAX_SUMS = 1000
+
+    def __init__(self):
+        self.n = 0
+        # Count of each value, by string representation
+        self.counts = {}
+
+        # Only numbers, booleans excluded
+        self.numeric = True
+        self.min = None
+        self.max = None
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._mode = None
+        # [count, first index] of each number
+        self._number_counts = {}
+        # Distinct numbers up to the middle value (max-heap of negated
+        # numbers) and above it (min-heap), and the count of values up to it
+        self._lower = []
+        self._upper = []
+        self._lower_count = 0
+        self.sketch = QuantileSketch()
+
+        # Only numbers or booleans, with the sum of all values and the sums
+        # of the first N * _sums_step values
+        self.scalar = True
+        self._sum = 0.0
+        self._sums = array('d', [0.0])
+        self._sums_step = 1
+
+    def add(self, value):
+        '''Add @value, in O(log n) amortised time'''
+        if self.counts is not None:
+            self.counts[str(value)] = self.counts.get(str(value), 0) + 1
+            if len(self.counts) > self.MAX_COUNTED_VALUES:
+                self._stop_counting()
+
+        is_bool = isinstance(value, bool)
+        is_number = isinstance(value, (int, float)) and not is_bool
+
+        if self.scalar and (is_number or is_bool):
+            self._add_sum(value)
+        elif self.scalar:
+            self.scalar = False
+            self._sums = None
+
+        if self.numeric and is_number:
+            self._add_number(value)
+        elif self.numeric:
+            self.numeric = False
+            self._number_counts = None
+            self._lower = None
+            self._upper = None
+            self.sketch = None
+
+        self.n += 1
+
+    def _stop_counting(self):
+        self.counts = None
+        self._mode = None
+        self._number_counts = None
+        self._lower = None
+        self._upper = None
+
+    def _add_sum(self, value):
+        self._sum += value
+        if (self.n + 1) % self._sums_step == 0:
+            self._sums.append(self._sum)
+            if len(self._sums) > self.MAX_SUMS:
+                self._sums = self._sums[::2]
+                self._sums_step *= 2
+
+    def _add_number(self, value):
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+        delta = value - self._mean
+        self._mean += delta / (self.n + 1)
+        self._m2 += delta * (value - self._mean)
+        self.sketch.add(value)
+        if self._number_counts is None:
+            return
+
+        # Mode is the most common number, the first seen if several
+        entry = self._number_counts.get(value)
+        if entry is None:
+            entry = self._number_counts[value] = [0, self.n]
+            if self._lower and value < -self._lower[0]:
+                heappush(self._lower, -value)
+            else:
+                heappush(self._upper, value)
+        entry[0] += 1
+        if self._lower and value <= -self._lower[0]:
+            self._lower_count += 1
+        self._balance_median(self.n + 1)
+
+        if self._mode is None:
+            self._mode = value
+        else:
+            mode_count, mode_index = self._number_counts[self._mode]
+            if entry[0] > mode_count or (entry[0] == mode_count and entry[1] < mode_index):
+                self._mode = value
+
+    def _balance_median(self, n: int):
+        '''Move numbers between the heaps, to keep the middle of @n values in the lower heap'''
+        middle = n // 2 + 1
+        while self._lower_count < middle:
+            value = heappop(self._upper)
+            heappush(self._lower, -value)
+            self._lower_count += self._number_counts[value][0]
+
+        while self._lower_count - self._number_counts[-self._lower[0]][0] >= middle:
+            value = -heappop(self._lower)
+            heappush(self._upper, value)
+            self._lower_count -= self._number_counts[value][0]
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def mode(self):
+        '''Most common number, or None if values are not counted'''
+        return self._mode
+
+    @property
+    def median_grouped(self) -> float:
+        '''Median of grouped continuous data, as statistics.median_grouped.
+
+        The median estimated with the sketch if values are not counted.
+        '''
+        if self._number_counts is None:
+            return self.sketch.quantile(0.5)
+
+        # Middle value, and number of values lower
+        middle = -self._lower[0]
+        count = self._number_counts[middle][0]
+        lower_count = self._lower_count - count
+
+        return middle - 0.5 + (self.n / 2 - lower_count) / count
+
+    def chunked_mean(self, chunks: int = CHUNKS) -> list:
+        '''Mean of each of @chunks chunks of values, in their order.
+
+        Chunks are equal, with the last chunk smaller if needed. If there
+        are less values than @chunks, each value is a chunk.
+        '''
+        size = min(round(self.n / chunks) or 1, self.n)
+        means = []
+        for start in range(0, self.n, size):
+            start_count, start_sum = self._sum_of_first(start)
+            end_count, end_sum = self._sum_of_first(min(start + size, self.n))
+            means.append((end_sum - start_sum) / (end_count - start_count))
+
+        return means[:chunks]
+
+    def _sum_of_first(self, count: int) -> tuple:
+        '''Return the count and sum of the first values, about @count values'''
+        if count == self.n:
+            return count, self._sum
+
+        index = min(round(count / self._sums_step), len(self._sums) - 1)
+        return index * self._sums_step, self._sums[index]
+
+    def to_dict(self) -> dict:
+        '''Return the statistics as JSON serialisable data, see :meth:`from_dict`'''
+        return {
+            'n': self.n,
+            'counts': self.counts,
+            'numeric': self.numeric,
+            'min': self.min,
+            'max': self.max,
+            'mean': self._mean,
+            'm2': self._m2,
+            'mode': self._mode,
+            # Numbers are not valid JSON keys, so counts are saved as lists
+            'number_counts': None if self._number_counts is None else
+            [[value, count, index] for value, (count, index) in self._number_counts.items()],
+            'sketch': None if self.sketch is None else self.sketch.to_dict(),
+            'scalar': self.scalar,
+            'sum': self._sum,
+            'sums': None if self._sums is None else list(self._sums),
+            'sums_step': self._sums_step
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FieldStatistics':
+        '''Create statistics from the data returned by :meth:`to_dict`'''
+        statistics = cls()
+        statistics.n = data['n']
+        statistics.counts = None if data['counts'] is None else dict(data['counts'])
+        statistics.numeric = data['numeric']
+        statistics.min = data['min']
+        statistics.max = data['max']
+        statistics._mean = data['mean']
+        statistics._m2 = data['m2']
+        statistics._mode = data['mode']
+
+        if data['number_counts'] is None:
+            statistics._number_counts = None
+            statistics._lower = None
+            statistics._upper = None
+        else:
+            statistics._number_counts = {value: [count, index]
+                                         for value, count, index in data['number_counts']}
+            statistics._upper = sorted(statistics._number_counts)
+            if statistics._number_counts:
+                statistics._balance_median(statistics.n)
+
+        statistics.sketch = None if data['sketch'] is None else \
+            QuantileSketch.from_dict(data['sketch'])
+        statistics.scalar = data['scalar']
+        statistics._sum = data['sum']
+        statistics._sums = None if data['sums'] is None else array('d', data['sums'])
+        statistics._sums_step = data['sums_step']
+        return statistics
+
+    def summary(self, sigfig: int = 2) -> dict:
+        summary = {}
+        if self.counts is not None:
+            summary['count'] = dict(self.counts)
+
+        # Can't generate statistics from a single data point
+        if self.n >= 2:
+            if self.numeric:
+                summary['max'] = self.max
+                summary['min'] = self.min
+                if self.mode is not None:
+                    summary['mode'] = self.mode
+                summary['mean'] = round(self.mean, sigfig)
+                summary['median'] = round(self.median_grouped, sigfig)
+                summary['stdev'] = round(self.stdev, sigfig)
+                summary['variance'] = round(self.variance, sigfig)
+                for name, value in self.sketch.quantiles(SUMMARY_QUANTILES).items():
+                    summary[name] = round(value, sigfig)
+
+            if self.scalar:
+                summary['chunked_mean'] = [round(chunk_mean, sigfig)
+                                           for chunk_mean in self.chunked_mean()]
+
+        return summary
+
 
 class DefaultResultsProcessor(ResultsProcessor):
+    '''Summarises test data values, updating statistics with new results only.
+
+    Results are expected to be appended between summaries, as with a
+    ResultsStore, and only results not processed yet are added to the
+    statistics of each test data field (FieldStatistics). Statistics are
+    computed again from all results if fewer results are passed in.
+    '''
+
+    def __init__(self):
+        self.fields = {}
+        self.num_results = 0
+
+    def reset(self):
+        self.fields = {}
+        self.num_results = 0
+
+    def add_result(self, result: dict):
+        '''Add the data values of the iteration @result to the statistics'''
+        for test, test_result in result['TestRunner'].items():
+            test_fields = self.fields.setdefault(test, {})
+            for data_key, data_value in test_result.get('data', {}).items():
+                if data_key not in test_fields:
+                    test_fields[data_key] = FieldStatistics()
+                test_fields[data_key].add(data_value)
+
+        self.num_results += 1
+
+    def get_state(self) -> dict:
+        return {
+            'num_results': self.num_results,
+            'fields': {
+                test: {field: statistics.to_dict() for field, statistics in test_fields.items()}
+                for test, test_fields in self.fields.items()
+            }
+        }
+
+    def set_state(self, state: dict):
+        self.num_results = state['num_results']
+        self.fields = {
+            test: {field: FieldStatistics.from_dict(data) for field, data in test_fields.items()}
+            for test, test_fields in state['fields'].items()
+        }
+
     def generate_summary(self, tests: list, results: list) -> dict:
         """Get a summary of test results data values, with some numerical analysis"""
-        def chunks(results_list, n):
-            """Yield successive n-sized chunks from results_list"""
-            for i in range(0, len(results_list), n):
-                yield results_list[i:i + n]
-
-        def chunked_mean(results_list, n, sigfig=2):
-            """Chunk the list results_list into n equal chunks, and calculate the mean of
-            each chunk. If n > length of results_list, then the length of results_list is
-            used instead. This gives the mean for first x values, then next x values etc."""
-            chunked_list = chunks(results_list, min(
-                round(len(results_list)/n) or 1, len(results_list)))
-            chunked_mean_list = list(map(
-                lambda x: round(mean(x), sigfig),
-                chunked_list
-            ))
-            if len(chunked_mean_list) > n:
-                chunked_mean_list = chunked_mean_list[0: n]
-            return chunked_mean_list
-
-        results_summary = {}
-        for test in [str(t) for t in tests]:
-            # Collect data
-            if test not in results_summary:
-                results_summary[test] = {}
-
-            for iteration, _ in enumerate(results):
-                for data_key in results[iteration]['TestRunner'][test]['data']:
-                    if data_key not in results_summary[test]:
-                        results_summary[test][data_key] = {}
-                    data_value = results[iteration]['TestRunner'][test]['data'][data_key]
-
-                    # Collect values in list
-                    if 'values' not in results_summary[test][data_key]:
-                        results_summary[test][data_key]['values'] = []
-                    results_summary[test][data_key]['values'].append(
-                        data_value)
-
-                    # Count of data value
-                    if 'count' not in results_summary[test][data_key]:
-                        results_summary[test][data_key]['count'] = {}
-                    if str(data_value) not in results_summary[test][data_key]['count']:
-                        results_summary[test][data_key]['count'][str(
-                            data_value)] = 0
-                    results_summary[test][data_key]['count'][str(
-                        data_value)] += 1
-
-            # Calculate statistical data
-            for data_key in results_summary[test]:
-                n_values = len(results_summary[test][data_key]['values'])
-                # Can't generate statistics from a single data point
-                if n_values >= 2:
-                    # Statistics calculated for numbers only
-                    if all((isinstance(d, int) or isinstance(d, float))
-                            and not isinstance(d, bool)
-                            for d in results_summary[test][data_key]['values']):
-                        results_summary[test][data_key]['max'] = max(
-                            results_summary[test][data_key]['values'])
-
-                        results_summary[test][data_key]['min'] = min(
-                            results_summary[test][data_key]['values'])
-
-                        try:
-                            results_summary[test][data_key]['mode'] = mode(
-                                results_summary[test][data_key]['values'])
-                        except StatisticsError:
-                            # This happens when there is no unique mode
-                            results_summary[test][data_key]['mode'] = None
-
-                        results_summary[test][data_key]['mean'] = round(mean(
-                            results_summary[test][data_key]['values']), 2)
-
-                        results_summary[test][data_key]['median'] = round(median_grouped(
-                            results_summary[test][data_key]['values']), 2)
-
-                        results_summary[test][data_key]['stdev'] = round(stdev(
-                            results_summary[test][data_key]['values']), 2)
-
-                        results_summary[test][data_key]['variance'] = round(variance(
-                            results_summary[test][data_key]['values']), 2)
-
-                    # Statistics calculated for numbers or booleans
-                    if all(isinstance(d, int) or isinstance(d, float)
-                            or isinstance(d, bool)
-                            for d in results_summary[test][data_key]['values']):
-                        # Chunk the data into equal chunks, and calculate the chunks mean
-                        # This gives the mean for first x values, then next x values etc.
-                        # Number of chunks is lowest of 10 and the length of the dataset
-                        results_summary[test][data_key]['chunked_mean'] = chunked_mean(
-                            results_summary[test][data_key]['values'], 10)
-                # We do not want all the data duplicated in the summary
-                del(results_summary[test][data_key]['values'])
-
-        return results_summary
+        if len(results) < self.num_results:
+            self.reset()
+
+        for index in range(self.num_results, len(results)):
+            self.add_result(results[index])
+
+        return {
+            str(test): {
+                data_key: statistics.summary()
+                for data_key, statistics in self.fields.get(str(test), {}).items()
+            }
+            for test in tests
+        }
+
+
+class RunningStatistics:
+    '''Statistics of the values of a test data field, in bounded memory.
+
+    Count, mean, variance and standard deviation (running moments), min and
+    max are exact, and percentiles are estimated with a QuantileSketch.
+    Values are counted, as in FieldStatistics, until more than
+    MAX_COUNTED_VALUES distinct values are seen, such as for measurements.
+    '''
+
+    # Maximum number of distinct values counted
+    MAX_COUNTED_VALUES = 100
+
+    def __init__(self):
+        self.n = 0
+        self.counts = {}
+
+        # Only numbers, booleans excluded
+        self.numeric = True
+        self.min = None
+        self.max = None
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.sketch = QuantileSketch()
+
+    def add(self, value):
+        '''Add @value, in O(1) time'''
+        if self.counts is not None:
+            self.counts[str(value)] = self.counts.get(str(value), 0) + 1
+            if len(self.counts) > self.MAX_COUNTED_VALUES:
+                self.counts = None
+
+        if self.numeric and isinstance(value, (int, float)) and not isinstance(value, bool):
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+            delta = value - self._mean
+            self._mean += delta / (self.n + 1)
+            self._m2 += delta * (value - self._mean)
+            self.sketch.add(value)
+        elif self.numeric:
+            self.numeric = False
+            self.sketch = None
+
+        self.n += 1
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def summary(self, sigfig: int = 2) -> dict:
+        summary = {'n': self.n}
+        if self.counts is not None:
+            summary['count'] = dict(self.counts)
+
+        # Can't generate statistics from a single data point
+        if self.n >= 2 and self.numeric:
+            summary['max'] = self.max
+            summary['min'] = self.min
+            summary['mean'] = round(self.mean, sigfig)
+            summary['stdev'] = round(self.stdev, sigfig)
+            summary['variance'] = round(self.variance, sigfig)
+            for name, value in self.sketch.quantiles(SUMMARY_QUANTILES).items():
+                summary[name] = round(value, sigfig)
+
+        return summary
+
+
+class SoakResultsProcessor(ResultsProcessor):
+    '''Summarises test data values in bounded memory, for long runs.
+
+    The statistics of the whole run are kept for each field with
+    RunningStatistics, and the summary of the last @window_size results,
+    as summarised by DefaultResultsProcessor, is under 'window'. Summary
+    time does not depend on the number of results.
+    New results are taken from the end of the results passed in, using
+    their "num_appended" count if any, as for SampledResultsStore, so the
+    summary must be generated at least every @window_size results.
+    '''
+
+    def __init__(self, window_size: int):
+        self.window_size = window_size
+        self.reset()
+
+    def reset(self):
+        self.fields = {}
+        self.num_results = 0
+        self.window = deque(maxlen=self.window_size)
+
+    def add_result(self, result: dict):
+        '''Add the data values of the iteration @result to the statistics'''
+        for test, test_result in result['TestRunner'].items():
+            test_fields = self.fields.setdefault(test, {})
+            for data_key, data_value in test_result.get('data', {}).items():
+                if data_key not in test_fields:
+                    test_fields[data_key] = RunningStatistics()
+                test_fields[data_key].add(data_value)
+
+        self.window.append(result)
+        self.num_results += 1
+
+    def generate_summary(self, tests: list, results: list) -> dict:
+        num_appended = getattr(results, 'num_appended', len(results))
+        if num_appended < self.num_results:
+            self.reset()
+
+        # Results not kept anymore are skipped
+        new_results = min(num_appended - self.num_results, len(results))
+        for index in range(len(results) - new_results, len(results)):
+            self.add_result(results[index])
+        self.num_results = num_appended
+
+        window_summary = DefaultResultsProcessor().generate_summary(tests, list(self.window))
+
+        summary = {}
+        for test in tests:
+            test_summary = summary[str(test)] = {}
+            for data_key, statistics in self.fields.get(str(test), {}).items():
+                test_summary[data_key] = statistics.summary()
+                if data_key in window_summary[str(test)]:
+                    test_summary[data_key]['window'] = window_summary[str(test)][data_key]
+
+        return summary
@@ -0,0 +1,106 @@
+import re
+from bisect import bisect_right
+from typing import Callable, List
+
+
+class ResultsQuery:
+    '''Index of test results, to filter them by test name and settings quickly.
+
+    Test names matching a list of patterns are resolved once, and cached
+    until results with new tests are added. The settings of each test are
+    indexed as runs of iterations with the same settings, as they rarely
+    change, so that a settings filter is checked once per distinct
+    settings instead of once per iteration.
+    Results are added with :meth:`update`, which only indexes the results
+    appended since the last update.
+    '''
+
+    def __init__(self):
+        self.num_results = 0
+        self.tests = {}
+        self._matches = {}
+        self._patterns = {}
+
+    def reset(self):
+        self.num_results = 0
+        self.tests = {}
+        self._matches = {}
+
+    def update(self, results):
+        '''Index the results appended to @results since the last update'''
+        if len(results) < self.num_results:
+            self.reset()
+
+        for index in range(self.num_results, len(results)):
+            self.add_result(results[index])
+
+    def add_result(self, result: dict):
+        iteration = self.num_results
+        for test, test_result in result['TestRunner'].items():
+            index = self.tests.get(test)
+            if index is None:
+                index = self.tests[test] = TestSettingsIndex()
+                # The tests matching each pattern may have changed
+                self._matches = {}
+            index.add(iteration, test_result.get('settings', {}))
+
+        self.num_results += 1
+
+    def match_tests(self, patterns: List[str]) -> List[str]:
+        '''Return the sorted names of the tests fully matching any of @patterns'''
+        key = tuple(patterns)
+        matches = self._matches.get(key)
+        if matches is None:
+            compiled = [self._compile(pattern) for pattern in patterns]
+            matches = self._matches[key] = sorted(
+                test for test in self.tests if any(regex.match(test) for regex in compiled))
+
+        return matches
+
+    def settings_filter(self, tests: List[str], settings: dict) -> Callable[[str, int], bool]:
+        '''Return a function checking if a test has @settings at an iteration'''
+        if not settings:
+            return lambda test, iteration: True
+
+        matching = {test: self.tests[test].matching(settings) for test in tests}
+        return lambda test, iteration: self.tests[test].settings_at(iteration) in matching[test]
+
+    def _compile(self, pattern: str):
+        regex = self._patterns.get(pattern)
+        if regex is None:
+            # Patterns must match the full test name
+            regex = self._patterns[pattern] = re.compile(f'{pattern}$')
+        return regex
+
+
+class TestSettingsIndex:
+    '''Distinct settings of a test, and the runs of iterations using each'''
+
+    def __init__(self):
+        self.settings = []
+        self._run_starts = []
+        self._run_settings = []
+
+    def add(self, iteration: int, settings: dict):
+        if self._run_settings and self.settings[self._run_settings[-1]] == settings:
+            return
+
+        if settings in self.settings:
+            settings_index = self.settings.index(settings)
+        else:
+            settings_index = len(self.settings)
+            self.settings.append(settings)
+
+        self._run_starts.append(iteration)
+        self._run_settings.append(settings_index)
+
+    def settings_at(self, iteration: int) -> int:
+        '''Return the index of the settings used at @iteration'''
+        run = bisect_right(self._run_starts, iteration) - 1
+        return self._run_settings[run] if run >= 0 else None
+
+    def matching(self, settings: dict) -> set:
+        '''Return the indexes of the settings including all of @settings'''
+        return {index for index, test_settings in enumerate(self.settings)
+                if all(key in test_settings and test_settings[key] == value
+                       for key, value in settings.items())}
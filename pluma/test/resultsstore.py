@@ -0,0 +1,380 @@
+import json
+import os
+import random
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from copy import deepcopy
+from types import GeneratorType
+
+""" Number of most recent results kept in memory by file results stores """
+DEFAULT_RESULTS_WINDOW = 100
+
+""" Number of older results sampled by sampled results stores """
+DEFAULT_SAMPLE_SIZE = 1000
+
+
+class ResultsStore(ABC):
+    '''Sequence of the results of each test iteration, appended when complete.
+
+    Results are dicts of JSON serialisable values, and are not modified once
+    appended. Stores support len(), iteration and indexing, like lists.
+    The names of the data fields of each test are collected as results are
+    appended, in "fields", to export results without reading them twice.
+    The position of a store is saved with :meth:`checkpoint`, and a store
+    containing the results saved is set back to it with :meth:`restore`,
+    to resume a run.
+    '''
+
+    # Whether results are dropped as others are appended, see SampledResultsStore
+    sampled = False
+
+    def __init__(self):
+        self.fields = {}
+
+    @abstractmethod
+    def append(self, result: dict):
+        '''Add the @result of an iteration, copying it'''
+
+    @abstractmethod
+    def __getitem__(self, index: int) -> dict:
+        '''Return the result at @index, negative indexes counting from the end'''
+
+    @abstractmethod
+    def __iter__(self):
+        '''Yield all results, oldest first'''
+
+    @abstractmethod
+    def __len__(self) -> int:
+        '''Return the number of results'''
+
+    @abstractmethod
+    def clear(self):
+        '''Remove all results'''
+
+    @abstractmethod
+    def truncate(self, count: int):
+        '''Remove the results after the first @count results'''
+
+    def close(self):
+        '''Release the resources used by the store'''
+
+    def checkpoint(self) -> dict:
+        '''Return the position of the store, as JSON serialisable data'''
+        return {'count': len(self), 'fields': self.fields}
+
+    def restore(self, checkpoint: dict):
+        '''Remove the results added after @checkpoint, returned by :meth:`checkpoint`'''
+        count = checkpoint['count']
+        if count > len(self):
+            raise ValueError(f'Cannot restore the results store to {count} results, '
+                             f'it only has {len(self)} results')
+
+        self.truncate(count)
+        self.fields = {test: dict(fields) for test, fields in checkpoint['fields'].items()}
+
+    def _add_fields(self, result: dict):
+        '''Collect the names of the data fields of each test in @result'''
+        for test, test_result in result.get('TestRunner', {}).items():
+            test_fields = self.fields.setdefault(test, {})
+            for field in test_result.get('data', {}):
+                test_fields.setdefault(field, None)
+
+    def _index(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('results index out of range')
+        return index
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}[{len(self)} results]'
+
+
+class MemoryResultsStore(ResultsStore):
+    '''Keeps all results in memory'''
+
+    def __init__(self):
+        super().__init__()
+        self._results = []
+
+    def append(self, result: dict):
+        self._results.append(deepcopy(result))
+        self._add_fields(result)
+
+    def __getitem__(self, index: int) -> dict:
+        return self._results[index]
+
+    def __iter__(self):
+        return iter(self._results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self):
+        self._results.clear()
+        self.fields = {}
+
+    def truncate(self, count: int):
+        del self._results[count:]
+
+
+class JsonResultsStore(ResultsStore):
+    '''Streams results to an append-only JSON Lines file.
+
+    Each result is written to @path as one line of JSON as soon as appended,
+    and only the last @window_size results are kept in memory. Older
+    results are read from the file when accessed, so that the memory used
+    does not grow with the number of iterations. Results read from the
+    file are new copies, and changing them does not change the store.
+    The file is truncated when the store is created, unless @truncate is
+    False, in which case the results already in the file are kept, and
+    new results appended after them.
+    '''
+
+    def __init__(self, path: str, window_size: int = DEFAULT_RESULTS_WINDOW,
+                 truncate: bool = True):
+        if window_size < 1:
+            raise ValueError('The results window size must be at least 1')
+
+        super().__init__()
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._offsets = array('Q')
+        self._window = deque(maxlen=window_size)
+        if truncate or not os.path.exists(path):
+            self._file = open(path, 'w+b')
+        else:
+            self._file = open(path, 'r+b')
+            self._load()
+
+    @property
+    def window_size(self) -> int:
+        return self._window.maxlen
+
+    def append(self, result: dict):
+        line = json.dumps(result, default=str).encode() + b'\n'
+
+        self._file.seek(0, os.SEEK_END)
+        self._offsets.append(self._file.tell())
+        self._file.write(line)
+        self._file.flush()
+
+        # Decoding the line copies the result, as stored on disk
+        self._window.append(json.loads(line))
+        self._add_fields(result)
+
+    def __getitem__(self, index: int) -> dict:
+        index = self._index(index)
+        first_in_window = len(self._offsets) - len(self._window)
+        if index >= first_in_window:
+            return self._window[index - first_in_window]
+
+        self._file.flush()
+        self._file.seek(self._offsets[index])
+        return json.loads(self._file.readline())
+
+    def __iter__(self):
+        count = len(self._offsets)
+        first_in_window = count - len(self._window)
+        window = list(self._window)
+
+        if first_in_window:
+            self._file.flush()
+            # Read with a separate file, not to move the position of the store
+            with open(self.path, 'rb') as results_file:
+                for __ in range(first_in_window):
+                    yield json.loads(results_file.readline())
+
+        yield from window
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def clear(self):
+        self._file.seek(0)
+        self._file.truncate()
+        self._offsets = array('Q')
+        self._window.clear()
+        self.fields = {}
+
+    def truncate(self, count: int):
+        if count >= len(self):
+            return
+
+        self._file.seek(self._offsets[count])
+        self._file.truncate()
+        del self._offsets[count:]
+
+        # Read the results now at the end of the file back in the window
+        self._window.clear()
+        first_in_window = max(0, count - self._window.maxlen)
+        if first_in_window < count:
+            self._file.seek(self._offsets[first_in_window])
+            for __ in range(first_in_window, count):
+                self._window.append(json.loads(self._file.readline()))
+
+    def checkpoint(self) -> dict:
+        '''Return the position of the store, once its results are written to disk'''
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        checkpoint = super().checkpoint()
+        checkpoint['offset'] = self._file.seek(0, os.SEEK_END)
+        return checkpoint
+
+    def restore(self, checkpoint: dict):
+        count = checkpoint['count']
+        offset = self._offsets[count] if count < len(self) else self._file.seek(0, os.SEEK_END)
+        if count <= len(self) and offset != checkpoint['offset']:
+            raise ValueError(f'The results file "{self.path}" does not match the checkpoint, '
+                             f'expected result #{count} at offset {checkpoint["offset"]}')
+
+        super().restore(checkpoint)
+
+    def _load(self):
+        '''Index the results already in the file, dropping an incomplete last line'''
+        offset = 0
+        for line in self._file:
+            if not line.endswith(b'\n'):
+                break
+            result = json.loads(line)
+            self._offsets.append(offset)
+            self._window.append(result)
+            self._add_fields(result)
+            offset += len(line)
+
+        self._file.seek(offset)
+        self._file.truncate()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class SampledResultsStore(ResultsStore):
+    '''Keeps the most recent results, and a random sample of older results.
+
+    The last @window_size results are all kept, and results leaving this
+    window are sampled with reservoir sampling, keeping @sample_size of
+    them, each older result having the same chance to be kept. The memory
+    used is bounded, however long the run. Results are kept in the order
+    they were appended, and each result has its "iteration" number, as
+    indexes are positions among the results kept.
+    "num_appended" is the number of results appended since the store was
+    cleared, kept or not.
+    '''
+
+    sampled = True
+
+    def __init__(self, window_size: int = DEFAULT_RESULTS_WINDOW,
+                 sample_size: int = DEFAULT_SAMPLE_SIZE, seed=None):
+        if window_size < 1:
+            raise ValueError('The results window size must be at least 1')
+        if sample_size < 0:
+            raise ValueError('The results sample size cannot be negative')
+
+        super().__init__()
+        self.sample_size = sample_size
+        self.num_appended = 0
+        self._window = deque(maxlen=window_size)
+        # (position appended, result) of the results sampled, in any order
+        self._sample = []
+        self._num_sampled_from = 0
+        self._random = random.Random(seed)
+        self._ordered = None
+
+    @property
+    def window_size(self) -> int:
+        return self._window.maxlen
+
+    @property
+    def window(self) -> list:
+        '''Return the most recent results, oldest first'''
+        return [result for __, result in self._window]
+
+    def append(self, result: dict):
+        if len(self._window) == self._window.maxlen:
+            self._add_to_sample(self._window[0])
+
+        self._window.append((self.num_appended, deepcopy(result)))
+        self.num_appended += 1
+        self._add_fields(result)
+        self._ordered = None
+
+    def _add_to_sample(self, entry: tuple):
+        '''Sample @entry, leaving the window, with reservoir sampling (algorithm R)'''
+        self._num_sampled_from += 1
+        if len(self._sample) < self.sample_size:
+            self._sample.append(entry)
+        else:
+            index = self._random.randrange(self._num_sampled_from)
+            if index < self.sample_size:
+                self._sample[index] = entry
+
+    def _results(self) -> list:
+        if self._ordered is None:
+            self._ordered = [result for __, result in sorted(self._sample, key=lambda e: e[0])]
+            self._ordered.extend(result for __, result in self._window)
+        return self._ordered
+
+    def __getitem__(self, index: int) -> dict:
+        return self._results()[self._index(index)]
+
+    def __iter__(self):
+        return iter(self._results())
+
+    def __len__(self) -> int:
+        return len(self._sample) + len(self._window)
+
+    def clear(self):
+        self._window.clear()
+        self._sample = []
+        self._num_sampled_from = 0
+        self.num_appended = 0
+        self.fields = {}
+        self._ordered = None
+
+    def truncate(self, count: int):
+        if count < len(self):
+            raise ValueError('Results cannot be removed from a sampled results store')
+
+
+def dump_json(data, output_file, indent: int = 4):
+    '''Write @data as JSON to @output_file, streaming results stores and generators.
+
+    The output is the same as json.dump(@data, indent=@indent), with stores
+    and generators written as lists, one item at a time.
+    '''
+    _dump_json(data, output_file, indent, 0)
+
+
+def _dump_json(data, output_file, indent: int, level: int):
+    if isinstance(data, (ResultsStore, GeneratorType)):
+        items = ((None, value) for value in data)
+        brackets = '[]'
+    elif isinstance(data, dict) and any(isinstance(value, (dict, ResultsStore, GeneratorType))
+                                        for value in data.values()):
+        items = data.items()
+        brackets = '{}'
+    else:
+        text = json.dumps(data, indent=indent, default=str)
+        output_file.write(text.replace('\n', '\n' + ' ' * indent * level))
+        return
+
+    output_file.write(brackets[0])
+    empty = True
+    for key, value in items:
+        output_file.write(',\n' if not empty else '\n')
+        output_file.write(' ' * indent * (level + 1))
+        if key is not None:
+            output_file.write(f'{json.dumps(str(key))}: ')
+        _dump_json(value, output_file, indent, level + 1)
+        empty = False
+
+    if not empty:
+        output_file.write('\n' + ' ' * indent * level)
+    output_file.write(brackets[1])
@@ -23,6 +23,9 @@ class ShellTest(TestBase):
         self.runs_in_shell = runs_in_shell
         self.login_automatically = login_automatically
 
+        if self.run_on_host:
+            self.task_resources = {'test_body': ['host']}
+
         self.scripts = script
         if not isinstance(self.scripts, list):
             self.scripts = [self.scripts]
@@ -79,5 +82,5 @@ class ShellTest(TestBase):
                                        match_regex=self.should_match_regex,
                                        error_regex=self.should_not_match_regex)
 
-        log.log(CommandRunner.format_command_log(sent=script, output=output))
+        log.log(lambda: CommandRunner.format_command_log(sent=script, output=output))
         return output
@@ -1,8 +1,17 @@
 from datetime import datetime
-import json
 import time
 
 from ..unittest import deferred_function
+from ..resultsstore import dump_json
+from ..resultsprocessor import FieldStatistics
+from ..confidence import DEFAULT_CONFIDENCE, mean_confidence_half_width, \
+    proportion_confidence_interval
+
+""" Default maximum half width of confidence intervals, relative to the mean """
+DEFAULT_RELATIVE_WIDTH = 0.05
+
+""" Default minimum number of iterations before checking convergence """
+DEFAULT_MIN_ITERATIONS = 10
 
 
 # ==== UnitTest Teardown functions ====
@@ -67,9 +76,9 @@ def sr_log_test_results(TestController, board):
 def write_global_data(TestController, output_file, log_func=print):
     log_func('Writing testing summary data to {}...'.format(
         output_file))
+    # Results are streamed from the results store, not to load them all
     with open(output_file, 'w') as f:
-        json_data = json.dumps(TestController.data, indent=4)
-        f.write(json_data)
+        dump_json(TestController.data, f, indent=4)
 
 
 # ====== TestController Run Condition Functions ======
@@ -105,6 +114,132 @@ def sc_run_n_iterations(TestController, ntimes):
     return TestController.stats['num_iterations_run'] < ntimes
 
 
+def fields_converged(TestController, fields, relative_width=DEFAULT_RELATIVE_WIDTH,
+                     confidence=DEFAULT_CONFIDENCE):
+    '''Return True if the means of @fields are known within @relative_width.
+
+    @fields are names of test data fields, such as "boot_time", checked for
+    every test which has them. The mean of a field is known when the half
+    width of its @confidence interval is at most @relative_width of the
+    mean, e.g. 0.05 for +/- 5%. Fields without values yet are not known.
+    '''
+    if isinstance(fields, str):
+        fields = [fields]
+
+    for field in fields:
+        statistics = _field_statistics(TestController, field)
+        if not statistics:
+            return False
+
+        for test, field_statistics in statistics.items():
+            if not field_statistics.numeric:
+                raise ValueError(f'Cannot check the convergence of field "{field}" '
+                                 f'of test "{test}", which is not numeric')
+
+            half_width = mean_confidence_half_width(
+                field_statistics.n, field_statistics.stdev, confidence)
+            if half_width > relative_width * abs(field_statistics.mean):
+                return False
+
+    return True
+
+
+def pass_rate_bounded(TestController, max_error, confidence=DEFAULT_CONFIDENCE):
+    '''Return True if the iterations pass rate is known within +/- @max_error.
+
+    Uses the Wilson score interval of the pass rate, at @confidence.
+    '''
+    low, high = proportion_confidence_interval(TestController.stats['num_iterations_pass'],
+                                               TestController.stats['num_iterations_run'],
+                                               confidence)
+    return (high - low) / 2 <= max_error
+
+
+def _field_statistics(TestController, field):
+    '''Return the statistics of @field for each test which has it.
+
+    Uses the statistics of the results processor if it has any, such as
+    FieldStatistics or RunningStatistics, as results can be sampled.
+    '''
+    processor = TestController.results_processor
+    if hasattr(processor, 'fields'):
+        # Statistics are up to date, as updated at the end of each iteration
+        return {test: test_fields[field] for test, test_fields in processor.fields.items()
+                if field in test_fields}
+
+    statistics = {}
+    for tests_data in TestController.get_test_results(fields=[field]):
+        for test, test_data in tests_data.items():
+            if field in test_data:
+                statistics.setdefault(test, FieldStatistics()).add(test_data[field])
+
+    return statistics
+
+
+@deferred_function
+def sc_run_until_fields_converge(TestController, fields, max_iterations,
+                                 relative_width=DEFAULT_RELATIVE_WIDTH,
+                                 confidence=DEFAULT_CONFIDENCE,
+                                 min_iterations=DEFAULT_MIN_ITERATIONS):
+    '''Run until the means of @fields converged, or @max_iterations ran.
+
+    See :func:`fields_converged`. At least @min_iterations are run.
+    '''
+    return _run_until(TestController, max_iterations, min_iterations,
+                      fields=fields, relative_width=relative_width, confidence=confidence)
+
+
+@deferred_function
+def sc_run_until_pass_rate_bounded(TestController, max_error, max_iterations,
+                                   confidence=DEFAULT_CONFIDENCE,
+                                   min_iterations=DEFAULT_MIN_ITERATIONS):
+    '''Run until the pass rate is known within +/- @max_error, or @max_iterations ran.
+
+    See :func:`pass_rate_bounded`. At least @min_iterations are run.
+    '''
+    return _run_until(TestController, max_iterations, min_iterations,
+                      pass_rate_error=max_error, confidence=confidence)
+
+
+@deferred_function
+def sc_run_until_converged(TestController, max_iterations, fields=None,
+                           relative_width=DEFAULT_RELATIVE_WIDTH, pass_rate_error=None,
+                           confidence=DEFAULT_CONFIDENCE, min_iterations=DEFAULT_MIN_ITERATIONS):
+    '''Run until all statistics requested are known precisely, or @max_iterations ran.
+
+    Stops once the means of @fields converged (see :func:`fields_converged`)
+    and, if @pass_rate_error is set, the pass rate is known within
+    +/- @pass_rate_error (see :func:`pass_rate_bounded`).
+    At least @min_iterations are run.
+    '''
+    return _run_until(TestController, max_iterations, min_iterations, fields=fields,
+                      relative_width=relative_width, pass_rate_error=pass_rate_error,
+                      confidence=confidence)
+
+
+def _run_until(TestController, max_iterations, min_iterations, fields=None,
+               relative_width=DEFAULT_RELATIVE_WIDTH, pass_rate_error=None,
+               confidence=DEFAULT_CONFIDENCE):
+    if not fields and pass_rate_error is None:
+        raise ValueError('At least one of "fields" or "pass_rate_error" is required')
+
+    iterations = TestController.stats['num_iterations_run']
+    if iterations >= max_iterations:
+        return False
+    if iterations < min_iterations:
+        return True
+
+    if fields and not fields_converged(TestController, fields, relative_width, confidence):
+        return True
+    if pass_rate_error is not None and \
+            not pass_rate_bounded(TestController, pass_rate_error, confidence):
+        return True
+
+    TestController.log(f'Statistics converged after {iterations} iterations, '
+                       f'stopping before {max_iterations}')
+    return False
+
+
 @deferred_function
 def sc_time_in_range(start_hour, end_hour):
     now = datetime.now()
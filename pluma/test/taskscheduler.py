@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, List
+
+""" Resources used by at most one task at a time """
+EXCLUSIVE_RESOURCES = {'console', 'power', 'storage'}
+
+""" Resources used by test tasks which do not declare their resources """
+DEFAULT_TASK_RESOURCES = {
+    'pre_host_mount': ['host', 'storage'],
+    'prepare': ['host', 'storage'],
+    'report': ['host'],
+}
+
+""" Resources used by test tasks not in DEFAULT_TASK_RESOURCES """
+DEFAULT_RESOURCES = ['console']
+
+
+class ScheduledTask:
+    '''Task run by the TaskScheduler, with its resources and dependencies'''
+
+    def __init__(self, name: str, function: Callable, resources: Iterable[str] = None,
+                 dependencies: Iterable['ScheduledTask'] = None):
+        self.name = name
+        self.function = function
+        self.resources = set(resources or [])
+        self.dependencies = list(dependencies or [])
+        self.done = False
+
+    @property
+    def exclusive_resources(self) -> set:
+        return self.resources & EXCLUSIVE_RESOURCES
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}[{self.name}]'
+
+
+class TaskScheduler:
+    '''Runs tasks concurrently, in the order set by their dependencies and resources.
+
+    Tasks are added in their sequential order. A task depends on the tasks
+    it is explicitly given, and on the last task added before it using one
+    of the same exclusive resources (EXCLUSIVE_RESOURCES), such as the
+    board console. Tasks using the same exclusive resources therefore keep
+    their sequential order, and never run at the same time, while other
+    tasks, such as host-only tasks, run as soon as their dependencies
+    completed.
+
+    If a task raises an exception, no more tasks are started, and the
+    exception is raised by :meth:`run` once running tasks completed.
+    '''
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers
+        self.tasks = []
+        self._last_users = {}
+
+    def add(self, name: str, function: Callable, resources: Iterable[str] = None,
+            dependencies: Iterable[ScheduledTask] = None) -> ScheduledTask:
+        '''Add a task running @function, after all tasks already added it conflicts with'''
+        task = ScheduledTask(name, function, resources, dependencies)
+        for resource in task.exclusive_resources:
+            last_user = self._last_users.get(resource)
+            if last_user and last_user not in task.dependencies:
+                task.dependencies.append(last_user)
+            self._last_users[resource] = task
+
+        self.tasks.append(task)
+        return task
+
+    def run(self):
+        '''Run all tasks added, and wait for their completion'''
+        pending = list(self.tasks)
+        running = {}
+        busy_resources = set()
+        errors = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if not errors:
+                    for task in self._ready_tasks(pending, busy_resources):
+                        pending.remove(task)
+                        busy_resources |= task.exclusive_resources
+                        running[executor.submit(task.function)] = task
+                else:
+                    pending.clear()
+
+                if not running:
+                    break
+
+                done, __ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    task.done = True
+                    busy_resources -= task.exclusive_resources
+                    if future.exception():
+                        errors.append(future.exception())
+
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _ready_tasks(pending: List[ScheduledTask], busy_resources: set) -> List[ScheduledTask]:
+        ready = []
+        for task in pending:
+            if all(dependency.done for dependency in task.dependencies) and \
+                    not task.exclusive_resources & busy_resources:
+                busy_resources = busy_resources | task.exclusive_resources
+                ready.append(task)
+
+        return ready
@@ -2,7 +2,22 @@ from pluma.core import Board
 
 
 class TestBase():
-    """Base class for tests"""
+    """Base class for tests
+
+    When the TestRunner tracks the board state, "board_state" is the
+    BoardState the test requires to run, and None requires the full
+    TestCore sequence (BoardState.MOUNTED). Tests implementing
+    "pre_host_mount" or "pre_board_on" always get a fresh boot.
+
+    With concurrent tasks, "task_resources" maps task names to the
+    resources they use ("console", "host", "storage" or "power"), and
+    "task_dependencies" maps task names to the tasks of other tests they
+    must run after. Tasks not in "task_resources" use the defaults of
+    the TaskScheduler (pluma.test.taskscheduler).
+    """
+    board_state = None
+    task_resources = {}
+    task_dependencies = {}
 
     def __init__(self, board: Board, test_name_suffix: str = None):
         """Construct a TestBase with a board, and test suffix"""
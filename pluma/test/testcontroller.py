@@ -1,16 +1,22 @@
-import time
+import io
 import json
+import os
+import time
 from datetime import datetime
-from copy import deepcopy
 
-from pluma.utils import send_exception_email, datetime_to_timestamp, \
-    regex_filter_list
+from pluma.utils import send_exception_email, datetime_to_timestamp
 
 from .unittest import deferred_function
 from pluma.test import TestRunner
 
 from .resultsplotter import DefaultResultsPlotter
-from .resultsprocessor import DefaultResultsProcessor
+from .resultsprocessor import DefaultResultsProcessor, SoakResultsProcessor
+from .resultsstore import ResultsStore, MemoryResultsStore, SampledResultsStore, \
+    DEFAULT_SAMPLE_SIZE, dump_json
+from .resultsquery import ResultsQuery
+
+""" Version of the checkpoint files format """
+CHECKPOINT_VERSION = 1
 
 
 class TestController():
@@ -81,6 +87,36 @@ class TestController():
         results_processor (:class:`~pluma.test.resultsprocessor.ResultsProcessor`): Processor to
             be used to format test results.
             Defaults to :class:`~pluma.test.resultsprocessor.DefaultResultsProcessor`
+        results_store (:class:`~pluma.test.resultsstore.ResultsStore`): Store
+            the result of each iteration is appended to, when complete.
+            Defaults to :class:`~pluma.test.resultsstore.MemoryResultsStore`,
+            use :class:`~pluma.test.resultsstore.JsonResultsStore` to stream
+            results to a file, and only keep the most recent in memory.
+        columnar_results (bool): Query and graph results with a
+            :class:`~pluma.test.resultsframe.ResultsFrame`, with one NumPy
+            array per test data field, updated as iterations complete.
+            Faster for many iterations, but keeps all data values in memory.
+            Default: False
+        checkpoint_file (str): Path of the file the state of the run is
+            saved to every "checkpoint_n_iterations" iterations, to resume
+            the run with :meth:`load_checkpoint` if interrupted. Requires a
+            results store keeping results on disk, such as
+            :class:`~pluma.test.resultsstore.JsonResultsStore`.
+            Default: None, no checkpoints.
+        checkpoint_n_iterations (int): Save a checkpoint every N iterations.
+            Saved to :attr:`settings`
+            Default: 1, after every iteration.
+        soak_window (int): Soak mode, for long runs such as with "run_forever",
+            with memory use and summary time not growing with the number of
+            iterations. The summary has exact statistics of the whole run, and
+            the summary of the last N iterations under 'window'
+            (:class:`~pluma.test.resultsprocessor.SoakResultsProcessor`), and
+            the results kept are the last N iterations, and a random sample
+            of older iterations used to query and graph results
+            (:class:`~pluma.test.resultsstore.SampledResultsStore`).
+            Default: None, all results are kept and summarised.
+        soak_sample_size (int): In soak mode, number of older iterations sampled.
+            Default: 1000
 
     Attributes:
         settings (dict): Controls the behaviour of the TestController.
@@ -88,7 +124,7 @@ class TestController():
             Items:
                 run_forever, report_n_iterations, continue_on_fail,
                 condition_check_interval_s, setup_n_iterations, force_initial_run,
-                email_on_except
+                email_on_except, checkpoint_n_iterations
         stats (dict): Contains TestController's runtime statistics.
             num_iterations_run: Total number of iterations run.
             num_iterations_pass: Number of iterations with no test failures.
@@ -114,7 +150,9 @@ class TestController():
                  continue_on_fail=True, run_forever=False, condition_check_interval_s=0,
                  setup_n_iterations=None, force_initial_run=False, email_on_except=True,
                  log_func=None, verbose_log_func=None, debug_log_func=None,
-                 results_plotter=None, results_processor=None):
+                 results_plotter=None, results_processor=None, results_store=None,
+                 columnar_results=False, checkpoint_file=None, checkpoint_n_iterations=1,
+                 soak_window=None, soak_sample_size=DEFAULT_SAMPLE_SIZE):
         assert isinstance(testrunner, TestRunner)
 
         self.testrunner = testrunner
@@ -128,6 +166,11 @@ class TestController():
 
         self.name = name
 
+        if soak_window:
+            results_processor = results_processor or SoakResultsProcessor(soak_window)
+            if results_store is None:
+                results_store = SampledResultsStore(soak_window, soak_sample_size)
+
         self.results_plotter = results_plotter or DefaultResultsPlotter()
         self.results_processor = results_processor or DefaultResultsProcessor()
 
@@ -152,6 +195,7 @@ class TestController():
         self.settings['setup_n_iterations'] = setup_n_iterations
         self.settings['force_initial_run'] = force_initial_run
         self.settings['email_on_except'] = email_on_except
+        self.settings['checkpoint_n_iterations'] = checkpoint_n_iterations
 
         # Runtime statistics
         self.stats = {}
@@ -161,7 +205,15 @@ class TestController():
         self.stats['num_tests_pass'] = 0
         self.stats['num_tests_total'] = 0
 
-        self.results = []
+        self.columnar_results = columnar_results
+        self.results = results_store if results_store is not None else MemoryResultsStore()
+
+        # Result of the iteration running, appended to "results" when complete
+        self.current_result = None
+
+        self.checkpoint_file = checkpoint_file
+        # Set when a checkpoint is loaded, for the next run to continue from it
+        self._resumed = False
 
     @property
     def settings(self):
@@ -183,16 +235,31 @@ class TestController():
 
     @property
     def results(self):
-        ''' Saved test runtime results.
+        ''' Saved test runtime results, as a ResultsStore.
 
-        ll the data values saved to the "data" dicts of
-        the tests in the TestRunner, over all iterations that have been run.
+        All the data values saved to the "data" dicts of the tests in the
+        TestRunner, over all iterations completed. Setting a list of results
+        replaces the content of the store.
         '''
         return self.data['TestController']['results']
 
     @results.setter
     def results(self, results):
+        if not isinstance(results, ResultsStore):
+            store = self.data['TestController'].get('results')
+            if not isinstance(store, ResultsStore):
+                store = MemoryResultsStore()
+
+            store.clear()
+            for result in results:
+                store.append(result)
+            results = store
+
         self.data['TestController']['results'] = results
+        self.results_processor.reset()
+        self._results_frame = None
+        self._results_query = ResultsQuery()
+        self._first_test_results = None
 
     @property
     def results_summary(self):
@@ -293,21 +360,27 @@ class TestController():
 
     def collect_test_settings(self):
         ''' Get a summary of the settings for tests in the TestRunner '''
+        if not self.results:
+            self._first_test_results = None
+            return {}
+
+        if self._first_test_results is None:
+            # Read once, as the first result can be stored on disk
+            self._first_test_results = self.results[0]['TestRunner']
+
         settings = {}
         for test in self.testrunner.tests:
-            if (not self.results or
-                    str(test) not in self.results[0]['TestRunner']):
+            if str(test) not in self._first_test_results:
                 # Test has not run, cannot get settings
                 break
             if str(test) not in settings:
                 # NOTE: Assuming test settings never change between iterations
-                settings[str(test)] = self.results[0]['TestRunner'][str(
-                    test)]['settings']
+                settings[str(test)] = self._first_test_results[str(test)]['settings']
 
         return settings
 
     def get_test_results(self, test_names=None, fields=None, format=None,
-                         settings=None):
+                         settings=None, output=None):
         '''Get test data from the global data dictionary.
 
         Args:
@@ -334,58 +407,131 @@ class TestController():
                     Default: return data is a generator to create a list of dicts
                     E.g.
                         >>> field1_data = list(returned)[iteration_number]['test_name']['field1']
+            output (str, file): Optional. With 'json' or 'csv' format, path or
+                file object the data is written to as it is generated, in a
+                single pass over the results, instead of being returned.
         '''
 
+        if self.columnar_results:
+            frame = self.get_results_frame().select(test_names, fields, settings)
+        else:
+            frame = None
+
         test_names = test_names or '.*'
         if not isinstance(test_names, list):
             test_names = [test_names]
 
-        # Add a $ to the end of every regex to make it less greedy
-        test_names = [f'{t}$' for t in test_names]
+        # Tests matching and their settings are resolved once, not per iteration
+        query = self.get_results_query()
+        matching_tests = query.match_tests(test_names)
+        settings_match = query.settings_filter(matching_tests, settings)
+        fields = set(fields) if fields else None
 
         def data_gen():
-            for r in (result['TestRunner'] for result in self.results):
+            if frame is not None:
+                yield from frame.records()
+                return
+
+            for iteration, result in enumerate(self.results):
+                r = result['TestRunner']
                 yield {
                     name: {
-                        f: v for f, v in r[name]['data'].items() if 'data' in r[name] and
-                        not fields or f in fields
-                    } for name in regex_filter_list(test_names, r, unique=True)
-                    if not settings or
-                    all(key in r[name]['settings'] and
-                        r[name]['settings'][key] == val
-                        for key, val in settings.items())
+                        f: v for f, v in r[name].get('data', {}).items()
+                        if not fields or f in fields
+                    } for name in matching_tests
+                    if name in r and settings_match(name, iteration)
                 }
 
-        if format == 'json':
-            return json.dumps(list(data_gen()), indent=4)
-        elif format == 'csv':
-            newline = '\n'
-            header = sorted(list(set(key for it_data in data_gen()
-                                     for test, data in it_data.items() for key in data)))
-            csv_str = 'iteration,test_name,' + \
-                ','.join(header).replace('\n', ' ').replace('\r', '') + newline
-            empty_csv = True
-            for iteration, tests_data in enumerate(data_gen()):
-                for test_name, data in tests_data.items():
-                    empty_csv = False
-                    csv_str += f'{iteration},{test_name}'
-                    for h in header:
-                        csv_str += ','
-                        if h in data:
-                            csv_str += str(data[h]).replace('\n',
-                                                            ' ').replace('\r', '')
-                    csv_str += newline
-            return csv_str if not empty_csv else ''
-        elif not format:
+        if not format:
             return data_gen()
+        elif format == 'json':
+            def write(output_file):
+                dump_json(data_gen(), output_file, indent=4)
+        elif format == 'csv':
+            def write(output_file):
+                header = self._results_header(test_names, fields, settings)
+                self._write_csv(output_file, data_gen(), header)
         else:
             raise RuntimeError(
                 f'Invalid format: {format}. Options: "json", "csv", None')
 
+        if output is None:
+            output_file = io.StringIO()
+            write(output_file)
+            return output_file.getvalue()
+        elif isinstance(output, str):
+            with open(output, 'w') as output_file:
+                write(output_file)
+        else:
+            write(output)
+
+    def _results_header(self, test_names, fields, settings):
+        '''Return the sorted names of the data fields of the tests matching the filters.
+
+        Uses the fields collected by the results store, for the tests which
+        had @settings in any iteration.
+        '''
+        query = self.get_results_query()
+        header = set()
+        for test in query.match_tests(test_names):
+            if settings and not query.tests[test].matching(settings):
+                continue
+            header.update(field for field in self.results.fields.get(test, {})
+                          if not fields or field in fields)
+
+        return sorted(header)
+
+    @staticmethod
+    def _write_csv(output_file, data, header):
+        '''Write the CSV rows of @data, and @header before the first row'''
+        def clean(value):
+            return str(value).replace('\n', ' ').replace('\r', '')
+
+        header_line = f'iteration,test_name,{clean(",".join(header))}\n'
+        for iteration, tests_data in enumerate(data):
+            for test_name, test_data in tests_data.items():
+                if header_line:
+                    output_file.write(header_line)
+                    header_line = None
+
+                row = ''.join(',' + (clean(test_data[h]) if h in test_data else '')
+                              for h in header)
+                output_file.write(f'{iteration},{test_name}{row}\n')
+
+    def get_results_query(self) -> ResultsQuery:
+        '''Return the index of the results, adding the results of new iterations'''
+        if self.results.sampled:
+            # Results kept change, but are bounded, so they are indexed again
+            self._results_query.reset()
+        self._results_query.update(self.results)
+        return self._results_query
+
+    def get_results_frame(self):
+        '''Return the results as a ResultsFrame, adding the results of new iterations'''
+        # Only imported when used, as NumPy is slow to import
+        from .resultsframe import ResultsFrame
+
+        if self.results.sampled:
+            # Rows are numbered by iteration, as only some iterations are kept
+            return ResultsFrame.from_results(self.results, iteration_key='iteration')
+
+        if self._results_frame is None or len(self._results_frame) > len(self.results):
+            self._results_frame = ResultsFrame()
+
+        frame = self._results_frame
+        for index in range(len(frame), len(self.results)):
+            frame.append(self.results[index])
+
+        return frame
+
     def graph_test_results(self, file, test_names=None, fields=None, vs_type=None,
                            title=None, format=None, config=None):
         '''Create a graph of data fields from the test results data'''
-        results = list(self.get_test_results(test_names=test_names, fields=fields))
+        if ((self.columnar_results or self.results.sampled) and
+                self.results_plotter.accepts_results_frame):
+            results = self.get_results_frame().select(test_names, fields)
+        else:
+            results = list(self.get_test_results(test_names=test_names, fields=fields))
         self.results_plotter.plot(file, results=results, test_names=test_names, fields=fields,
                                   vs_type=vs_type, title=title, output_format=format, config=config)
 
@@ -429,11 +575,15 @@ class TestController():
             raise e
 
     def _run(self):
-        self.stats['num_iterations_run'] = 0
-        self.stats['num_iterations_pass'] = 0
-        self.stats['num_tests_run'] = 0
-        self.stats['num_tests_pass'] = 0
-        self.stats['num_tests_total'] = 0
+        if self._resumed:
+            # Stats were restored from a checkpoint, as was the run condition
+            self._resumed = False
+        else:
+            self.stats['num_iterations_run'] = 0
+            self.stats['num_iterations_pass'] = 0
+            self.stats['num_tests_run'] = 0
+            self.stats['num_tests_pass'] = 0
+            self.stats['num_tests_total'] = 0
 
         self.debug_log(f'Starting TestController with settings: {self.settings}')
         self.debug_log(f'Test settings: {self.test_settings}')
@@ -492,7 +642,7 @@ class TestController():
                 return success
 
     def _init_iteration(self):
-        skeleton = {
+        self.current_result = {
             'iteration': self.stats['num_iterations_run'],
             'start': datetime_to_timestamp(datetime.now()),
             'end': None,
@@ -500,22 +650,25 @@ class TestController():
             'test_order': None,
             'TestRunner': self.testrunner.data
         }
-        self.results.append(skeleton)
 
-        return self.results[-1]
+        return self.current_result
 
     def _finalise_iteration(self, success):
-        # Create copies of all TestRunner data
-        self.results[-1]['TestRunner'] = deepcopy(self.testrunner.data)
+        result = self.current_result
+        result['TestRunner'] = self.testrunner.data
 
         # Update stats
-        self.results[-1]['end'] = datetime_to_timestamp(datetime.now())
-        self.results[-1]['success'] = success
-        self.results[-1]['ran'] = True
+        result['end'] = datetime_to_timestamp(datetime.now())
+        result['success'] = success
+        result['ran'] = True
         if self.testrunner.sequential:
-            self.results[-1]['test_order'] = 'sequential'
+            result['test_order'] = 'sequential'
         else:
-            self.results[-1]['test_order'] = 'parallel'
+            result['test_order'] = 'parallel'
+
+        # The store copies the result, as tests can keep references to their data
+        self.results.append(result)
+        self.current_result = None
 
         num_tests_run = len([
             k for k, v in self.testrunner.data.items()
@@ -535,3 +688,78 @@ class TestController():
 
         self.results_summary = self.get_results_summary()
         self.test_settings = self.collect_test_settings()
+
+        checkpoint_n_iterations = self.settings['checkpoint_n_iterations']
+        if (self.checkpoint_file and checkpoint_n_iterations and
+                self.stats['num_iterations_run'] % checkpoint_n_iterations == 0):
+            self.save_checkpoint()
+
+    def save_checkpoint(self):
+        '''Save the state of the run to "checkpoint_file", to resume it later.
+
+        The checkpoint contains the stats, the state of the results processor,
+        the position of the results store and the data of run conditions.
+        As the stats include the number of iterations run, run conditions
+        such as :func:`~pluma.test.stock.deffuncs.sc_run_n_iterations`
+        continue from the same iteration. The file is replaced atomically,
+        so that an interruption while saving keeps the previous checkpoint.
+        '''
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'stats': self.stats,
+            'results': self.results.checkpoint(),
+            'results_processor': self.results_processor.get_state(),
+            # Run conditions save their own data next to the controller data
+            'data': {key: value for key, value in self.data.items()
+                     if key != 'TestController'}
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_file))
+        os.makedirs(directory, exist_ok=True)
+
+        temporary_file = f'{self.checkpoint_file}.tmp'
+        with open(temporary_file, 'w') as f:
+            json.dump(checkpoint, f, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_file, self.checkpoint_file)
+
+    def load_checkpoint(self) -> bool:
+        '''Restore the state of the run saved in "checkpoint_file".
+
+        The next :meth:`run` continues after the last iteration saved,
+        instead of starting from the first iteration. Results added to the
+        results store after the checkpoint are removed.
+        Returns False if there is no checkpoint file yet, and True otherwise.
+        '''
+        if not self.checkpoint_file:
+            raise ValueError('No checkpoint file set, cannot resume')
+
+        if not os.path.exists(self.checkpoint_file):
+            return False
+
+        with open(self.checkpoint_file) as f:
+            checkpoint = json.load(f)
+
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f'Unsupported checkpoint version in "{self.checkpoint_file}": '
+                             f'{checkpoint.get("version")}, expected {CHECKPOINT_VERSION}')
+
+        self.results.restore(checkpoint['results'])
+        self._results_frame = None
+        self._results_query = ResultsQuery()
+        self._first_test_results = None
+
+        processor_state = checkpoint['results_processor']
+        if processor_state is None:
+            self.results_processor.reset()
+        else:
+            self.results_processor.set_state(processor_state)
+
+        self.stats.update(checkpoint['stats'])
+        self.data.update(checkpoint['data'])
+        self.results_summary = self.get_results_summary()
+        self.test_settings = self.collect_test_settings()
+
+        self._resumed = True
+        return True
@@ -42,6 +42,7 @@ import os
 from pluma.utils import datetime_to_timestamp
 from pluma.core.exceptions import BoardBootValidationError, ConsoleLoginFailedError
 from pluma.test import TestBase, TaskFailed
+from .boardstate import BoardState
 
 
 class TestCore(TestBase):
@@ -51,17 +52,71 @@ class TestCore(TestBase):
         'pre_board_on', '_board_on_and_validate',
         'pre_board_login', '_board_login',
         'pre_board_mount', '_board_mount',
-        'pre_test_body', 'test_body', 'post_test_body'
+        'pre_test_body', 'test_body', 'post_test_body',
         '_board_unmount',
         '_board_off', 'post_board_off',
         '_host_mount', 'report'
     ]
 
+    # Test tasks which require a board freshly booted
+    fresh_boot_tasks = ['pre_host_mount', 'pre_board_on']
+
+    # Resources used by each task, when tasks run concurrently
+    task_resources = {
+        '_init_test_state': [],
+        '_host_mount': ['storage', 'power'],
+        '_host_unmount': ['storage', 'power'],
+        '_board_on_and_validate': ['power', 'console'],
+        '_board_login': ['console'],
+        '_board_mount': ['console', 'storage'],
+        '_board_unmount': ['console', 'storage'],
+        '_board_off': ['power', 'console'],
+    }
+
     def __init__(self, board, failed_bootlogs_dir):
         TestBase.__init__(self, board)
 
+        # TestRunner identifies TestCore by name
+        self._test_name = 'TestCore'
         self.failed_bootlogs_dir = failed_bootlogs_dir
 
+        # Current state of the board, None if unknown
+        self.board_state = None
+
+    @staticmethod
+    def needs_fresh_boot(test: TestBase) -> bool:
+        '''Return True if @test must start from a board powered off'''
+        return any(hasattr(test, task) for task in TestCore.fresh_boot_tasks)
+
+    def task_needed(self, task_name: str, test: TestBase, next_test: TestBase = None) -> bool:
+        '''Return True if the TestCore task @task_name is needed to run @test.
+
+        Used when tracking the board state, to only run the tasks changing
+        the board to the state required by @test. The board is powered off
+        after the last test (@next_test is None), or if @next_test needs a
+        fresh boot.
+        '''
+        state = self.board_state
+        required_state = test.board_state if test.board_state is not None \
+            else BoardState.MOUNTED
+        power_off = next_test is None or hasattr(test, 'post_board_off') or \
+            TestCore.needs_fresh_boot(next_test)
+
+        if task_name in ['_host_mount', '_host_unmount', '_board_on_and_validate']:
+            return state is None or state == BoardState.OFF
+        elif task_name == '_board_login':
+            return required_state >= BoardState.LOGGED_IN and \
+                (state is None or state < BoardState.LOGGED_IN)
+        elif task_name == '_board_mount':
+            return required_state >= BoardState.MOUNTED and \
+                (state is None or state < BoardState.MOUNTED)
+        elif task_name == '_board_unmount':
+            return power_off and state == BoardState.MOUNTED
+        elif task_name == '_board_off':
+            return power_off and state != BoardState.OFF
+
+        return True
+
     def _init_test_state(self):
         self.board.log("\n=!= INIT TEST STATE =!=", bold=True)
 
@@ -114,6 +169,7 @@ class TestCore(TestBase):
 
     def _board_on_and_validate(self):
         self.board.log("\n=!= BOARD ON AND VALIDATE =!=", bold=True)
+        self.board_state = None
 
         try:
             boot_time = self.board.reboot_and_validate()
@@ -128,6 +184,7 @@ class TestCore(TestBase):
             try:
                 if not os.path.exists(self.settings['failed_bootlogs_dir']):
                     os.makedirs(self.settings['failed_bootlogs_dir'])
+                self.board.flush_log()
                 shutil.copy2(self.board.console.log_file,
                              self.data['boot_log'])
             except Exception as ex:
@@ -141,6 +198,7 @@ class TestCore(TestBase):
         # If boot succeeded save this info
         self.data['boot_success'] = True
         self.data['boot_time'] = boot_time
+        self.board_state = BoardState.ON
 
     def pre_board_login(self):
         self.board.log("\n=== PRE BOARD LOGIN ===", color='blue', bold=True)
@@ -152,6 +210,8 @@ class TestCore(TestBase):
         except ConsoleLoginFailedError as e:
             raise TaskFailed(str(e))
 
+        self.board_state = BoardState.LOGGED_IN
+
     def pre_board_mount(self):
         self.board.log("\n=== PRE BOARD MOUNT ===", color='blue', bold=True)
 
@@ -159,6 +219,7 @@ class TestCore(TestBase):
         self.board.log("\n=!= BOARD MOUNT =!=", bold=True)
         self.board.storage.to_board()
         self.board.storage.mount_board()
+        self.board_state = BoardState.MOUNTED
 
     def pre_test_body(self):
         self.board.log("\n=== PRE TEST BODY ===", color='blue', bold=True)
@@ -172,10 +233,13 @@ class TestCore(TestBase):
     def _board_unmount(self):
         self.board.log("\n=!= BOARD UNMOUNT =!=", bold=True)
         self.board.storage.unmount_board()
+        self.board_state = BoardState.LOGGED_IN
 
     def _board_off(self):
         self.board.log("\n=!= BOARD OFF =!=", bold=True)
+        self.board_state = None
         self.board.power.off()
+        self.board_state = BoardState.OFF
 
     def post_board_off(self):
         self.board.log("\n=== POST BOARD OFF ===", color='blue', bold=True)
@@ -6,18 +6,35 @@ import inspect
 from copy import copy
 
 from pluma.utils import send_exception_email
-from pluma.core.baseclasses import LogLevel
+from pluma.core.baseclasses import Logger, LogLevel
 from pluma.test import TestCore, TestBase, TestingException, \
     AbortTesting, AbortTestingAndReport
+from .taskscheduler import TaskScheduler, DEFAULT_TASK_RESOURCES, DEFAULT_RESOURCES
 
 
 class TestRunner():
-    """Runs a set of tests once"""
+    """Runs a set of tests once
+
+    In sequential mode, all TestCore tasks run again for each test, powering
+    on and off the board for every test. With "track_board_state", TestCore
+    tracks the state of the board, and only runs the tasks needed by each
+    test to reach the state it requires (see TestBase.board_state). The board
+    is then booted once for all tests, unless a test needs a fresh boot or
+    a TestCore task fails.
+
+    With "concurrent_tasks", tasks run in the same order, but a task runs
+    as soon as the tasks it depends on completed and the resources it uses
+    are available (see TaskScheduler). Tasks using the board console,
+    power or storage never run at the same time, while host tasks, such as
+    "report" or tests run on the host, can run alongside them, on up to
+    "max_workers" threads.
+    """
 
     def __init__(self, board, tests=None,
                  skip_tasks=None, email_on_fail=True, use_testcore=True,
                  sequential=False, failed_bootlogs_dir=None,
-                 continue_on_fail=False):
+                 continue_on_fail=False, track_board_state=False,
+                 concurrent_tasks=False, max_workers=None):
         self.board = board
         self.email_on_fail = email_on_fail
         self.continue_on_fail = continue_on_fail
@@ -32,6 +49,10 @@ class TestRunner():
         self.tasks = TestCore.tasks
         self.use_testcore = use_testcore
         self.sequential = sequential
+        self.track_board_state = track_board_state
+        self.concurrent_tasks = concurrent_tasks
+        self.max_workers = max_workers
+        self.progress = None
 
         # General purpose data for use globally between tests
         self.data = {}
@@ -67,6 +88,11 @@ class TestRunner():
         }
 
     def run(self):
+        # Keep the log output of each board separate
+        with Logger().context(self.board.name):
+            return self._run()
+
+    def _run(self):
         self.board.log('Running tests', bold=True)
         self.test_fails = []
 
@@ -85,22 +111,31 @@ class TestRunner():
         self.board.log("Running tests: {}".format(
             list(map(str, self.tests))), level=LogLevel.DEBUG)
 
-        if self.sequential:
+        if self.concurrent_tasks:
+            mode = 'SEQUENTIAL' if self.sequential else 'PARALLEL'
+            self.board.log(f'== TESTING MODE: {mode}, CONCURRENT TASKS ==',
+                           color='blue', bold=True, level=LogLevel.DEBUG)
+            self.progress = None
+            self._run_tasks_concurrently()
+            self.progress = None
+        elif self.sequential:
             self.board.log('== TESTING MODE: SEQUENTIAL ==',
                            color='blue', bold=True, level=LogLevel.DEBUG)
 
             completed = 0
             total = len(self.tests)
-            for test_name in (str(test) for test in self.tests
-                              if str(test) != "TestCore"):
+            tests = [test for test in self.tests if str(test) != "TestCore"]
+            for index, test in enumerate(tests):
                 self.progress = completed / total
                 completed += 1
+                next_test = tests[index + 1] if index + 1 < len(tests) else None
                 for task_name in self.tasks:
-                    # Run TestCore tasks for every test
+                    # Run TestCore tasks for every test, or only those needed
                     tests_to_run = []
-                    if self.use_testcore:
+                    if self.use_testcore and \
+                            self._testcore_task_needed(task_name, test, next_test):
                         tests_to_run.append("TestCore")
-                    tests_to_run.append(test_name)
+                    tests_to_run.append(str(test))
 
                     self._run_tasks(task_name, tests_to_run)
 
@@ -185,6 +220,13 @@ class TestRunner():
 
         return None if not tests else tests[0]
 
+    def _testcore_task_needed(self, task_name, test, next_test):
+        if not self.track_board_state:
+            return True
+
+        testcore = self._get_test_by_name('TestCore')
+        return not testcore or testcore.task_needed(task_name, test, next_test)
+
     def get_tests_with_task(self, task_name):
         tests = [t for t in self.tests if hasattr(t, task_name)]
 
@@ -205,40 +247,105 @@ class TestRunner():
 
         try:
             for task_name in task_names:
-                tests_with_task = self.get_tests_with_task(task_name)
-
-                # If no tests have this task, do not attempt to run it
-                if not tests_with_task:
+                if not self._task_runnable(task_name):
                     continue
 
-                tests_names_with_task = [str(t) for t in tests_with_task]
+                for test_name in test_names:
+                    self._run_task(task_name, test_name)
+        except AbortTesting:
+            self.board.log("\n== TESTING ABORTED EARLY ==",
+                           color='red', bold=True)
 
-                # If only TestCore has task, and it is not an action
-                #   (starts with '_'), do not run this task
-                if ('TestCore' in tests_names_with_task and
-                        not task_name.startswith('_')):
-                    tests_names_with_task.remove('TestCore')
-                if not tests_names_with_task:
-                    continue
+    def _task_runnable(self, task_name):
+        tests_with_task = self.get_tests_with_task(task_name)
 
-                # Check if task should not be run
-                skip_message = f'Skipping task: {task_name}'
-                if "mount" in task_name and not self.board.storage:
-                    self.board.log(skip_message + '. Board does not have storage',
-                                   color='green', bold=True)
-                    continue
-                if ((task_name in ['_board_on_and_validate', '_board_off'])
-                        and not self.board.power):
-                    self.board.log(skip_message + '. Board does '
-                                   'not have power control', color='green', bold=True)
-                    continue
+        # If no tests have this task, do not attempt to run it
+        if not tests_with_task:
+            return False
 
-                if task_name in self.skip_tasks:
-                    self.board.log(skip_message, color='green', bold=True)
-                    continue
+        tests_names_with_task = [str(t) for t in tests_with_task]
 
-                for test_name in test_names:
-                    self._run_task(task_name, test_name)
+        # If only TestCore has task, and it is not an action
+        #   (starts with '_'), do not run this task
+        if ('TestCore' in tests_names_with_task and
+                not task_name.startswith('_')):
+            tests_names_with_task.remove('TestCore')
+        if not tests_names_with_task:
+            return False
+
+        # Check if task should not be run
+        skip_message = f'Skipping task: {task_name}'
+        if "mount" in task_name and not self.board.storage:
+            self.board.log(skip_message + '. Board does not have storage',
+                           color='green', bold=True)
+            return False
+        if ((task_name in ['_board_on_and_validate', '_board_off'])
+                and not self.board.power):
+            self.board.log(skip_message + '. Board does '
+                           'not have power control', color='green', bold=True)
+            return False
+
+        if task_name in self.skip_tasks:
+            self.board.log(skip_message, color='green', bold=True)
+            return False
+
+        return True
+
+    def _run_tasks_concurrently(self):
+        '''Run the tasks of all tests with a TaskScheduler.
+
+        Tasks are added in the order they run in sequential or parallel
+        mode. Each task runs after the previous task of its test, and after
+        the tasks it declares in "task_dependencies". Tasks sharing an
+        exclusive resource, such as the board console, keep their order.
+        '''
+        scheduler = TaskScheduler(self.max_workers)
+        runnable = {task_name: self._task_runnable(task_name) for task_name in self.tasks}
+        last_test_tasks = {}
+        scheduled = []
+
+        def add_task(task_name, test, progress=None, needed_by=None):
+            if not runnable[task_name] or not hasattr(test, task_name):
+                return
+
+            def run():
+                with Logger().context(self.board.name):
+                    # TestCore tasks needed depend on the board state when run
+                    if needed_by and not self._testcore_task_needed(task_name, *needed_by):
+                        return
+                    if progress is not None:
+                        self.progress = progress
+                    self._run_task(task_name, str(test))
+
+            dependencies = [task for name, task in scheduled
+                            if name in test.task_dependencies.get(task_name, [])]
+            if str(test) in last_test_tasks:
+                dependencies.append(last_test_tasks[str(test)])
+
+            resources = test.task_resources.get(task_name)
+            if resources is None:
+                resources = DEFAULT_TASK_RESOURCES.get(task_name, DEFAULT_RESOURCES)
+
+            task = scheduler.add(f'{test} - {task_name}', run, resources, dependencies)
+            last_test_tasks[str(test)] = task
+            scheduled.append((task_name, task))
+
+        if self.sequential:
+            testcore = self._get_test_by_name('TestCore')
+            tests = [test for test in self.tests if str(test) != "TestCore"]
+            for index, test in enumerate(tests):
+                next_test = tests[index + 1] if index + 1 < len(tests) else None
+                for task_name in self.tasks:
+                    if testcore and self.use_testcore:
+                        add_task(task_name, testcore, needed_by=(test, next_test))
+                    add_task(task_name, test, progress=index / len(self.tests))
+        else:
+            for task_name in self.tasks:
+                for test in self.tests:
+                    add_task(task_name, test)
+
+        try:
+            scheduler.run()
         except AbortTesting:
             self.board.log("\n== TESTING ABORTED EARLY ==",
                            color='red', bold=True)
@@ -282,6 +389,12 @@ class TestRunner():
         except Exception as e:
             self.data[str(test)]['tasks']['failed'].append(task_name)
 
+            # The board state is unknown after a failed transition. Test
+            # tasks failing do not change the state, and the board must
+            # still be unmounted before being powered off.
+            if isinstance(test, TestCore):
+                test.board_state = None
+
             if print_test:
                 self.board.log('FAIL', color='red',
                                level=LogLevel.IMPORTANT, bypass_hold=True)
@@ -304,6 +417,7 @@ class TestRunner():
         finally:
             if print_test:
                 self.board.release_log()
+            self.board.flush_log()
 
     def _handle_failed_task(self, test, task_name, exception, abort=True):
         failed = {
@@ -324,7 +438,7 @@ class TestRunner():
 
         self.board.log(f'Task failed: {error}', level=LogLevel.ERROR,
                        bold=True, color='red')
-        self.board.log(f'Details: {failed}', color='yellow')
+        self.board.log('Details: %s', args=(failed,), color='yellow')
 
         if abort:
             raise AbortTesting(str(exception))
@@ -1,10 +1,17 @@
-from .exceptions import *
-from .email import Email, send_exception_email
-from .git import reset_repos, get_latest_tag, get_tag_list, \
-    version_is_valid, filter_versions, compile_version_list
-from .helpers import run_host_cmd, format_json_tinydb, \
-    timestamp_to_datetime, datetime_to_timestamp, regex_filter_list
-from .interactive import getch, seech
-from .asynchronous import AsyncSampler
-from .graphing import boot_graph
+from .lazyimport import lazy_import, lazy_attributes
+
+lazy_import(__name__, {
+    **lazy_attributes('.exceptions', 'GitError', 'GitInvalidVersionSpecifierError',
+                      'GitCommandFailedError', 'EmailError', 'EmailInvalidSettingsError'),
+    **lazy_attributes('.email', 'Email', 'send_exception_email'),
+    **lazy_attributes('.git', 'reset_repos', 'get_latest_tag', 'get_tag_list',
+                      'version_is_valid', 'filter_versions', 'compile_version_list'),
+    **lazy_attributes('.helpers', 'run_host_cmd', 'format_json_tinydb',
+                      'timestamp_to_datetime', 'datetime_to_timestamp', 'regex_filter_list',
+                      'package_version'),
+    **lazy_attributes('.interactive', 'getch', 'seech'),
+    **lazy_attributes('.asynchronous', 'AsyncSampler'),
+    **lazy_attributes('.graphing', 'boot_graph'),
+})
+
 name = "utils"
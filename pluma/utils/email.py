@@ -435,6 +435,7 @@ def send_exception_email(exception, recipients=None, board=None,
         email.body += '<br>'.join(board.show_hier().split('\n'))
         email.body += '<hr><br>'
 
+        board.flush_log()
         email.files.append(board.log_file)
         if board.console and board.console.log_file:
             email.files.append(board.console.log_file)
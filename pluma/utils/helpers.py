@@ -3,6 +3,12 @@ import json
 import re
 from datetime import datetime
 
+try:
+    from importlib import metadata
+except ImportError:
+    # importlib.metadata backport for 3.6 and 3.7
+    import importlib_metadata as metadata
+
 
 def run_host_cmd(command, stdin=None, *args, **kwargs):
     ''' Wrapper for subprocess.Popen
@@ -66,3 +72,15 @@ def regex_filter_list(patterns, items, unique=None):
     if unique:
         gen = set(gen)
     return sorted(gen)
+
+
+def package_version(package: str) -> str:
+    '''Return the version of the installed distribution providing @package'''
+    top_level_package = package.split('.')[0]
+    for distribution in metadata.distributions():
+        top_level = distribution.read_text('top_level.txt') or ''
+        if (top_level_package in top_level.split() or
+                distribution.metadata['Name'] == top_level_package):
+            return distribution.version
+
+    raise metadata.PackageNotFoundError(top_level_package)
@@ -0,0 +1,38 @@
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    '''Module importing some of its attributes only when first accessed'''
+
+    def __getattr__(self, name):
+        lazy_attributes = self.__dict__.get('_lazy_attributes', {})
+        if name not in lazy_attributes:
+            raise AttributeError(f'module {self.__name__!r} has no attribute {name!r}')
+
+        module = importlib.import_module(lazy_attributes[name], self.__package__)
+        value = getattr(module, name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.__dict__.get('_lazy_attributes', {})))
+
+
+def lazy_import(module_name: str, attributes: dict):
+    '''Import the @attributes of module @module_name when first accessed.
+
+    @attributes maps each attribute name to the name of the module defining
+    it, which can be relative to the package of @module_name. This avoids
+    importing heavy dependencies, such as hardware drivers, until used.
+    '''
+    module = sys.modules[module_name]
+    module.__class__ = LazyModule
+    module._lazy_attributes = dict(attributes)
+    module.__all__ = list(getattr(module, '__all__', [])) + list(attributes)
+
+
+def lazy_attributes(module_name: str, *attributes: str) -> dict:
+    '''Return a lazy_import mapping of @attributes to module @module_name'''
+    return {attribute: module_name for attribute in attributes}
@@ -43,7 +43,6 @@ with open(readme_file, 'r') as fh:
 
 requires = [
     'pyserial',
-    'setuptools',
     'pyudev',
     'pexpect>=4.6',
     'pyftdi',
@@ -64,6 +63,10 @@ requires = [
 if sys.version_info[:2] == (3, 6):
     requires.append('dataclasses')
 
+# importlib.metadata backport for 3.6 and 3.7
+if sys.version_info[:2] < (3, 8):
+    requires.append('importlib_metadata')
+
 setuptools.setup(
     name='pluma-automation',
     version=get_version(),
@@ -0,0 +1,86 @@
+import pytest
+
+from pluma.cli import ConfigCache, PlumaConfig, ConfigurationError
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return ConfigCache(str(tmpdir.join('cache')))
+
+
+@pytest.fixture
+def config_cache(cache, monkeypatch):
+    monkeypatch.setattr(PlumaConfig, 'cache', cache)
+    return cache
+
+
+def test_ConfigCache_key_should_change_with_content():
+    assert ConfigCache.key('a: 1', 'Loader') == ConfigCache.key('a: 1', 'Loader')
+    assert ConfigCache.key('a: 1', 'Loader') != ConfigCache.key('a: 2', 'Loader')
+    assert ConfigCache.key('a: 1', 'Loader') != ConfigCache.key('a: 1', 'Other')
+
+
+def test_ConfigCache_get_should_return_none_if_missing(cache):
+    assert cache.get(ConfigCache.key('a: 1', 'Loader')) is None
+
+
+def test_ConfigCache_get_should_return_copy(cache):
+    data = {'a': [1, 2]}
+    cache.put('key', data)
+
+    cached = cache.get('key')
+    cached['a'].append(3)
+
+    assert cached is not data
+    assert cache.get('key') == {'a': [1, 2]}
+
+
+def test_ConfigCache_should_reuse_disk_entries(cache):
+    cache.put('key', {'a': 1})
+
+    assert ConfigCache(cache.cache_dir).get('key') == {'a': 1}
+
+
+def test_ConfigCache_should_ignore_invalid_entries(cache, tmpdir):
+    cache.put('key', {'a': 1})
+    with open(cache._path('key'), 'wb') as cache_file:
+        cache_file.write(b'invalid')
+
+    assert ConfigCache(cache.cache_dir).get('key') is None
+
+
+def test_ConfigCache_clear_should_remove_entries(cache):
+    cache.put('key', {'a': 1})
+
+    cache.clear()
+
+    assert cache.get('key') is None
+    assert ConfigCache(cache.cache_dir).get('key') is None
+
+
+def test_PlumaConfig_load_yaml_should_use_cache(config_cache, tmpdir):
+    config_file = tmpdir.join('config.yml')
+    config_file.write('a: [1, 2]')
+
+    assert PlumaConfig.load_yaml('Config', str(config_file)) == {'a': [1, 2]}
+    assert len(config_cache._memory) == 1
+    assert PlumaConfig.load_yaml('Config', str(config_file)) == {'a': [1, 2]}
+    assert len(config_cache._memory) == 1
+
+
+def test_PlumaConfig_load_yaml_should_parse_changed_file(config_cache, tmpdir):
+    config_file = tmpdir.join('config.yml')
+    config_file.write('a: 1')
+    PlumaConfig.load_yaml('Config', str(config_file))
+
+    config_file.write('a: 2')
+
+    assert PlumaConfig.load_yaml('Config', str(config_file)) == {'a': 2}
+
+
+def test_PlumaConfig_load_yaml_should_error_on_invalid_yaml(config_cache, tmpdir):
+    config_file = tmpdir.join('config.yml')
+    config_file.write('a: [1, 2')
+
+    with pytest.raises(ConfigurationError):
+        PlumaConfig.load_yaml('Config', str(config_file))
@@ -20,3 +20,22 @@ def test_PlumaConfigPreprocessor_should_error_on_missing_variable():
 
     with pytest.raises(Exception):
         preprocessor.preprocess('content: ${abc},\n${def}: ${abc}')
+
+
+def test_PlumaConfigPreprocessor_should_report_all_missing_variables():
+    preprocessor = PlumaConfigPreprocessor({'abc': 'abcvalue'})
+
+    with pytest.raises(Exception) as e:
+        preprocessor.preprocess('${def}: ${abc} ${ghi} ${def}')
+
+    assert "['def', 'ghi']" in str(e.value)
+
+
+def test_PlumaConfigPreprocessor_should_not_replace_in_values():
+    preprocessor = PlumaConfigPreprocessor({'abc': '${def}', 'def': 'defvalue'})
+    assert preprocessor.preprocess('${abc} ${def}') == '${def} defvalue'
+
+
+def test_PlumaConfigPreprocessor_should_convert_values_to_string():
+    preprocessor = PlumaConfigPreprocessor({'abc': 3})
+    assert preprocessor.preprocess('content: ${abc}') == 'content: 3'
@@ -0,0 +1,167 @@
+import os
+import sys
+
+import pytest
+
+from pluma.cli import PluginIndex, PythonTestsProvider
+from pluma.test import TestBase
+
+
+@pytest.fixture
+def plugin_dir(tmpdir):
+    plugins = tmpdir.mkdir('plugins')
+    package = plugins.mkdir('mypackage')
+    package.join('__init__.py').write('')
+    package.join('base.py').write(
+        'from pluma.test import TestBase\n'
+        'class MyTestBase(TestBase):\n'
+        '    pass\n'
+        'class NotATest:\n'
+        '    pass\n')
+    package.join('mytests.py').write(
+        'from .base import MyTestBase\n'
+        'import pluma.test as pt\n'
+        'class First(MyTestBase):\n'
+        '    pass\n'
+        'class Second(pt.ShellTest):\n'
+        '    pass\n')
+    plugins.join('toplevel.py').write(
+        'from pluma.test import TestBase as Base\n'
+        'raise RuntimeError("Module should not be imported")\n'
+        'class Third(Base):\n'
+        '    pass\n')
+    plugins.mkdir('notapackage').join('other.py').write(
+        'from pluma.test import TestBase\n'
+        'class Ignored(TestBase):\n'
+        '    pass\n')
+    return plugins
+
+
+@pytest.fixture
+def index(tmpdir, plugin_dir):
+    index = PluginIndex(str(tmpdir.join('index.json')))
+    index.add_root(str(plugin_dir))
+    return index
+
+
+def test_PluginIndex_classes_should_find_classes_and_bases(index):
+    classes = index.classes()
+
+    assert list(classes) == ['mypackage', 'mypackage.base', 'mypackage.mytests', 'toplevel']
+    assert classes['mypackage.base'] == {'MyTestBase': ['pluma.test.TestBase'],
+                                         'NotATest': []}
+    assert classes['mypackage.mytests'] == {'First': ['mypackage.base.MyTestBase'],
+                                            'Second': ['pluma.test.ShellTest']}
+    assert classes['toplevel'] == {'Third': ['pluma.test.TestBase']}
+
+
+def test_PluginIndex_test_classes_should_not_import_modules(index):
+    assert index.test_classes(TestBase) == {
+        'mypackage.base.MyTestBase': 'mypackage.base.MyTestBase',
+        'mypackage.mytests.First': 'mypackage.mytests.First',
+        'mypackage.mytests.Second': 'mypackage.mytests.Second',
+        'toplevel.Third': 'toplevel.Third'}
+    assert 'toplevel' not in sys.modules
+
+
+def test_PluginIndex_test_classes_should_be_relative_to_root_package(tmpdir, plugin_dir):
+    index = PluginIndex()
+    index.add_root(str(plugin_dir), 'root')
+
+    assert 'toplevel.Third' in index.test_classes(TestBase)
+    assert index.test_classes(TestBase)['toplevel.Third'] == 'root.toplevel.Third'
+
+
+def test_PluginIndex_should_not_parse_unchanged_modules(index, tmpdir, plugin_dir, monkeypatch):
+    index.classes()
+
+    new_index = PluginIndex(index.index_path)
+    new_index.add_root(str(plugin_dir))
+
+    def parse_classes(*args):
+        pytest.fail('Module parsed')
+
+    monkeypatch.setattr(PluginIndex, '_parse_classes', staticmethod(parse_classes))
+    assert new_index.classes() == index.classes()
+
+
+def test_PluginIndex_should_parse_changed_modules(index, plugin_dir):
+    index.classes()
+
+    toplevel = plugin_dir.join('toplevel.py')
+    toplevel.write('class Fourth:\n    pass\n')
+    os.utime(str(toplevel), ns=(0, 0))
+
+    assert index.classes()['toplevel'] == {'Fourth': []}
+
+
+def test_PluginIndex_should_forget_deleted_modules(index, plugin_dir):
+    index.classes()
+
+    plugin_dir.join('toplevel.py').remove()
+
+    assert 'toplevel' not in index.classes()
+    assert not any(path.endswith('toplevel.py') for path in index._files)
+
+
+def test_PluginIndex_should_ignore_invalid_modules(index, plugin_dir):
+    plugin_dir.join('invalid.py').write('class Invalid(\n')
+
+    assert 'invalid' in index.classes()
+    assert index.classes()['invalid'] == {}
+
+
+def test_PythonTestsProvider_should_import_selected_tests_only(tmpdir, plugin_dir):
+    sys.path.insert(0, str(plugin_dir))
+    try:
+        index = PluginIndex()
+        index.add_root(str(plugin_dir))
+        tests = PythonTestsProvider(index).find_python_tests()
+
+        assert [test.name for test in tests] == [
+            'mypackage.base.MyTestBase', 'mypackage.mytests.First',
+            'mypackage.mytests.Second', 'toplevel.Third']
+        assert 'mypackage.mytests' not in sys.modules
+
+        first = tests[1].testclass
+        assert first.__name__ == 'First'
+        assert issubclass(first, TestBase)
+        assert 'toplevel' not in sys.modules
+    finally:
+        sys.path.remove(str(plugin_dir))
+        for module in ['mypackage', 'mypackage.base', 'mypackage.mytests']:
+            sys.modules.pop(module, None)
+
+
+def test_PluginIndex_test_classes_should_find_bases_imported_in_try(tmpdir):
+    plugins = tmpdir.mkdir('plugins')
+    plugins.join('trytests.py').write(
+        'try:\n'
+        '    from pluma.test import TestBase\n'
+        'except ImportError:\n'
+        '    TestBase = object\n'
+        'class InTry(TestBase):\n'
+        '    pass\n')
+    index = PluginIndex()
+    index.add_root(str(plugins))
+
+    assert index.classes()['trytests'] == {'InTry': ['pluma.test.TestBase']}
+    assert index.test_classes(TestBase) == {'trytests.InTry': 'trytests.InTry'}
+
+
+def test_PluginIndex_test_classes_should_import_classes_with_unknown_bases(tmpdir,
+                                                                           monkeypatch):
+    plugins = tmpdir.mkdir('plugins')
+    plugins.join('startests.py').write(
+        'from pluma.test import *\n'
+        'class Star(TestBase):\n'
+        '    pass\n'
+        'class NotATest(object):\n'
+        '    pass\n')
+    monkeypatch.syspath_prepend(str(plugins))
+    index = PluginIndex()
+    index.add_root(str(plugins))
+
+    assert index.classes()['startests'] == {'Star': [None], 'NotATest': ['builtins.object']}
+    assert index.test_classes(TestBase) == {'startests.Star': 'startests.Star'}
+    sys.modules.pop('startests', None)
@@ -153,3 +153,42 @@ def test_TargetFactory_parse_variables_should_allow_variables_access():
                                                                               var2: var2_value}))
     assert variables.get(var1) == var1_value
     assert variables.get(var2) == var2_value
+
+
+def test_TargetConfig_create_context_should_create_single_board(target_config):
+    context = TargetConfig.create_context(Configuration(target_config))
+
+    assert context.boards == [context.board]
+    assert context.board.name == 'Test board'
+
+
+def test_TargetConfig_create_context_should_create_boards(serial_config):
+    config = {
+        'system': {'credentials': {'login': 'user'}},
+        'boards': [
+            {'name': 'first', 'console': {'serial': dict(serial_config)}},
+            {'console': {'serial': {**serial_config, 'port': 'def'}},
+             'system': {'credentials': {'login': 'other'}}}
+        ]
+    }
+
+    context = TargetConfig.create_context(Configuration(config))
+
+    assert [board.name for board in context.boards] == ['first', 'Test board 2']
+    assert context.board is context.boards[0]
+    assert context.boards[0].get_console('serial').port == 'abc'
+    assert context.boards[1].get_console('serial').port == 'def'
+    assert context.boards[0].system.credentials.login == 'user'
+    assert context.boards[1].system.credentials.login == 'other'
+
+
+@pytest.mark.parametrize('boards', [[], {'name': 'abc'}, ['abc'],
+                                    [{'name': 'abc'}, {'name': 'abc'}]])
+def test_TargetConfig_create_context_should_error_on_invalid_boards(boards):
+    with pytest.raises(TargetConfigError):
+        TargetConfig.create_context(Configuration({'boards': boards}))
+
+
+def test_TargetConfig_create_context_should_error_on_unconsumed_board_attribute():
+    with pytest.raises(TargetConfigError):
+        TargetConfig.create_context(Configuration({'boards': [{'abc': 'value'}]}))
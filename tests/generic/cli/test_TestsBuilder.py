@@ -0,0 +1,186 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from pluma.cli import TestsBuilder, TestsBuildError, CTestsProvider, Configuration, \
+    TestsConfigError
+from pluma.cli import testsbuilder
+
+pytestmark = pytest.mark.skipif(not shutil.which('gcc'), reason='gcc is required')
+
+
+@pytest.fixture
+def project(tmpdir):
+    tmpdir.join('environment-test').write('export CC="gcc"\nexport MY_FLAG=-DVALUE=3\n')
+    tmpdir.join('value.h').write('#define OTHER 1\n')
+    tmpdir.join('main.c').write(
+        '#include "value.h"\nint main(void) { return VALUE + OTHER; }\n')
+    return tmpdir
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    '''Return the list of compiler commands run'''
+    commands = []
+    check_output = subprocess.check_output
+
+    def counting_check_output(command, *args, **kwargs):
+        if '$CC' in command:
+            commands.append(command)
+        return check_output(command, *args, **kwargs)
+
+    monkeypatch.setattr(testsbuilder.subprocess, 'check_output', counting_check_output)
+    return commands
+
+
+def build(project, flags='$MY_FLAG'):
+    return TestsBuilder.build_c_test(
+        'mytest', env_file=str(project.join('environment-test')),
+        sources=[str(project.join('main.c'))], flags=flags,
+        install_dir=str(project.join('build')))
+
+
+def test_TestsBuilder_source_environment_should_return_variables(project):
+    environment = TestsBuilder.source_environment(str(project.join('environment-test')))
+
+    assert environment['CC'] == 'gcc'
+    assert environment['MY_FLAG'] == '-DVALUE=3'
+
+
+def test_TestsBuilder_source_environment_should_error_on_invalid_file(project):
+    project.join('environment-test').write('exit 1\n')
+
+    with pytest.raises(TestsBuildError):
+        TestsBuilder.source_environment(str(project.join('environment-test')))
+
+
+def test_TestsBuilder_build_c_test_should_build_with_environment(project, builds):
+    executable = build(project)
+
+    assert len(builds) == 1
+    assert subprocess.run([executable]).returncode == 4
+
+
+def test_TestsBuilder_build_c_test_should_not_rebuild_unchanged(project, builds):
+    build(project)
+    build(project)
+
+    assert len(builds) == 1
+
+
+def test_TestsBuilder_build_c_test_should_rebuild_on_header_change(project, builds):
+    build(project)
+    project.join('value.h').write('#define OTHER 2\n')
+
+    executable = build(project)
+
+    assert len(builds) == 2
+    assert subprocess.run([executable]).returncode == 5
+
+
+def test_TestsBuilder_build_c_test_should_rebuild_on_flags_change(project, builds):
+    build(project)
+    executable = build(project, flags='-DVALUE=1')
+
+    assert len(builds) == 2
+    assert subprocess.run([executable]).returncode == 2
+
+
+def test_TestsBuilder_build_c_test_should_rebuild_missing_executable(project, builds):
+    executable = build(project)
+    project.join('build', 'mytest').remove()
+
+    assert build(project) == executable
+    assert len(builds) == 2
+
+
+def test_TestsBuilder_build_c_test_should_error_on_build_failure(project):
+    project.join('main.c').write('invalid')
+
+    with pytest.raises(TestsBuildError):
+        build(project)
+
+
+def test_CTestsProvider_should_build_all_tests(project, builds, monkeypatch):
+    monkeypatch.setattr(TestsBuilder, 'DEFAULT_EXEC_INSTALL_DIR', str(project.join('build')))
+    config = Configuration({
+        'source_environment': str(project.join('environment-test')),
+        'tests': {
+            'first': {'sources': [str(project.join('main.c'))], 'flags': '-DVALUE=1'},
+            'second': {'sources': [str(project.join('main.c'))], 'flags': '-DVALUE=2'}}})
+
+    tests = CTestsProvider().all_tests('c_tests', config)
+
+    assert [test.name for test in tests] == ['first', 'second']
+    assert len(builds) == 2
+    assert subprocess.run([tests[1].parameter_sets[0]['executable_file']]).returncode == 3
+
+
+def test_CTestsProvider_should_error_on_build_failure(project, monkeypatch):
+    monkeypatch.setattr(TestsBuilder, 'DEFAULT_EXEC_INSTALL_DIR', str(project.join('build')))
+    config = Configuration({
+        'source_environment': str(project.join('environment-test')),
+        'tests': {'first': {'sources': [str(project.join('missing.c'))]}}})
+
+    with pytest.raises(TestsConfigError):
+        CTestsProvider().all_tests('c_tests', config)
+
+
+@pytest.fixture
+def yocto_sdk(tmpdir):
+    '''Fake Yocto SDK installer, counting its installs'''
+    installer = tmpdir.join('sdk.sh')
+    installer.write('#!/bin/sh\n'
+                    f'echo install >> {tmpdir.join("installs")}\n'
+                    'mkdir -p "$3"\n'
+                    'echo "export CC=gcc" > "$3/environment-setup-test"\n')
+    installer.chmod(0o755)
+    return installer
+
+
+def installs(tmpdir):
+    return len(tmpdir.join('installs').readlines()) if tmpdir.join('installs').exists() else 0
+
+
+def test_TestsBuilder_install_yocto_sdk_should_install_once(tmpdir, yocto_sdk):
+    toolchains = str(tmpdir.join('toolchains'))
+
+    install_dir = TestsBuilder.install_yocto_sdk(str(yocto_sdk), toolchains)
+
+    assert TestsBuilder.install_yocto_sdk(str(yocto_sdk), toolchains) == install_dir
+    assert installs(tmpdir) == 1
+    assert TestsBuilder.find_yocto_sdk_env_file(install_dir) == \
+        os.path.join(install_dir, 'environment-setup-test')
+
+
+def test_TestsBuilder_install_yocto_sdk_should_reinstall_if_not_intact(tmpdir, yocto_sdk):
+    toolchains = str(tmpdir.join('toolchains'))
+    install_dir = TestsBuilder.install_yocto_sdk(str(yocto_sdk), toolchains)
+
+    shutil.rmtree(install_dir)
+
+    assert TestsBuilder.install_yocto_sdk(str(yocto_sdk), toolchains) == install_dir
+    assert installs(tmpdir) == 2
+    assert os.path.isfile(TestsBuilder.find_yocto_sdk_env_file(install_dir))
+
+
+def test_TestsBuilder_install_yocto_sdk_should_install_changed_sdk(tmpdir, yocto_sdk):
+    toolchains = str(tmpdir.join('toolchains'))
+    install_dir = TestsBuilder.install_yocto_sdk(str(yocto_sdk), toolchains)
+
+    yocto_sdk.write(yocto_sdk.read() + '# new version\n')
+
+    assert TestsBuilder.install_yocto_sdk(str(yocto_sdk), toolchains) != install_dir
+    assert installs(tmpdir) == 2
+
+
+def test_TestsBuilder_install_yocto_sdk_should_not_record_failed_install(tmpdir, yocto_sdk):
+    toolchains = str(tmpdir.join('toolchains'))
+    yocto_sdk.write('#!/bin/sh\nmkdir -p "$3"\nexit 1\n')
+
+    with pytest.raises(TestsBuildError):
+        TestsBuilder.install_yocto_sdk(str(yocto_sdk), toolchains)
+
+    assert os.listdir(toolchains) == ['.lock']
@@ -3,7 +3,9 @@ import pytest
 from pytest import fixture
 from unittest.mock import MagicMock
 
+from pluma import Board
 from pluma.cli import TestsConfig, Configuration, TestsProvider, TestsConfigError
+from pluma.test import BoardPoolController
 
 MINIMAL_CONFIG = {
     'sequence': []
@@ -102,3 +104,101 @@ def test_TestsConfig_tests_from_action_should_return_all_tests():
 def test_TestsConfig_tests_from_action_should_error_if_action_unsupported():
     with pytest.raises(TestsConfigError):
         TestsConfig.tests_from_action('abc', {'some': 'settings'}, {'def': MockTestsProvider})
+
+
+def test_TestsConfig_create_test_controller_should_return_controller_for_one_board(mock_board):
+    config = TestsConfig(Configuration({'sequence': [], 'settings': {'iterations': 2}}),
+                         [MockTestsProvider()])
+
+    controller = config.create_test_controller(mock_board)
+
+    assert not isinstance(controller, BoardPoolController)
+    assert controller.testrunner.board is mock_board
+    assert controller.run_condition
+
+
+def test_TestsConfig_create_test_controller_should_return_pool_for_boards():
+    boards = [MagicMock(Board), MagicMock(Board)]
+    config = TestsConfig(Configuration({'sequence': [], 'settings': {'iterations': 2}}),
+                         [MockTestsProvider()])
+
+    controller = config.create_test_controller(boards)
+
+    assert isinstance(controller, BoardPoolController)
+    assert [c.testrunner.board for c in controller.controllers] == boards
+    assert controller.share_iterations is True
+    assert controller.run_condition
+
+
+def test_TestsConfig_create_test_controller_should_not_share_iterations_if_disabled():
+    boards = [MagicMock(Board), MagicMock(Board)]
+    config = TestsConfig(
+        Configuration({'sequence': [],
+                       'settings': {'iterations': 2, 'share_iterations': False}}),
+        [MockTestsProvider()])
+
+    controller = config.create_test_controller(boards)
+
+    assert controller.share_iterations is False
+    assert controller.run_condition is None
+    assert all(c.run_condition for c in controller.controllers)
+
+
+def test_TestsConfig_create_test_controller_should_set_checkpoint(mock_board, tmp_path):
+    checkpoint_file = str(tmp_path / 'checkpoint.json')
+    settings = {'iterations': 2, 'results_file': str(tmp_path / 'results.jsonl'),
+                'checkpoint_file': checkpoint_file, 'checkpoint_interval': 5}
+    config = TestsConfig(Configuration({'sequence': [], 'settings': settings}),
+                         [MockTestsProvider()])
+
+    controller = config.create_test_controller(mock_board)
+
+    assert controller.checkpoint_file == checkpoint_file
+    assert controller.settings['checkpoint_n_iterations'] == 5
+
+
+def test_TestsConfig_create_test_controller_should_error_on_checkpoint_without_results_file(
+        mock_board, tmp_path):
+    settings = {'iterations': 2, 'checkpoint_file': str(tmp_path / 'checkpoint.json')}
+    config = TestsConfig(Configuration({'sequence': [], 'settings': settings}),
+                         [MockTestsProvider()])
+
+    with pytest.raises(TestsConfigError):
+        config.create_test_controller(mock_board)
+
+
+def test_TestsConfig_create_test_controller_should_stop_when_converged(mock_board):
+    settings = {'iterations': 100,
+                'stop_when_converged': {'fields': 'boot_time', 'relative_width': 0.1}}
+    config = TestsConfig(Configuration({'sequence': [], 'settings': settings}),
+                         [MockTestsProvider()])
+
+    controller = config.create_test_controller(mock_board)
+
+    assert controller.run_condition.f.__name__ == 'sc_run_until_converged'
+    assert controller.run_condition.kwargs['max_iterations'] == 100
+    assert controller.run_condition.kwargs['fields'] == ['boot_time']
+    assert controller.run_condition.kwargs['relative_width'] == 0.1
+
+
+def test_TestsConfig_create_test_controller_should_error_on_converged_without_statistics(
+        mock_board):
+    settings = {'iterations': 100, 'stop_when_converged': {'confidence': 0.9}}
+    config = TestsConfig(Configuration({'sequence': [], 'settings': settings}),
+                         [MockTestsProvider()])
+
+    with pytest.raises(TestsConfigError):
+        config.create_test_controller(mock_board)
+
+
+def test_TestsConfig_create_test_controller_should_set_soak_mode(mock_board):
+    settings = {'iterations': 2, 'soak_window': 10, 'soak_sample_size': 50}
+    config = TestsConfig(Configuration({'sequence': [], 'settings': settings}),
+                         [MockTestsProvider()])
+
+    controller = config.create_test_controller(mock_board)
+
+    assert controller.results.sampled
+    assert controller.results.window_size == 10
+    assert controller.results.sample_size == 50
+    assert controller.results_processor.window_size == 10
@@ -1,6 +1,9 @@
 import os
+import subprocess
+import sys
 import pytest
 
+import pluma
 from pluma.cli.plugins import load_plugin_modules
 
 
@@ -35,3 +38,31 @@ def test_cli_should_error_on_missing_target_config(pluma_cli):
 def test_cli_should_find_test_from_plugins_dir(pluma_cli):
     pluma_cli(['--config', TEST_YAML, '--target', TARGET_YAML, '--plugin', PLUGIN_DIR])
 
+
+STARTUP_HEAVY_MODULES = ['pandas', 'pygal', 'pyftdi', 'pyudev', 'pyroute2', 'requests',
+                         'graphviz', 'serial', 'nanocom', 'yaml']
+
+""" Maximum time to import the command line interface, in seconds """
+STARTUP_MAX_TIME = 1.0
+
+
+def run_python(code: str) -> str:
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(pluma.__file__)))
+    return subprocess.check_output([sys.executable, '-c', code], cwd=package_dir).decode()
+
+
+def test_cli_startup_should_not_import_drivers():
+    imported = run_python(
+        'import sys, pluma.__main__; '
+        f'print(",".join(m for m in {STARTUP_HEAVY_MODULES} if m in sys.modules))')
+
+    assert imported.strip() == ''
+
+
+def test_cli_startup_time():
+    # Best of several runs, to limit the noise of a busy host
+    startup_time = min(float(run_python(
+        'import time; start = time.perf_counter(); import pluma.__main__; '
+        'print(time.perf_counter() - start)')) for _ in range(3))
+
+    assert startup_time < STARTUP_MAX_TIME
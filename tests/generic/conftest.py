@@ -21,6 +21,20 @@ from pluma.core.mocks import ConsoleMock
 from pluma import __main__
 
 
+@fixture(autouse=True)
+def pluma_cache_dir(tmp_path_factory, monkeypatch):
+    '''Keep the configuration cache and plugin index out of the user cache'''
+    from pluma.cli.config import PlumaConfig
+    from pluma.cli.plugins import plugin_index
+
+    cache_dir = tmp_path_factory.mktemp('cache')
+    # For pluma processes started by tests
+    monkeypatch.setenv('XDG_CACHE_HOME', str(cache_dir))
+    monkeypatch.setattr(PlumaConfig.cache, 'cache_dir', str(cache_dir / 'pluma' / 'config'))
+    monkeypatch.setattr(plugin_index, 'index_path', str(cache_dir / 'pluma' / 'plugins.json'))
+    return cache_dir
+
+
 @fixture
 def soft_power():
     mock_console = MagicMock(ConsoleMock())
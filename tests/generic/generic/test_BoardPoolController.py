@@ -0,0 +1,124 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from pluma import Board
+from pluma.test import TestBase, TestRunner, TestController, BoardPoolController
+from pluma.test.stock.deffuncs import sc_run_n_iterations
+
+
+class SleepTest(TestBase):
+    def __init__(self, board, duration=0.05, fail_on=None):
+        super().__init__(board)
+        self.duration = duration
+        self.fail_on = fail_on
+
+    def test_body(self):
+        time.sleep(self.duration)
+        self.data['board'] = self.board.name
+        if self.board.name == self.fail_on:
+            raise Exception('Test failed')
+
+
+def create_board(name):
+    board = MagicMock(Board)
+    board.name = name
+    return board
+
+
+def create_controller(name, **kwargs):
+    board = create_board(name)
+    runner = TestRunner(board, tests=[SleepTest(board, **kwargs)], use_testcore=False,
+                        sequential=True, email_on_fail=False, continue_on_fail=True)
+    return TestController(runner, log_func=lambda message: None, email_on_except=False)
+
+
+def create_pool(boards=3, **kwargs):
+    return BoardPoolController([create_controller(f'board{i}') for i in range(boards)],
+                               email_on_except=False, log_func=lambda message: None,
+                               **kwargs)
+
+
+def test_BoardPoolController_should_share_iterations():
+    pool = create_pool(run_condition=sc_run_n_iterations(ntimes=7))
+
+    assert pool.run() is True
+
+    assert pool.stats['num_iterations_run'] == 7
+    assert pool.stats['num_iterations_pass'] == 7
+    assert pool.stats['num_tests_run'] == 7
+    assert len(pool.results) == 7
+    assert sorted(result['iteration'] for result in pool.results) == list(range(7))
+    assert {result['board'] for result in pool.results} == {'board0', 'board1', 'board2'}
+    assert all(not controller.results for controller in pool.controllers)
+
+
+def test_BoardPoolController_should_run_boards_concurrently():
+    pool = create_pool(boards=4, run_condition=sc_run_n_iterations(ntimes=8))
+
+    start = time.time()
+    pool.run()
+
+    # 8 iterations of 0.05s each, on 4 boards
+    assert time.time() - start < 8 * 0.05 * 0.75
+
+
+def test_BoardPoolController_should_run_once_per_board_without_run_condition():
+    pool = create_pool()
+
+    pool.run()
+
+    assert sorted(result['board'] for result in pool.results) == ['board0', 'board1', 'board2']
+
+
+def test_BoardPoolController_should_merge_independent_runs():
+    controllers = [create_controller(f'board{i}') for i in range(2)]
+    for controller in controllers:
+        controller.run_condition = sc_run_n_iterations(ntimes=3)
+    pool = BoardPoolController(controllers, share_iterations=False, email_on_except=False)
+
+    assert pool.run() is True
+
+    assert pool.stats['num_iterations_run'] == 6
+    assert [result['board'] for result in pool.results] == ['board0'] * 3 + ['board1'] * 3
+
+
+def test_BoardPoolController_should_merge_results_summary():
+    pool = create_pool(run_condition=sc_run_n_iterations(ntimes=4))
+
+    pool.run()
+
+    test_name = str(pool.testrunner.tests[0])
+    assert test_name in pool.results_summary
+    assert pool.test_settings == {test_name: {}}
+
+
+def test_BoardPoolController_should_report_failures():
+    controllers = [create_controller('board0'), create_controller('board1', fail_on='board1')]
+    pool = BoardPoolController(controllers, run_condition=sc_run_n_iterations(ntimes=4),
+                               email_on_except=False)
+
+    assert pool.run() is False
+    assert pool.stats['num_iterations_pass'] < 4
+
+
+def test_BoardPoolController_should_raise_board_exceptions():
+    controller = create_controller('board0')
+    controller.run_iteration = MagicMock(side_effect=RuntimeError('Failure'))
+    pool = BoardPoolController([controller, create_controller('board1')],
+                               email_on_except=False)
+
+    with pytest.raises(RuntimeError):
+        pool.run()
+
+
+def test_BoardPoolController_should_run_setup_and_report_once():
+    pool = create_pool(run_condition=sc_run_n_iterations(ntimes=5))
+    setup, report = MagicMock(), MagicMock()
+    pool.setup, pool.report = setup, report
+
+    pool.run()
+
+    setup.assert_called_once()
+    report.assert_called_once()
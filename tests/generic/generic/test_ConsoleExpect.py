@@ -0,0 +1,128 @@
+from pluma.core.baseclasses import ConsoleExpect
+
+
+def test_ConsoleExpect_search_returns_none_when_no_match():
+    engine = ConsoleExpect()
+
+    assert engine.search(b'Some text', ['NoMatch']) is None
+
+
+def test_ConsoleExpect_search_returns_match():
+    engine = ConsoleExpect()
+
+    match = engine.search(b'Some text 123Match and more', ['[0-3]+Match'])
+
+    assert match.index == 0
+    assert match.pattern == '[0-3]+Match'
+    assert match.text == '123Match'
+    assert (match.start, match.end) == (10, 18)
+
+
+def test_ConsoleExpect_search_returns_first_match_in_text():
+    engine = ConsoleExpect()
+
+    match = engine.search(b'abc login: def Password:', ['Password:', 'login:'])
+
+    assert match.index == 1
+    assert match.text == 'login:'
+
+
+def test_ConsoleExpect_search_returns_first_pattern_on_same_position():
+    engine = ConsoleExpect()
+
+    match = engine.search(b'abc login: def', ['log', 'login:'])
+
+    assert match.index == 0
+    assert match.text == 'log'
+
+
+def test_ConsoleExpect_search_matches_across_searches():
+    engine = ConsoleExpect()
+    patterns = ['login:', '[0-9]+ ms']
+
+    assert engine.search(b'Booting... log', patterns) is None
+    assert engine.search(b'Booting... login', patterns) is None
+
+    match = engine.search(b'Booting... login:', patterns)
+    assert match.text == 'login:'
+
+
+def test_ConsoleExpect_search_matches_unbounded_pattern_across_searches():
+    engine = ConsoleExpect()
+    patterns = ['{.*}']
+
+    assert engine.search(b'{"key": ', patterns) is None
+
+    match = engine.search(b'{"key": 1}', patterns)
+    assert match.text == '{"key": 1}'
+
+
+def test_ConsoleExpect_search_does_not_search_again_before_window():
+    engine = ConsoleExpect(search_window=10)
+    patterns = ['Start.*End']
+
+    assert engine.search(b'Start' + b'x'*20, patterns) is None
+    assert engine.search(b'Start' + b'x'*20 + b'End', patterns) is None
+
+
+def test_ConsoleExpect_search_finds_match_at_start_of_data_larger_than_window():
+    engine = ConsoleExpect(search_window=10)
+
+    match = engine.search(b'Kernel panic' + b'x'*40, ['Kernel panic'])
+    assert match.start == 0
+
+    match = ConsoleExpect().search(b'Kernel panic' + b'x'*40000, ['Kernel panic'])
+    assert match.text == 'Kernel panic'
+
+
+def test_ConsoleExpect_search_supports_back_references():
+    engine = ConsoleExpect()
+
+    match = engine.search(b'abc xyzxyz', ['(xyz)\\1', 'NoMatch'])
+
+    assert match.index == 0
+    assert match.text == 'xyzxyz'
+
+
+def test_ConsoleExpect_search_supports_groups():
+    engine = ConsoleExpect()
+
+    match = engine.search(b'abc (456)', ['(1|2)+', '\\(([4-6]+)\\)'])
+
+    assert match.index == 1
+    assert match.text == '(456)'
+
+
+def test_ConsoleExpect_compile_caches_patterns():
+    engine = ConsoleExpect()
+
+    assert engine.compile(['a', 'b']) is engine.compile(['a', 'b'])
+
+
+def test_ConsoleExpect_reset_searches_from_start():
+    engine = ConsoleExpect()
+    patterns = ['Match']
+
+    assert engine.search(b'xxxxxxxxxx', patterns) is None
+    engine.reset()
+
+    assert engine.search(b'Match', patterns).text == 'Match'
+
+
+def test_ConsoleExpect_search_encodes_patterns():
+    engine = ConsoleExpect(encoding='utf-8')
+
+    match = engine.search('Température: 20°C'.encode('utf-8'), ['[0-9]+°C'])
+
+    assert match.text == '20°C'
+    assert match.end == len('Température: 20°C'.encode('utf-8'))
+
+
+def test_ConsoleExpect_search_supports_memoryview():
+    engine = ConsoleExpect()
+    data = bytearray(b'abc login:')
+
+    with memoryview(data) as view:
+        match = engine.search(view, ['login:'])
+
+    assert match.text == 'login:'
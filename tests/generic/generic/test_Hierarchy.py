@@ -0,0 +1,54 @@
+import pytest
+
+from pluma.core.baseclasses import HardwareBase
+
+
+class Node(HardwareBase):
+    def __init__(self, *children):
+        self.children = list(children)
+        self.parent = None
+        self.value = 1
+        for child in children:
+            child.parent = self
+
+    @property
+    def expensive(self):
+        pytest.fail('Property evaluated')
+
+
+def test_Hierarchy_get_hier_does_not_evaluate_properties():
+    node = Node()
+
+    children, attrs = node._get_hier()
+
+    assert children == {}
+    assert attrs == {'children': [], 'parent': None, 'value': 1}
+
+
+def test_Hierarchy_get_hier_returns_children_in_containers():
+    child1, child2 = Node(), Node()
+    node = Node(child1)
+    node.consoles = {'main': child2}
+
+    children, __ = node._get_hier()
+
+    assert children == {'children[0]': child1, 'consoles[main]': child2}
+
+
+def test_Hierarchy_recurse_sets_log_settings_on_descendants(tmpdir):
+    grandchild = Node()
+    child = Node(grandchild)
+    node = Node(child)
+    node._recurse_hier = True
+
+    node.log_file = str(tmpdir.join('test.log'))
+
+    assert child._recurse_hier is True
+    assert child.log_file == node.log_file
+    assert grandchild.log_file == node.log_file
+
+
+def test_Hierarchy_show_hier_does_not_evaluate_properties():
+    node = Node(Node())
+
+    assert 'Node' in node.show_hier()
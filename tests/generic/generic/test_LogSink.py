@@ -0,0 +1,94 @@
+import os
+import time
+from unittest.mock import patch
+
+from pluma.core.baseclasses import LogSink
+from pluma.core.baseclasses.logsink import LOG_FLUSH_INTERVAL
+
+
+def read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_LogSink_is_shared():
+    assert LogSink() is LogSink()
+
+
+def test_LogSink_flush_writes_data(tmpdir):
+    path = os.path.join(str(tmpdir), 'logs', 'test.log')
+    sink = LogSink()
+
+    sink.write(path, 'abc\n')
+    sink.write(path, b'def\n')
+    sink.flush()
+
+    assert read_file(path) == b'abc\ndef\n'
+
+
+def test_LogSink_writes_data_periodically(tmpdir):
+    path = os.path.join(str(tmpdir), 'test.log')
+
+    LogSink().write(path, 'abc')
+    time.sleep(LOG_FLUSH_INTERVAL * 3)
+
+    assert read_file(path) == b'abc'
+
+
+def test_LogSink_truncate_discards_data(tmpdir):
+    path = os.path.join(str(tmpdir), 'test.log')
+    sink = LogSink()
+
+    sink.write(path, 'abc')
+    sink.flush()
+    sink.write(path, 'def')
+    sink.truncate(path)
+    sink.write(path, 'ghi')
+    sink.flush()
+
+    assert read_file(path) == b'ghi'
+
+
+def test_LogSink_open_returns_file_like_handle(tmpdir):
+    path = os.path.join(str(tmpdir), 'test.log')
+    sink = LogSink()
+
+    logfile = sink.open(path)
+    logfile.write(b'abc')
+    sink.flush()
+    assert read_file(path) == b'abc'
+
+    logfile.write(b'def')
+    logfile.close()
+    assert read_file(path) == b'abcdef'
+    assert path not in sink._files
+
+
+def test_LogSinkFile_flush_does_not_write_data(tmpdir):
+    path = os.path.join(str(tmpdir), 'test.log')
+    sink = LogSink()
+
+    logfile = sink.open(path)
+    logfile.write(b'abc')
+    with patch.object(sink, 'flush') as flush:
+        logfile.flush()
+    flush.assert_not_called()
+
+    logfile.close()
+    assert read_file(path) == b'abc'
+
+
+def test_LogSink_flush_skips_data_of_closed_files(tmpdir):
+    path = os.path.join(str(tmpdir), 'test.log')
+    other_path = os.path.join(str(tmpdir), 'other.log')
+    sink = LogSink()
+
+    sink.write(path, 'abc')
+    sink.write(other_path, 'def')
+    # As if closed after the data was queued
+    with sink._lock:
+        sink._files.pop(path).close()
+    sink.flush()
+
+    assert read_file(path) == b''
+    assert read_file(other_path) == b'def'
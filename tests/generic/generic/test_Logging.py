@@ -0,0 +1,139 @@
+import datetime
+import os
+import threading
+
+import pytest
+
+from pluma.core.baseclasses import LogSink, Logger, LogLevel, LogMessage, LogMode
+from pluma.core.baseclasses.logging import Logging
+
+
+class LoggingObject(Logging):
+    def __init__(self):
+        pass
+
+
+@pytest.fixture
+def logger():
+    logger = Logger()
+    mode = logger.mode
+    yield logger
+    logger.mode = mode
+
+
+def read_log(path):
+    LogSink().flush()
+    with open(path, 'r') as f:
+        return f.read()
+
+
+def test_LogMessage_formats_args():
+    assert str(LogMessage('%s: %d', args=('abc', 1))) == 'abc: 1'
+
+
+def test_LogMessage_calls_callable():
+    assert str(LogMessage(lambda: 'abc')) == 'abc'
+
+
+def test_LogMessage_adds_prefix_and_time():
+    time = datetime.datetime(2020, 1, 2, 3, 4, 5)
+    message = LogMessage('abc', prefix='Board', time=time, time_format='%H:%M:%S')
+
+    assert str(message) == '03:04:05 Board: abc'
+
+
+def test_LogMessage_formats_once():
+    calls = []
+    message = LogMessage(lambda: calls.append(1) or 'abc')
+
+    str(message)
+    str(message)
+
+    assert len(calls) == 1
+
+
+def test_Logger_log_does_not_format_disabled_levels(logger, capsys):
+    logger.mode = LogMode.QUIET
+
+    logger.log(lambda: pytest.fail('Message formatted'), level=LogLevel.DEBUG)
+
+    assert capsys.readouterr().out == ''
+
+
+def test_Logger_log_formats_args(logger, capsys):
+    logger.mode = LogMode.DEBUG
+
+    logger.debug('%s=%d', 'a', 1)
+
+    assert capsys.readouterr().out == 'a=1' + os.linesep
+
+
+def test_Logging_log_writes_args_to_log_file(tmpdir, logger):
+    obj = LoggingObject()
+    obj.log_file = os.path.join(str(tmpdir), 'test.log')
+    obj.log_echo = False
+
+    obj.log('<<%s>>', args=('abc',), level=LogLevel.DEBUG)
+
+    assert read_log(obj.log_file) == '<<abc>>\n'
+
+
+def test_Logging_log_does_not_format_without_output(logger, capsys):
+    logger.mode = LogMode.QUIET
+    obj = LoggingObject()
+    obj.log_file = None
+
+    obj.log(lambda: pytest.fail('Message formatted'), level=LogLevel.DEBUG)
+
+    assert capsys.readouterr().out == ''
+
+
+def test_Logger_hold_holds_current_context_only(logger, capsys):
+    logger.mode = LogMode.NORMAL
+
+    with logger.context('board1'):
+        logger.hold()
+        logger.info('board1 message')
+
+    with logger.context('board2'):
+        logger.info('board2 message')
+
+    assert capsys.readouterr().out == 'board2 message' + os.linesep
+
+    with logger.context('board1'):
+        logger.release()
+
+    assert 'board1 message' in capsys.readouterr().out
+
+
+def test_Logger_hold_is_per_thread(logger, capsys):
+    logger.mode = LogMode.NORMAL
+    logger.hold()
+
+    thread = threading.Thread(target=logger.info, args=('thread message',))
+    thread.start()
+    thread.join()
+
+    logger.info('held message')
+    assert capsys.readouterr().out == 'thread message' + os.linesep
+
+    logger.release()
+    assert 'held message' in capsys.readouterr().out
+
+
+def test_Logger_does_not_interleave_messages(logger, capsys):
+    logger.mode = LogMode.NORMAL
+    messages = [f'{"x" * 100}{i}' for i in range(10)]
+
+    def log_messages():
+        for message in messages:
+            logger.info(message)
+
+    threads = [threading.Thread(target=log_messages) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(lines) == sorted(messages * 4)
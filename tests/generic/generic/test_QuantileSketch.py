@@ -0,0 +1,70 @@
+import json
+import random
+
+import pytest
+
+from pluma.test.quantilesketch import QuantileSketch
+
+
+def exact_quantile(values, q):
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+@pytest.fixture
+def values():
+    random.seed(0)
+    return [random.lognormvariate(0, 1) for __ in range(20000)]
+
+
+def test_QuantileSketch_should_estimate_quantiles(values):
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+
+    for q in [0.5, 0.9, 0.95, 0.99]:
+        assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.05)
+    assert sketch.quantile(0) == min(values)
+    assert sketch.quantile(1) == max(values)
+
+
+def test_QuantileSketch_should_use_bounded_memory(values):
+    sketch = QuantileSketch(compression=50)
+    for value in values:
+        sketch.add(value)
+
+    assert sketch.count == len(values)
+    assert len(sketch) <= 2 * 50
+
+
+def test_QuantileSketch_merge_should_combine_sketches(values):
+    sketches = [QuantileSketch() for __ in range(3)]
+    for index, value in enumerate(values):
+        sketches[index % 3].add(value)
+
+    merged = QuantileSketch()
+    for sketch in sketches:
+        merged.merge(sketch)
+
+    assert merged.count == len(values)
+    assert merged.min == min(values)
+    assert merged.max == max(values)
+    assert merged.quantile(0.99) == pytest.approx(exact_quantile(values, 0.99), rel=0.05)
+
+
+def test_QuantileSketch_should_be_serialisable(values):
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+
+    copy = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+    assert copy.quantiles() == sketch.quantiles()
+
+
+def test_QuantileSketch_should_return_none_when_empty():
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_QuantileSketch_should_reject_invalid_quantiles():
+    with pytest.raises(ValueError):
+        QuantileSketch().quantile(1.5)
@@ -0,0 +1,106 @@
+import pytest
+
+from pluma.core.baseclasses import ReceiveBuffer
+
+
+def test_ReceiveBuffer_text_returns_data_appended():
+    buffer = ReceiveBuffer()
+
+    buffer.append(b'abc')
+    buffer.append(b'def')
+
+    assert buffer.text() == 'abcdef'
+    assert len(buffer) == 6
+
+
+def test_ReceiveBuffer_text_decodes_split_characters():
+    buffer = ReceiveBuffer('utf-8')
+    data = 'aé'.encode('utf-8')
+
+    buffer.append(data[:2])
+    assert buffer.text() == 'a'
+    assert buffer.pending == 1
+
+    buffer.append(data[2:])
+    assert buffer.text() == 'aé'
+    assert buffer.pending == 0
+
+
+def test_ReceiveBuffer_read_empties_buffer():
+    buffer = ReceiveBuffer()
+    buffer.append(b'abc')
+
+    assert buffer.read() == 'abc'
+    assert len(buffer) == 0
+    assert buffer.text() == ''
+
+
+def test_ReceiveBuffer_read_keeps_split_characters():
+    buffer = ReceiveBuffer('utf-8')
+    data = 'aé'.encode('utf-8')
+
+    buffer.append(data[:2])
+    assert buffer.read() == 'a'
+
+    buffer.append(data[2:])
+    assert buffer.read() == 'é'
+
+
+def test_ReceiveBuffer_append_drops_oldest_bytes_when_full():
+    buffer = ReceiveBuffer(max_size=5)
+
+    buffer.append(b'abc')
+    buffer.append(b'defg')
+
+    assert buffer.text() == 'cdefg'
+    assert buffer.dropped == 2
+
+
+def test_ReceiveBuffer_append_trims_decoded_text_when_full():
+    buffer = ReceiveBuffer('utf-8', max_size=8)
+    buffer.append('aéb'.encode('utf-8'))
+    assert buffer.text() == 'aéb'
+    decoder = buffer._decoder
+
+    buffer.append('cdé'.encode('utf-8'))
+    buffer.append(b'fg')
+
+    assert buffer.text() == 'bcdéfg'
+    assert buffer._decoder is decoder
+
+
+def test_ReceiveBuffer_max_size_drops_oldest_bytes():
+    buffer = ReceiveBuffer()
+    buffer.append(b'abcdefg')
+
+    buffer.max_size = 3
+
+    assert buffer.text() == 'efg'
+    assert buffer.dropped == 4
+
+
+def test_ReceiveBuffer_max_size_must_be_positive():
+    buffer = ReceiveBuffer()
+
+    with pytest.raises(ValueError):
+        buffer.max_size = 0
+
+
+def test_ReceiveBuffer_view_returns_bytes_without_copy():
+    buffer = ReceiveBuffer()
+    buffer.append(b'abcdef')
+
+    with buffer.view(1, 4) as view:
+        assert view == b'bcd'
+        assert view.obj is buffer._data
+
+
+def test_ReceiveBuffer_consume_removes_start_of_buffer():
+    buffer = ReceiveBuffer()
+    buffer.append(b'abcdef')
+    buffer.text()
+
+    buffer.consume(2)
+
+    assert buffer.text() == 'cdef'
+    assert buffer.decode(1, 3) == 'de'
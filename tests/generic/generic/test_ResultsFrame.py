@@ -0,0 +1,127 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from pluma import Board
+from pluma.test import TestBase, TestRunner, TestController
+from pluma.test.resultsframe import ResultsFrame
+from pluma.test.stock.deffuncs import sc_run_n_iterations
+
+
+def make_result(tests):
+    return {'TestRunner': {test: {'data': data, 'settings': settings}
+                           for test, (data, settings) in tests.items()}}
+
+
+@pytest.fixture
+def results():
+    return [
+        make_result({'A': ({'time': 1.5, 'ok': True}, {'mode': 1}),
+                     'B': ({'name': 'x'}, {})}),
+        make_result({'A': ({'time': 2.5, 'ok': False, 'count': 3}, {'mode': 2})}),
+        make_result({'A': ({'time': None, 'ok': True}, {'mode': 1}),
+                     'B': ({}, {})}),
+    ]
+
+
+def test_ResultsFrame_should_use_typed_arrays(results):
+    frame = ResultsFrame.from_results(results)
+
+    assert len(frame) == 3
+    assert frame.tests == ['A', 'B']
+    assert frame.fields('A') == ['time', 'ok', 'count']
+    assert frame.columns['A'].fields['ok'].values.dtype == bool
+    assert frame.columns['A'].fields['count'].values.dtype == np.int64
+    assert frame.columns['A'].fields['time'].values.dtype == object
+    assert frame.columns['B'].fields['name'].values.dtype == object
+
+
+def test_ResultsFrame_should_promote_numbers_to_float():
+    frame = ResultsFrame.from_results([make_result({'A': ({'time': time}, {})})
+                                       for time in [5, 5.5, 6]])
+
+    column = frame.columns['A'].fields['time']
+    assert column.values.dtype == np.float64
+    assert [column.value(row) for row in range(3)] == [5, 5.5, 6]
+
+
+def test_ResultsFrame_records_should_return_results_data(results):
+    frame = ResultsFrame.from_results(results)
+
+    assert list(frame.records()) == [
+        {'A': {'time': 1.5, 'ok': True}, 'B': {'name': 'x'}},
+        {'A': {'time': 2.5, 'ok': False, 'count': 3}},
+        {'A': {'time': None, 'ok': True}, 'B': {}},
+    ]
+
+
+def test_ResultsFrame_select_should_filter_tests_fields_and_settings(results):
+    frame = ResultsFrame.from_results(results)
+
+    selected = frame.select(test_names='A', fields=['ok'], settings={'mode': 1})
+
+    assert list(selected.records()) == [{'A': {'ok': True}}, {}, {'A': {'ok': True}}]
+
+
+def test_ResultsFrame_series_should_skip_missing_values(results):
+    frame = ResultsFrame.from_results(results)
+
+    iterations, values = frame.series('A', 'time')
+    assert iterations.tolist() == [0, 1]
+    assert values.tolist() == [1.5, 2.5]
+
+    iterations, values = frame.series('A', 'ok', cumulative=True)
+    assert iterations.tolist() == [0, 1, 2]
+    assert values.tolist() == [1, 1, 2]
+
+
+def test_ResultsFrame_should_grow_with_results():
+    frame = ResultsFrame()
+    for index in range(100):
+        frame.append(make_result({'A': ({'index': index}, {})}))
+
+    assert frame.series('A', 'index')[1].tolist() == list(range(100))
+
+
+class TimeTest(TestBase):
+    def test_body(self):
+        self.data['time'] = 1.5
+
+
+@pytest.fixture
+def controller():
+    board = MagicMock(Board)
+    board.name = 'board'
+    runner = TestRunner(board, tests=[TimeTest(board)], use_testcore=False,
+                        email_on_fail=False)
+    controller = TestController(runner, run_condition=sc_run_n_iterations(ntimes=3),
+                                log_func=lambda message: None, columnar_results=True)
+    controller.run()
+    return controller
+
+
+def test_TestController_get_results_frame_should_add_new_iterations(controller):
+    frame = controller.get_results_frame()
+    assert len(frame) == 3
+
+    controller.run_iteration()
+    assert controller.get_results_frame() is frame
+    assert len(frame) == 4
+
+
+def test_TestController_get_test_results_should_use_results_frame(controller):
+    test_name = str(controller.testrunner.tests[0])
+
+    assert list(controller.get_test_results()) == [{test_name: {'time': 1.5}}] * 3
+    assert controller.get_test_results(format='csv').splitlines()[1] == f'0,{test_name},1.5'
+
+
+@pytest.mark.parametrize('vs_type', ['iteration', 'cumulative'])
+def test_TestController_graph_test_results_should_plot_results_frame(controller, tmp_path,
+                                                                     vs_type):
+    path = tmp_path / 'graph.svg'
+
+    controller.graph_test_results(str(path), vs_type=vs_type)
+
+    assert path.read_text().startswith('<?xml')
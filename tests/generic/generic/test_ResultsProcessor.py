@@ -0,0 +1,200 @@
+import json
+import random
+from statistics import mean, median, median_grouped, stdev, variance
+
+import pytest
+
+from pluma.test.resultsprocessor import DefaultResultsProcessor, FieldStatistics, \
+    RunningStatistics, SoakResultsProcessor
+from pluma.test.resultsstore import SampledResultsStore
+
+
+def make_results(values, field='value', test='Test'):
+    return [{'TestRunner': {test: {'data': {field: value}}}} for value in values]
+
+
+def test_FieldStatistics_should_match_statistics_module():
+    random.seed(0)
+    values = [random.randint(0, 40) / 2 for __ in range(500)]
+    values += [random.randint(0, 5) for __ in range(500)]
+    statistics = FieldStatistics()
+    for value in values:
+        statistics.add(value)
+
+    assert statistics.n == len(values)
+    assert statistics.min == min(values)
+    assert statistics.max == max(values)
+    assert statistics.mean == pytest.approx(mean(values))
+    assert statistics.variance == pytest.approx(variance(values))
+    assert statistics.stdev == pytest.approx(stdev(values))
+    assert statistics.median_grouped == pytest.approx(median_grouped(values))
+
+
+def test_FieldStatistics_median_grouped_should_be_updated_with_each_value():
+    random.seed(1)
+    values = []
+    statistics = FieldStatistics()
+    for __ in range(300):
+        value = random.choice([random.randint(0, 20), random.randint(0, 40) / 2])
+        values.append(value)
+        statistics.add(value)
+        assert statistics.median_grouped == pytest.approx(median_grouped(values))
+
+
+def test_FieldStatistics_mode_should_be_first_most_common_value():
+    statistics = FieldStatistics()
+    for value in [3, 1, 1, 3, 2]:
+        statistics.add(value)
+
+    assert statistics.mode == 3
+
+
+def test_FieldStatistics_chunked_mean_should_average_chunks_in_order():
+    statistics = FieldStatistics()
+    for value in range(100):
+        statistics.add(value)
+
+    assert statistics.chunked_mean() == [4.5 + 10 * chunk for chunk in range(10)]
+
+
+def test_FieldStatistics_should_not_count_continuous_values():
+    random.seed(2)
+    values = [random.gauss(10, 3) for __ in range(1000)]
+    statistics = FieldStatistics()
+    for value in values:
+        statistics.add(value)
+
+    summary = statistics.summary(sigfig=6)
+    assert 'count' not in summary
+    assert 'mode' not in summary
+    assert summary['mean'] == pytest.approx(mean(values), abs=1e-5)
+    assert summary['median'] == pytest.approx(median(values), abs=0.1)
+
+
+def test_FieldStatistics_chunked_mean_should_be_close_with_many_values():
+    values = list(range(5000))
+    statistics = FieldStatistics()
+    for value in values:
+        statistics.add(value)
+
+    expected = [mean(values[start:start + 500]) for start in range(0, 5000, 500)]
+    assert statistics.chunked_mean() == pytest.approx(expected, rel=0.01)
+
+
+def test_FieldStatistics_state_should_be_bounded():
+    def state_size(count):
+        statistics = FieldStatistics()
+        for __ in range(count):
+            statistics.add(random.uniform(0, 100))
+        return len(json.dumps(statistics.to_dict()))
+
+    assert state_size(50000) < 2 * state_size(5000)
+
+
+def test_FieldStatistics_summary_should_only_count_non_numbers():
+    statistics = FieldStatistics()
+    for value in [1, 'a', 2]:
+        statistics.add(value)
+
+    assert statistics.summary() == {'count': {'1': 1, 'a': 1, '2': 1}}
+
+
+def test_FieldStatistics_summary_should_only_have_chunked_mean_for_booleans():
+    statistics = FieldStatistics()
+    for value in [True, False, True, True]:
+        statistics.add(value)
+
+    assert statistics.summary() == {'count': {'True': 3, 'False': 1},
+                                    'chunked_mean': [1, 0, 1, 1]}
+
+
+def test_DefaultResultsProcessor_should_summarise_numbers():
+    summary = DefaultResultsProcessor().generate_summary(['Test'], make_results([1, 2, 2, 5]))
+
+    assert summary == {'Test': {'value': {
+        'count': {'1': 1, '2': 2, '5': 1},
+        'max': 5, 'min': 1, 'mode': 2, 'mean': 2.5, 'median': 2.0, 'stdev': 1.73,
+        'variance': 3.0, 'p50': 2.0, 'p90': 5.0, 'p95': 5.0, 'p99': 5.0,
+        'chunked_mean': [1, 2, 2, 5]}}}
+
+
+def test_DefaultResultsProcessor_should_only_process_new_results():
+    processor = DefaultResultsProcessor()
+    results = make_results([1, 2])
+    processor.generate_summary(['Test'], results)
+
+    results.extend(make_results([3]))
+    summary = processor.generate_summary(['Test'], results)
+
+    assert processor.num_results == 3
+    assert processor.fields['Test']['value'].n == 3
+    assert summary['Test']['value']['mean'] == 2
+
+
+def test_DefaultResultsProcessor_should_restart_when_results_removed():
+    processor = DefaultResultsProcessor()
+    processor.generate_summary(['Test'], make_results([1, 2, 3]))
+
+    summary = processor.generate_summary(['Test'], make_results([5, 7]))
+
+    assert summary['Test']['value']['mean'] == 6
+
+
+def test_DefaultResultsProcessor_should_return_empty_summary_for_tests_without_data():
+    summary = DefaultResultsProcessor().generate_summary(['Test', 'Other'],
+                                                         make_results([1]))
+
+    assert summary == {'Test': {'value': {'count': {'1': 1}}}, 'Other': {}}
+
+
+def test_DefaultResultsProcessor_should_continue_from_saved_state():
+    values = [random.uniform(0, 10) for __ in range(50)] + [3, 3, 'text', True]
+    results = make_results(values) + make_results([1, 2, 3], field='number')
+
+    processor = DefaultResultsProcessor()
+    processor.generate_summary(['Test'], results[:20])
+    state = json.loads(json.dumps(processor.get_state()))
+
+    resumed = DefaultResultsProcessor()
+    resumed.set_state(state)
+
+    assert resumed.num_results == 20
+    assert resumed.generate_summary(['Test'], results) == \
+        DefaultResultsProcessor().generate_summary(['Test'], results)
+
+
+def test_RunningStatistics_should_match_statistics_module():
+    values = [random.uniform(0, 100) for __ in range(500)]
+    statistics = RunningStatistics()
+    for value in values:
+        statistics.add(value)
+
+    summary = statistics.summary(sigfig=6)
+    assert summary['n'] == 500
+    assert 'count' not in summary
+    assert summary['min'] == min(values)
+    assert summary['max'] == max(values)
+    assert summary['mean'] == pytest.approx(mean(values), abs=1e-5)
+    assert summary['stdev'] == pytest.approx(stdev(values), abs=1e-5)
+    assert summary['p50'] == pytest.approx(median_grouped(values), abs=5)
+
+
+def test_RunningStatistics_should_count_few_distinct_values():
+    statistics = RunningStatistics()
+    for value in ['a', 'b', 'a']:
+        statistics.add(value)
+
+    assert statistics.summary() == {'n': 3, 'count': {'a': 2, 'b': 1}}
+
+
+def test_SoakResultsProcessor_should_summarise_run_and_window():
+    processor = SoakResultsProcessor(window_size=2)
+    store = SampledResultsStore(window_size=2, sample_size=0)
+    for result in make_results([1, 2, 3, 4, 5]):
+        store.append(result)
+        summary = processor.generate_summary(['Test'], store)
+
+    assert summary['Test']['value']['n'] == 5
+    assert summary['Test']['value']['mean'] == 3
+    assert summary['Test']['value']['window'] == DefaultResultsProcessor().generate_summary(
+        ['Test'], make_results([4, 5]))['Test']['value']
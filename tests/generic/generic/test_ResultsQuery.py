@@ -0,0 +1,81 @@
+import json
+from unittest.mock import MagicMock
+
+from pluma.test import TestController, TestRunner
+from pluma.test.resultsquery import ResultsQuery, TestSettingsIndex
+
+
+def make_result(tests):
+    return {'TestRunner': {
+        test: {'settings': settings, 'data': data} for test, (settings, data) in tests.items()
+    }}
+
+
+def test_ResultsQuery_match_tests_should_match_full_names():
+    query = ResultsQuery()
+    query.add_result(make_result({'a.Test': ({}, {}), 'a.TestOther': ({}, {}),
+                                  'b.Test': ({}, {})}))
+
+    assert query.match_tests(['.*Test']) == ['a.Test', 'b.Test']
+    assert query.match_tests(['b.*', 'a.Test']) == ['a.Test', 'b.Test']
+    assert query.match_tests(['Test']) == []
+
+
+def test_ResultsQuery_match_tests_should_include_tests_added_later():
+    query = ResultsQuery()
+    query.add_result(make_result({'Test1': ({}, {})}))
+    assert query.match_tests(['Test.*']) == ['Test1']
+
+    query.add_result(make_result({'Test2': ({}, {})}))
+    assert query.match_tests(['Test.*']) == ['Test1', 'Test2']
+
+
+def test_ResultsQuery_update_should_only_add_new_results():
+    results = [make_result({'Test': ({}, {})}) for __ in range(3)]
+    query = ResultsQuery()
+    query.update(results)
+    query.update(results + [make_result({'Test': ({}, {})})])
+    assert query.num_results == 4
+
+    query.update(results[:1])
+    assert query.num_results == 1
+
+
+def test_ResultsQuery_settings_filter_should_check_settings_of_each_iteration():
+    query = ResultsQuery()
+    for value in [1, 1, 2, 2, 1]:
+        query.add_result(make_result({'Test': ({'value': value, 'other': 0}, {})}))
+
+    settings_match = query.settings_filter(['Test'], {'value': 1})
+    assert [settings_match('Test', i) for i in range(5)] == [True, True, False, False, True]
+
+    settings_match = query.settings_filter(['Test'], None)
+    assert all(settings_match('Test', i) for i in range(5))
+
+
+def test_TestSettingsIndex_should_store_runs_of_settings():
+    index = TestSettingsIndex()
+    for iteration, settings in enumerate([{'a': 1}, {'a': 1}, {'a': 2}, {'a': 1}]):
+        index.add(iteration, settings)
+
+    assert index.settings == [{'a': 1}, {'a': 2}]
+    assert index._run_starts == [0, 2, 3]
+    assert [index.settings_at(i) for i in range(5)] == [0, 0, 1, 0, 0]
+    assert index.matching({'a': 2}) == {1}
+    assert index.matching({'b': 2}) == set()
+
+
+def test_TestController_get_test_results_should_filter_by_settings_per_iteration():
+    controller = TestController(MagicMock(TestRunner))
+    controller.results = [
+        make_result({'Test': ({'size': size}, {'value': index}),
+                     'Other': ({}, {'value': -index})})
+        for index, size in enumerate([1, 2, 1])]
+
+    assert list(controller.get_test_results(settings={'size': 1})) == [
+        {'Test': {'value': 0}}, {}, {'Test': {'value': 2}}]
+    assert list(controller.get_test_results(test_names='Oth.*')) == [
+        {'Other': {'value': 0}}, {'Other': {'value': -1}}, {'Other': {'value': -2}}]
+    assert json.loads(controller.get_test_results(
+        test_names=['Test'], settings={'size': 2}, format='json')) == [
+        {}, {'Test': {'value': 1}}, {}]
@@ -0,0 +1,258 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from pluma import Board
+from pluma.test import TestBase, TestRunner, TestController, MemoryResultsStore, \
+    JsonResultsStore
+from pluma.test.resultsstore import SampledResultsStore, dump_json
+from pluma.test.stock.deffuncs import sc_run_n_iterations
+
+
+def make_result(index):
+    return {'iteration': index, 'TestRunner': {'Test': {'data': {'value': index}}}}
+
+
+@pytest.fixture(params=['memory', 'json'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryResultsStore()
+    return JsonResultsStore(str(tmp_path / 'results.jsonl'), window_size=3)
+
+
+def test_ResultsStore_should_return_results_in_order(store):
+    for index in range(10):
+        store.append(make_result(index))
+
+    assert len(store) == 10
+    assert [result['iteration'] for result in store] == list(range(10))
+    assert store[0] == make_result(0)
+    assert store[5] == make_result(5)
+    assert store[-1] == make_result(9)
+
+
+def test_ResultsStore_should_copy_results(store):
+    result = make_result(0)
+    store.append(result)
+    result['iteration'] = 1
+
+    assert store[0]['iteration'] == 0
+
+
+def test_ResultsStore_should_raise_index_error_out_of_range(store):
+    store.append(make_result(0))
+
+    with pytest.raises(IndexError):
+        store[1]
+
+
+def test_ResultsStore_clear_should_remove_results(store):
+    store.append(make_result(0))
+    store.clear()
+    store.append(make_result(1))
+
+    assert list(store) == [make_result(1)]
+
+
+def test_JsonResultsStore_should_write_one_line_per_result(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    store = JsonResultsStore(str(path), window_size=2)
+    for index in range(5):
+        store.append(make_result(index))
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [make_result(index) for index in range(5)]
+    assert len(store._window) == 2
+
+
+def test_dump_json_should_stream_results_stores(store):
+    for index in range(3):
+        store.append(make_result(index))
+    data = {'TestController': {'settings': {'a': 1}, 'results': store}}
+
+    class Output:
+        text = ''
+
+        def write(self, text):
+            self.text += text
+
+    output = Output()
+    dump_json(data, output)
+
+    assert json.loads(output.text) == {'TestController': {
+        'settings': {'a': 1}, 'results': [make_result(index) for index in range(3)]}}
+
+
+class DataTest(TestBase):
+    def test_body(self):
+        self.data['value'] = 1
+
+
+def test_TestController_should_append_completed_iterations_to_results_store(tmp_path):
+    board = MagicMock(Board)
+    board.name = 'board'
+    runner = TestRunner(board, tests=[DataTest(board)], use_testcore=False,
+                        email_on_fail=False)
+    store = JsonResultsStore(str(tmp_path / 'results.jsonl'), window_size=2)
+    controller = TestController(runner, run_condition=sc_run_n_iterations(ntimes=5),
+                                results_store=store)
+
+    controller.run()
+
+    assert controller.results is store
+    assert len(store) == 5
+    assert [result['iteration'] for result in store] == list(range(5))
+    assert all(result['success'] for result in store)
+    assert [data['value'] for data in controller.get_test_results(fields=['value'])
+            for data in data.values()] == [1] * 5
+    assert controller.results_summary[str(runner.tests[0])]['value']['mean'] == 1
+
+
+def test_ResultsStore_should_collect_fields_of_each_test(store):
+    store.append({'TestRunner': {'Test': {'data': {'b': 1}}, 'Other': {'data': {}}}})
+    store.append({'TestRunner': {'Test': {'data': {'a': 1, 'b': 2}}}})
+
+    assert store.fields == {'Test': {'b': None, 'a': None}, 'Other': {}}
+
+    store.clear()
+    assert store.fields == {}
+
+
+def test_ResultsStore_restore_should_remove_results_after_checkpoint(store):
+    for index in range(4):
+        store.append(make_result(index))
+    checkpoint = json.loads(json.dumps(store.checkpoint()))
+
+    store.append({'TestRunner': {'Other': {'data': {'a': 1}}}})
+    store.restore(checkpoint)
+
+    assert list(store) == [make_result(index) for index in range(4)]
+    assert store.fields == {'Test': {'value': None}}
+
+    store.append(make_result(4))
+    assert store[-1] == make_result(4)
+
+
+def test_ResultsStore_restore_should_error_if_results_missing(store):
+    store.append(make_result(0))
+    checkpoint = store.checkpoint()
+    store.clear()
+
+    with pytest.raises(ValueError):
+        store.restore(checkpoint)
+
+
+def test_JsonResultsStore_should_keep_results_if_not_truncated(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    store = JsonResultsStore(str(path), window_size=2)
+    for index in range(5):
+        store.append(make_result(index))
+    checkpoint = store.checkpoint()
+    store.close()
+
+    # Incomplete line, from a run interrupted while writing
+    with open(path, 'a') as f:
+        f.write('{"iteration": 5, "Test')
+
+    store = JsonResultsStore(str(path), window_size=2, truncate=False)
+    store.restore(checkpoint)
+    store.append(make_result(5))
+
+    assert list(store) == [make_result(index) for index in range(6)]
+    assert store[0] == make_result(0)
+    assert [json.loads(line) for line in path.read_text().splitlines()] == \
+        [make_result(index) for index in range(6)]
+
+
+def test_JsonResultsStore_restore_should_error_if_file_changed(tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    store = JsonResultsStore(path)
+    store.append(make_result(0))
+    store.append(make_result(1))
+    checkpoint = store.checkpoint()
+
+    store.clear()
+    store.append(make_result(10))
+    store.append(make_result(11))
+
+    with pytest.raises(ValueError):
+        store.restore(checkpoint)
+
+
+def test_TestController_should_resume_from_checkpoint(tmp_path):
+    board = MagicMock(Board)
+    board.name = 'board'
+    results_path = str(tmp_path / 'results.jsonl')
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+
+    def create_controller(ntimes, truncate):
+        runner = TestRunner(board, tests=[DataTest(board)], use_testcore=False,
+                            email_on_fail=False)
+        return TestController(runner, run_condition=sc_run_n_iterations(ntimes=ntimes),
+                              results_store=JsonResultsStore(results_path, truncate=truncate),
+                              checkpoint_file=checkpoint_path, log_func=lambda message: None)
+
+    controller = create_controller(ntimes=3, truncate=True)
+    controller.run()
+    controller.results.close()
+
+    controller = create_controller(ntimes=5, truncate=False)
+    assert controller.load_checkpoint()
+    assert controller.stats['num_iterations_run'] == 3
+    controller.run()
+
+    assert controller.stats['num_iterations_run'] == 5
+    assert controller.stats['num_iterations_pass'] == 5
+    assert [result['iteration'] for result in controller.results] == list(range(5))
+    assert controller.results_summary[str(controller.testrunner.tests[0])]['value'][
+        'count'] == {'1': 5}
+
+
+def test_TestController_load_checkpoint_should_return_false_without_checkpoint(tmp_path):
+    board = MagicMock(Board)
+    runner = TestRunner(board, tests=[], use_testcore=False, email_on_fail=False)
+    controller = TestController(runner, checkpoint_file=str(tmp_path / 'checkpoint.json'))
+
+    assert not controller.load_checkpoint()
+
+
+def test_SampledResultsStore_should_keep_window_and_sample_in_order():
+    store = SampledResultsStore(window_size=5, sample_size=10, seed=1)
+    for index in range(1000):
+        store.append(make_result(index))
+
+    iterations = [result['iteration'] for result in store]
+    assert len(store) == 15
+    assert store.num_appended == 1000
+    assert iterations == sorted(iterations)
+    assert iterations[-5:] == list(range(995, 1000))
+    assert [result['iteration'] for result in store.window] == list(range(995, 1000))
+    assert store[-1] == make_result(999)
+    assert store.fields == {'Test': {'value': None}}
+
+
+def test_SampledResultsStore_sample_should_be_uniform():
+    counts = [0] * 100
+    for seed in range(200):
+        store = SampledResultsStore(window_size=1, sample_size=10, seed=seed)
+        for index in range(101):
+            store.append(make_result(index))
+        for result in list(store)[:-1]:
+            counts[result['iteration']] += 1
+
+    # Each older result is sampled with probability 10%, 20 times on average
+    assert sum(counts) == 2000
+    assert max(counts) < 40
+    assert min(counts) > 5
+
+
+def test_SampledResultsStore_clear_should_remove_results():
+    store = SampledResultsStore(window_size=2, sample_size=2)
+    for index in range(10):
+        store.append(make_result(index))
+    store.clear()
+    store.append(make_result(0))
+
+    assert list(store) == [make_result(0)]
+    assert store.num_appended == 1
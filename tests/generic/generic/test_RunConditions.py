@@ -0,0 +1,142 @@
+import math
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from pluma import Board
+from pluma.test import TestBase, TestRunner, TestController
+from pluma.test.confidence import normal_quantile, student_t_quantile, \
+    mean_confidence_half_width, proportion_confidence_interval
+from pluma.test.stock.deffuncs import sc_run_until_converged, sc_run_until_fields_converge, \
+    sc_run_until_pass_rate_bounded, fields_converged
+
+
+class BootTest(TestBase):
+    def __init__(self, board, spread):
+        super().__init__(board)
+        self.spread = spread
+        self.random = random.Random(0)
+
+    def test_body(self):
+        self.data['boot_time'] = 10 + self.random.uniform(-self.spread, self.spread)
+
+
+class FlakyTest(TestBase):
+    def __init__(self, board):
+        super().__init__(board)
+        self.count = 0
+
+    def test_body(self):
+        self.count += 1
+        if self.count % 10 == 0:
+            raise RuntimeError('Failure')
+
+
+def create_controller(test, run_condition, **kwargs):
+    board = MagicMock(Board)
+    board.name = 'board'
+    runner = TestRunner(board, tests=[test(board)], use_testcore=False, email_on_fail=False)
+    return TestController(runner, run_condition=run_condition, email_on_except=False,
+                          log_func=lambda message: None, **kwargs)
+
+
+def test_normal_quantile():
+    assert normal_quantile(0.5) == pytest.approx(0, abs=1e-12)
+    assert normal_quantile(0.975) == pytest.approx(1.959964, abs=1e-6)
+    assert normal_quantile(0.05) == pytest.approx(-1.644854, abs=1e-6)
+
+
+def test_student_t_quantile():
+    assert student_t_quantile(0.975, 9) == pytest.approx(2.262157, rel=1e-4)
+    assert student_t_quantile(0.975, 29) == pytest.approx(2.045230, rel=1e-4)
+    assert student_t_quantile(0.95, 1000) == pytest.approx(1.646379, rel=1e-4)
+
+
+def test_student_t_quantile_with_few_degrees_of_freedom():
+    assert student_t_quantile(0.975, 1) == pytest.approx(12.706205, rel=1e-6)
+    assert student_t_quantile(0.975, 2) == pytest.approx(4.302653, rel=1e-6)
+    assert student_t_quantile(0.975, 3) == pytest.approx(3.182446, rel=1e-6)
+    assert student_t_quantile(0.975, 4) == pytest.approx(2.776445, rel=1e-6)
+    assert student_t_quantile(0.025, 3) == pytest.approx(-3.182446, rel=1e-6)
+    assert student_t_quantile(0.5, 1) == pytest.approx(0, abs=1e-12)
+
+
+def test_mean_confidence_half_width():
+    assert mean_confidence_half_width(1, 1) == math.inf
+    assert mean_confidence_half_width(10, 2) == pytest.approx(2.262157 * 2 / math.sqrt(10),
+                                                              rel=1e-4)
+
+
+def test_proportion_confidence_interval_should_be_wilson_interval():
+    low, high = proportion_confidence_interval(95, 100)
+    assert low == pytest.approx(0.88825, abs=1e-5)
+    assert high == pytest.approx(0.97846, abs=1e-5)
+    assert proportion_confidence_interval(10, 10)[1] == 1
+    assert proportion_confidence_interval(0, 0) == (0, 1)
+
+
+def test_sc_run_until_fields_converge_should_stop_when_mean_known():
+    controller = create_controller(
+        lambda board: BootTest(board, spread=0.5),
+        sc_run_until_fields_converge(fields=['boot_time'], max_iterations=100,
+                                     relative_width=0.01))
+    controller.run()
+
+    iterations = controller.stats['num_iterations_run']
+    assert 10 <= iterations < 100
+    assert fields_converged(controller, 'boot_time', relative_width=0.01)
+
+
+def test_sc_run_until_fields_converge_should_use_all_iterations_in_soak_mode():
+    controller = create_controller(
+        lambda board: BootTest(board, spread=0.5),
+        sc_run_until_fields_converge(fields=['boot_time'], max_iterations=100,
+                                     relative_width=0.01),
+        soak_window=5, soak_sample_size=5)
+    controller.run()
+
+    iterations = controller.stats['num_iterations_run']
+    assert 10 <= iterations < 100
+    assert len(controller.results) < iterations
+    assert fields_converged(controller, 'boot_time', relative_width=0.01)
+
+
+def test_sc_run_until_fields_converge_should_stop_at_max_iterations():
+    controller = create_controller(
+        lambda board: BootTest(board, spread=9),
+        sc_run_until_fields_converge(fields=['boot_time'], max_iterations=15,
+                                     relative_width=0.001))
+    controller.run()
+
+    assert controller.stats['num_iterations_run'] == 15
+
+
+def test_sc_run_until_fields_converge_should_run_min_iterations():
+    controller = create_controller(
+        lambda board: BootTest(board, spread=0),
+        sc_run_until_fields_converge(fields=['boot_time'], max_iterations=100,
+                                     min_iterations=5))
+    controller.run()
+
+    assert controller.stats['num_iterations_run'] == 5
+
+
+def test_sc_run_until_pass_rate_bounded_should_stop_when_pass_rate_known():
+    controller = create_controller(
+        FlakyTest, sc_run_until_pass_rate_bounded(max_error=0.1, max_iterations=1000))
+    controller.run()
+
+    iterations = controller.stats['num_iterations_run']
+    low, high = proportion_confidence_interval(controller.stats['num_iterations_pass'],
+                                               iterations)
+    assert (high - low) / 2 <= 0.1
+    assert 10 < iterations < 100
+
+
+def test_sc_run_until_converged_should_require_a_statistic():
+    controller = create_controller(lambda board: BootTest(board, spread=0),
+                                   sc_run_until_converged(max_iterations=10))
+
+    with pytest.raises(ValueError):
+        controller.run()
@@ -1,3 +1,4 @@
+import os
 import time
 import pytest
 from pluma.core.exceptions import ConsoleLoginFailedError
@@ -532,6 +533,47 @@ def test_SerialConsole_read_all_preserve_buffer(serial_console_proxy):
     assert serial_console_proxy.console.read_all() == ''
 
 
+def test_SerialConsole_read_all_decodes_characters_split_between_reads(
+        serial_console_proxy):
+    data = 'Température'.encode('utf-8')
+    split = data.index('é'.encode('utf-8')) + 1
+
+    serial_console_proxy.console.open()
+    os.write(serial_console_proxy.proxy.fd, data[:split])
+    time.sleep(0.1)
+    assert serial_console_proxy.console.read_all() == 'Temp'
+
+    os.write(serial_console_proxy.proxy.fd, data[split:])
+    time.sleep(0.1)
+    assert serial_console_proxy.console.read_all() == 'érature'
+
+
+def test_SerialConsole_read_all_reads_all_available_data(serial_console_proxy):
+    serial_console_proxy.console.open()
+    serial_console_proxy.fake_reception(loremipsum)
+
+    # Give time for the data written to propagate
+    time.sleep(0.1)
+
+    assert serial_console_proxy.console.read_all() == loremipsum
+
+
+def test_SerialConsole_wait_for_bytes_returns_on_data_arrival(serial_console_proxy):
+    serial_console_proxy.console.open()
+
+    start = time.time()
+    async_result = nonblocking(serial_console_proxy.console.wait_for_bytes,
+                               timeout=5, sleep_time=2)
+
+    serial_console_proxy.fake_reception('abc', wait_time=0.2)
+
+    success = async_result.get()
+    elapsed = time.time() - start
+
+    assert success is True
+    assert elapsed < 1
+
+
 @pytest.mark.parametrize('sleep_time', [0.2, 1])
 def test_ConsoleBase_wait_for_quiet_should_wait_at_least_sleep_time(serial_console_proxy,
                                                                     sleep_time):
@@ -581,3 +623,69 @@ def test_ConsoleBase_wait_for_quiet_should_return_when_quiet(serial_console_prox
 
 def test_SerialConsole_does_not_require_login(serial_console_proxy):
     assert serial_console_proxy.console.requires_login is True
+
+
+def test_SerialConsole_read_all_with_capture(serial_console_proxy):
+    data = 'Line1'
+
+    serial_console_proxy.console.start_capture()
+    serial_console_proxy.fake_reception(data)
+
+    assert serial_console_proxy.console.wait_for_bytes(timeout=1, start_bytes=0) is True
+    assert serial_console_proxy.console.read_all() == data
+    assert serial_console_proxy.console.read_all() == ''
+
+    serial_console_proxy.console.stop_capture()
+    assert serial_console_proxy.console.capture is None
+
+
+def test_SerialConsole_capture_subscribers_receive_all_data(serial_console_proxy):
+    received_1 = []
+    received_2 = []
+
+    serial_console_proxy.console.start_capture()
+    serial_console_proxy.console.capture.subscribe(received_1.append)
+    serial_console_proxy.console.capture.subscribe(received_2.append)
+
+    serial_console_proxy.fake_reception('abc')
+    serial_console_proxy.fake_reception('def')
+    serial_console_proxy.console.wait_for_quiet(quiet=0.2, timeout=2)
+
+    assert b''.join(received_1) == b'abcdef'
+    assert b''.join(received_2) == b'abcdef'
+    assert serial_console_proxy.console.read_all() == 'abcdef'
+
+
+def test_SerialConsole_capture_keeps_unread_data_on_stop(serial_console_proxy):
+    data = 'Line1'
+
+    serial_console_proxy.console.start_capture()
+    serial_console_proxy.fake_reception(data)
+    serial_console_proxy.console.capture.wait_for_data(0, timeout=1)
+
+    serial_console_proxy.console.stop_capture()
+
+    assert serial_console_proxy.console.read_all() == data
+
+
+def test_SerialConsole_capture_drops_oldest_data_on_overflow(serial_console_proxy):
+    serial_console_proxy.console.start_capture(buffer_size=4)
+    serial_console_proxy.fake_reception('abcdef')
+    serial_console_proxy.console.wait_for_quiet(quiet=0.2, timeout=2)
+
+    assert serial_console_proxy.console.read_all() == 'cdef'
+
+
+def test_SerialConsole_send_and_expect_with_capture(serial_console_proxy):
+    expected_match = '123Match'
+    expected_received = f'Multiline content\n and {expected_match}'
+
+    serial_console_proxy.console.start_capture()
+    send_and_expect_result = nonblocking(serial_console_proxy.console.send_and_expect,
+                                         cmd='abc', match='[0-3]+Match')
+
+    serial_console_proxy.fake_reception(expected_received+'Trailing content')
+
+    received, matched = send_and_expect_result.get()
+    assert received == expected_received
+    assert matched == expected_match
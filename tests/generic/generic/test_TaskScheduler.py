@@ -0,0 +1,128 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from pluma import Board
+from pluma.test import TaskScheduler, TestBase, TestRunner, AbortTesting
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+        self.running = set()
+        self.overlaps = []
+
+    def task(self, name, duration=0.05, error=None):
+        def run():
+            with self.lock:
+                if self.running:
+                    self.overlaps.append((name, set(self.running)))
+                self.running.add(name)
+                self.events.append(f'start {name}')
+            time.sleep(duration)
+            with self.lock:
+                self.running.remove(name)
+                self.events.append(f'end {name}')
+            if error:
+                raise error
+        return run
+
+
+def test_TaskScheduler_should_keep_order_of_tasks_sharing_console():
+    recorder = Recorder()
+    scheduler = TaskScheduler()
+    for name in ['a', 'b', 'c']:
+        scheduler.add(name, recorder.task(name), ['console'])
+
+    scheduler.run()
+
+    assert recorder.events == ['start a', 'end a', 'start b', 'end b', 'start c', 'end c']
+
+
+def test_TaskScheduler_should_run_host_tasks_concurrently():
+    recorder = Recorder()
+    scheduler = TaskScheduler()
+    scheduler.add('console', recorder.task('console', 0.2), ['console'])
+    scheduler.add('host1', recorder.task('host1', 0.2), ['host'])
+    scheduler.add('host2', recorder.task('host2', 0.2), ['host'])
+
+    start = time.time()
+    scheduler.run()
+
+    assert time.time() - start < 0.5
+    assert recorder.overlaps
+
+
+def test_TaskScheduler_should_run_tasks_after_dependencies():
+    recorder = Recorder()
+    scheduler = TaskScheduler()
+    first = scheduler.add('first', recorder.task('first'), ['host'])
+    scheduler.add('second', recorder.task('second'), ['host'], [first])
+
+    scheduler.run()
+
+    assert recorder.events == ['start first', 'end first', 'start second', 'end second']
+
+
+def test_TaskScheduler_should_not_start_tasks_after_error():
+    recorder = Recorder()
+    scheduler = TaskScheduler()
+    scheduler.add('a', recorder.task('a', error=AbortTesting('abort')), ['console'])
+    scheduler.add('b', recorder.task('b'), ['console'])
+
+    with pytest.raises(AbortTesting):
+        scheduler.run()
+
+    assert 'start b' not in recorder.events
+
+
+class ConsoleTest(TestBase):
+    def test_body(self):
+        self.data['ran'] = True
+
+
+class HostReportTest(ConsoleTest):
+    def report(self):
+        time.sleep(0.05)
+        self.data['reported'] = True
+
+
+@pytest.fixture
+def board():
+    board = MagicMock(Board)
+    board.name = 'board'
+    board.power = MagicMock()
+    board.storage = MagicMock()
+    board.hub = MagicMock()
+    board.console = MagicMock()
+    board.reboot_and_validate.return_value = 1.0
+    return board
+
+
+@pytest.mark.parametrize('sequential', [False, True])
+def test_TestRunner_should_run_all_tasks_with_concurrent_tasks(board, sequential):
+    tests = [HostReportTest(board, str(index)) for index in range(3)]
+    runner = TestRunner(board, tests=tests, sequential=sequential, email_on_fail=False,
+                        concurrent_tasks=True)
+
+    assert runner.run() is True
+
+    for test in runner.tests[1:]:
+        assert test.data == {'ran': True, 'reported': True}
+    assert board.reboot_and_validate.call_count == (3 if sequential else 1)
+
+
+def test_TestRunner_should_run_tasks_in_order_with_concurrent_tasks(board):
+    runner = TestRunner(board, tests=[ConsoleTest(board)], email_on_fail=False,
+                        concurrent_tasks=True)
+
+    runner.run()
+
+    assert runner.data[str(runner.tests[1])]['tasks']['ran'] == ['test_body']
+    assert runner.data['TestCore']['tasks']['ran'] == [
+        '_init_test_state', '_host_mount', '_host_unmount', '_board_on_and_validate',
+        '_board_login', '_board_mount', 'test_body', '_board_unmount', '_board_off',
+        '_host_mount']
@@ -0,0 +1,112 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from pluma import Board
+from pluma.test import TestBase, TestRunner, TestController
+from pluma.test.resultsstore import JsonResultsStore
+from pluma.test.stock.deffuncs import sc_run_n_iterations
+
+
+class CounterTest(TestBase):
+    def __init__(self, board):
+        super().__init__(board)
+        self.count = 0
+
+    def test_body(self):
+        self.settings['mode'] = 'count'
+        self.data['count'] = self.count
+        if self.count % 2:
+            self.data['odd'] = 'line\nbreak'
+        self.count += 1
+
+
+@pytest.fixture
+def controller():
+    board = MagicMock(Board)
+    board.name = 'board'
+    runner = TestRunner(board, tests=[CounterTest(board)], use_testcore=False,
+                        email_on_fail=False)
+    controller = TestController(runner, run_condition=sc_run_n_iterations(ntimes=3),
+                                log_func=lambda message: None)
+    controller.run()
+    return controller
+
+
+def test_TestController_get_test_results_csv(controller):
+    test_name = str(controller.testrunner.tests[0])
+
+    assert controller.get_test_results(format='csv') == (
+        'iteration,test_name,count,odd\n'
+        f'0,{test_name},0,\n'
+        f'1,{test_name},1,line break\n'
+        f'2,{test_name},2,\n')
+
+
+def test_TestController_get_test_results_csv_should_be_empty_without_match(controller):
+    assert controller.get_test_results(format='csv', test_names='Unknown') == ''
+    assert controller.get_test_results(format='csv', settings={'mode': 'other'}) == ''
+
+
+def test_TestController_get_test_results_json(controller):
+    test_name = str(controller.testrunner.tests[0])
+
+    assert json.loads(controller.get_test_results(format='json', fields=['count'])) == [
+        {test_name: {'count': count}} for count in range(3)]
+
+
+@pytest.mark.parametrize('format', ['csv', 'json'])
+def test_TestController_get_test_results_should_write_to_output(controller, tmp_path, format):
+    path = tmp_path / f'results.{format}'
+
+    assert controller.get_test_results(format=format, output=str(path)) is None
+    assert path.read_text() == controller.get_test_results(format=format)
+
+
+def test_TestController_soak_mode_should_keep_bounded_results():
+    board = MagicMock(Board)
+    board.name = 'board'
+    runner = TestRunner(board, tests=[CounterTest(board)], use_testcore=False,
+                        email_on_fail=False)
+    controller = TestController(runner, run_condition=sc_run_n_iterations(ntimes=200),
+                                log_func=lambda message: None, soak_window=10,
+                                soak_sample_size=20)
+    controller.run()
+
+    test_name = str(runner.tests[0])
+    summary = controller.results_summary[test_name]['count']
+    assert len(controller.results) == 30
+    assert summary['n'] == 200
+    assert summary['mean'] == pytest.approx(99.5)
+    assert summary['window']['mean'] == pytest.approx(194.5)
+
+    counts = [data[test_name]['count'] for data in controller.get_test_results()]
+    assert len(counts) == 30
+    assert counts[-10:] == list(range(190, 200))
+
+    iterations, values = controller.get_results_frame().series(test_name, 'count')
+    assert iterations.tolist() == values.tolist()
+
+
+def test_TestController_should_read_first_result_settings_once(tmp_path):
+    class CountingResultsStore(JsonResultsStore):
+        first_result_reads = 0
+
+        def __getitem__(self, index):
+            if index == 0:
+                self.first_result_reads += 1
+            return super().__getitem__(index)
+
+    board = MagicMock(Board)
+    board.name = 'board'
+    runner = TestRunner(board, tests=[CounterTest(board)], use_testcore=False,
+                        email_on_fail=False)
+    store = CountingResultsStore(str(tmp_path / 'results.json'), window_size=2)
+    controller = TestController(runner, run_condition=sc_run_n_iterations(ntimes=10),
+                                log_func=lambda message: None, results_store=store)
+    controller.run()
+
+    assert controller.test_settings == {str(runner.tests[0]): {'mode': 'count'}}
+    # Once by the results processor, and once for the settings
+    assert store.first_result_reads == 2
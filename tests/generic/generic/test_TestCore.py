@@ -0,0 +1,118 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pluma import Board
+from pluma.test import TestBase, TestRunner, TestCore, BoardState
+
+
+class BodyTest(TestBase):
+    def test_body(self):
+        self.data['ran'] = True
+
+
+class LoggedInTest(BodyTest):
+    board_state = BoardState.LOGGED_IN
+
+
+class FreshBootTest(BodyTest):
+    def pre_board_on(self):
+        pass
+
+
+class FailingTest(BodyTest):
+    def test_body(self):
+        raise Exception('Test failed')
+
+
+@pytest.fixture
+def board():
+    board = MagicMock(Board)
+    board.name = 'board'
+    board.power = MagicMock()
+    board.storage = MagicMock()
+    board.hub = MagicMock()
+    board.console = MagicMock()
+    board.reboot_and_validate.return_value = 1.0
+    return board
+
+
+def run_tests(board, test_classes, track_board_state=True):
+    tests = [test_class(board, str(index)) for index, test_class in enumerate(test_classes)]
+    runner = TestRunner(board, tests=tests,
+                        sequential=True, email_on_fail=False, continue_on_fail=True,
+                        track_board_state=track_board_state)
+    runner.run()
+    return runner
+
+
+def test_TestRunner_should_boot_for_every_test_by_default(board):
+    run_tests(board, [BodyTest, LoggedInTest, BodyTest], track_board_state=False)
+
+    assert board.reboot_and_validate.call_count == 3
+    assert board.power.off.call_count == 3
+    assert board.storage.mount_board.call_count == 3
+
+
+def test_TestRunner_should_boot_once_when_tracking_board_state(board):
+    runner = run_tests(board, [BodyTest, BodyTest, BodyTest])
+
+    assert board.reboot_and_validate.call_count == 1
+    assert board.login.call_count == 1
+    assert board.storage.mount_board.call_count == 1
+    assert board.storage.unmount_board.call_count == 1
+    assert board.power.off.call_count == 1
+    assert runner._get_test_by_name('TestCore').board_state == BoardState.OFF
+
+
+def test_TestRunner_should_boot_once_per_iteration_when_tracking_board_state(board):
+    runner = TestRunner(board, tests=[BodyTest(board), LoggedInTest(board)], sequential=True,
+                        email_on_fail=False, continue_on_fail=True, track_board_state=True)
+
+    runner.run()
+    runner.run()
+
+    assert board.reboot_and_validate.call_count == 2
+    assert board.power.off.call_count == 2
+
+
+def test_TestRunner_should_only_run_transitions_needed(board):
+    run_tests(board, [LoggedInTest, LoggedInTest])
+
+    assert board.reboot_and_validate.call_count == 1
+    assert board.login.call_count == 1
+    board.storage.mount_board.assert_not_called()
+
+
+def test_TestRunner_should_reboot_for_fresh_boot_tests(board):
+    run_tests(board, [BodyTest, FreshBootTest, BodyTest])
+
+    assert board.reboot_and_validate.call_count == 2
+    assert board.power.off.call_count == 2
+
+
+def test_TestRunner_should_unmount_after_failing_test_body(board):
+    runner = run_tests(board, [BodyTest, FailingTest])
+
+    assert board.reboot_and_validate.call_count == 1
+    assert board.storage.unmount_board.call_count == 1
+    assert board.power.off.call_count == 1
+    assert runner.test_fails
+
+
+def test_TestRunner_should_reboot_after_failed_transition(board):
+    board.login.side_effect = [Exception('Login failed'), None]
+    run_tests(board, [LoggedInTest, LoggedInTest])
+
+    assert board.reboot_and_validate.call_count == 2
+    assert board.login.call_count == 2
+
+
+def test_TestCore_task_needed_when_state_unknown(board):
+    testcore = TestCore(board, None)
+    test = BodyTest(board)
+
+    assert all(testcore.task_needed(task, test, test)
+               for task in ['_host_mount', '_board_on_and_validate', '_board_login',
+                            '_board_mount'])
+    assert not testcore.task_needed('_board_unmount', test, test)